@@ -7,21 +7,28 @@ project_root = os.path.join(os.path.dirname(__file__), '../..')
 sys.path.insert(0, project_root)
 
 from PyQt6.QtWidgets import QMainWindow, QMessageBox, QInputDialog, QLineEdit
-from PyQt6.uic.load_ui import loadUiType
 
 try:
     from app.services.api_client import APIClient
+    from app.services.data_loader import shared_loader
+    from app.ui.loader import load_ui_type
 except ImportError:
     from services.api_client import APIClient
+    from services.data_loader import shared_loader
+    from ui.loader import load_ui_type
 
-Ui_LoginWindow, _ = loadUiType(os.path.join(os.path.dirname(__file__), '../ui/login_window.ui'))
+# Compiled ahead of time by compile_ui.py; parsed from the .ui file if that is missing or stale
+Ui_LoginWindow, _ = load_ui_type('login_window')
 
 class LoginController(QMainWindow, Ui_LoginWindow):
     def __init__(self, api_client: APIClient):
         super().__init__()
         self.api_client = api_client
+        self.loader = shared_loader()
         self.setupUi(self)
 
+        self.login_button_text = self.loginButton.text()
+
         # Connect signals
         self.loginButton.clicked.connect(self.handle_login)
         self.registerButton.clicked.connect(self.show_register_form)
@@ -40,15 +47,31 @@ class LoginController(QMainWindow, Ui_LoginWindow):
             QMessageBox.warning(self, "Input Error", "Please enter both email and password")
             return
 
-        try:
-            response = self.api_client.login(email, password)
-            if response:
-                QMessageBox.information(self, "Success", "Login successful!")
-                if self.on_login_success:
-                    self.on_login_success()
-                self.hide()
-        except Exception as e:
-            QMessageBox.critical(self, "Login Failed", f"Login failed: {str(e)}")
+        # Log in off the GUI thread, one attempt at a time
+        if self.loader.is_loading(("users.login", email)):
+            return
+        self.set_busy(True)
+        self.loader.load(
+            ("users.login", email), lambda: self.api_client.login(email, password),
+            on_result=self.on_login_finished, on_error=self.on_login_failed, owner=self
+        )
+
+    def set_busy(self, busy):
+        self.loginButton.setEnabled(not busy)
+        self.registerButton.setEnabled(not busy)
+        self.loginButton.setText("Logging in..." if busy else self.login_button_text)
+
+    def on_login_finished(self, response):
+        self.set_busy(False)
+        if response:
+            QMessageBox.information(self, "Success", "Login successful!")
+            if self.on_login_success:
+                self.on_login_success()
+            self.hide()
+
+    def on_login_failed(self, error):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Login Failed", f"Login failed: {str(error)}")
 
     def show_register_form(self):
         # You can implement a registration form here or use input dialogs for now        
@@ -72,20 +95,28 @@ class LoginController(QMainWindow, Ui_LoginWindow):
         if not ok5:
             return
             
-        try:
-            user_data = {
-                'email': email,
-                'username': username,
-                'password': password,
-                'full_name': full_name,
-                'age': age,
-                'gender': 'Other',  # Default value
-                'weight': 70.0,     # Default value
-                'height': 170.0     # Default value
-            }
-            
-            response = self.api_client.register(user_data)
-            if response:
-                QMessageBox.information(self, "Success", "Registration successful! Please login.")
-        except Exception as e:
-            QMessageBox.critical(self, "Registration Failed", f"Registration failed: {str(e)}")
+        user_data = {
+            'email': email,
+            'username': username,
+            'password': password,
+            'full_name': full_name,
+            'age': age,
+            'gender': 'Other',  # Default value
+            'weight': 70.0,     # Default value
+            'height': 170.0     # Default value
+        }
+
+        self.set_busy(True)
+        self.loader.load(
+            ("users.register", email), lambda: self.api_client.register(user_data),
+            on_result=self.on_register_finished, on_error=self.on_register_failed, owner=self
+        )
+
+    def on_register_finished(self, response):
+        self.set_busy(False)
+        if response:
+            QMessageBox.information(self, "Success", "Registration successful! Please login.")
+
+    def on_register_failed(self, error):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Registration Failed", f"Registration failed: {str(error)}")
@@ -6,11 +6,16 @@ This version works standalone without external UI file dependencies
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QStackedWidget, QScrollArea, QFrame, QMessageBox,
-    QDialog, QTextEdit, QLineEdit, QFormLayout, QComboBox, QSpinBox
+    QDialog, QTextEdit, QLineEdit, QFormLayout, QComboBox, QSpinBox, QTabWidget
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor, QPalette
 from app.services.api_client import APIClient
+from app.services.async_api_client import AsyncAPIClient
+from app.services.async_bridge import shared_bridge
+from app.widgets.skeleton import SkeletonPlaceholder
+from app.utils.config import DASHBOARD_PAGE_CACHE
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 import sys
@@ -18,10 +23,35 @@ import sys
 class WorkingDashboardController(QMainWindow):
     """Working Dashboard Controller with all bugs fixed"""
     
-    def __init__(self, api_client: Optional[APIClient] = None):
+    # Skeleton colours that read on the hero gradient
+    HERO_SKELETON_SHADES = ("rgba(255, 255, 255, 0.15)", "rgba(255, 255, 255, 0.25)")
+    
+    # (title, factory) per page index; a page is built the first time it is shown
+    PAGES = (
+        ("📊 Dashboard Overview", "create_dashboard_page"),
+        ("💪 Habits Tracking", "create_habits_page"),
+        ("❤️ Health Conditions", "create_health_page"),
+        ("📈 Analytics & Trends", "create_analytics_page"),
+        ("🤖 AI Predictions", "create_ai_page"),
+        ("👥 Community Insights", "create_community_page"),
+        ("⚙️ Settings", "create_settings_page"),
+    )
+    # Never evicted: the overview is the landing page and by far the slowest to build
+    PINNED_PAGES = frozenset({0})
+    
+    def __init__(self, api_client: Optional[APIClient] = None, page_cache_size: Optional[int] = None):
         super().__init__()
         self.api_client = api_client or APIClient()
+        # Hidden pages kept built; less recently shown ones are dropped and rebuilt on return
+        self.page_cache_size = DASHBOARD_PAGE_CACHE if page_cache_size is None else page_cache_size
+        self._pages = OrderedDict()  # page index -> widget in the stack, least recently shown first
+        self._page_state = {}        # page index -> state saved when the page was evicted
+        self.async_client = AsyncAPIClient.from_client(self.api_client)
+        self.async_bridge = shared_bridge()
         self.current_user = {}
+        # Results of the last gather_dashboard, None until the first one arrives
+        self.dashboard_data = None
+        self._dashboard_load = None
         
         # Initialize UI
         self.init_ui()
@@ -198,19 +228,10 @@ class WorkingDashboardController(QMainWindow):
         top_bar = self.create_top_bar()
         layout.addWidget(top_bar)
         
-        # Stacked widget for different pages
+        # Stacked widget for different pages, built on demand by switch_page
         self.contentStackedWidget = QStackedWidget()
-        
-        # Add pages
-        self.contentStackedWidget.addWidget(self.create_dashboard_page())  # 0
-        self.contentStackedWidget.addWidget(self.create_habits_page())  # 1
-        self.contentStackedWidget.addWidget(self.create_health_page())  # 2
-        self.contentStackedWidget.addWidget(self.create_analytics_page())  # 3
-        self.contentStackedWidget.addWidget(self.create_ai_page())  # 4
-        self.contentStackedWidget.addWidget(self.create_community_page())  # 5
-        self.contentStackedWidget.addWidget(self.create_settings_page())  # 6
-        
         layout.addWidget(self.contentStackedWidget)
+        self.switch_page(0)
         
         return content_widget
         
@@ -416,7 +437,7 @@ class WorkingDashboardController(QMainWindow):
         
         # Dynamic streak based on user data
         user_id = self.current_user.get('id', 'N/A')
-        streak_days = self.get_user_streak()
+        streak_days = self.get_user_streak() if self.dashboard_data is not None else "…"
         streak_label = QLabel(f"🔥 {streak_days} Day Streak!")
         streak_label.setFont(QFont("Arial", 13, QFont.Weight.Bold))
         streak_label.setStyleSheet("""
@@ -1350,22 +1371,55 @@ class WorkingDashboardController(QMainWindow):
         return page
         
     def switch_page(self, page_index):
-        """Switch between pages"""
-        self.contentStackedWidget.setCurrentIndex(page_index)
+        """Switch between pages, building the page if it is not in the stack"""
+        if not 0 <= page_index < len(self.PAGES):
+            return
+        self.contentStackedWidget.setCurrentWidget(self.page(page_index))
+        self.evict_pages()
         
         # Update page title
-        titles = [
-            "📊 Dashboard Overview",
-            "💪 Habits Tracking", 
-            "❤️ Health Conditions",
-            "📈 Analytics & Trends",
-            "🤖 AI Predictions",
-            "👥 Community Insights",
-            "⚙️ Settings"
-        ]
+        self.page_title.setText(self.PAGES[page_index][0])
+        
+    def page(self, page_index):
+        """The page's widget, built and given back its saved state if it was never shown or was evicted"""
+        page = self._pages.get(page_index)
+        if page is None:
+            page = getattr(self, self.PAGES[page_index][1])()
+            self.contentStackedWidget.addWidget(page)
+            self._pages[page_index] = page
+            state = self._page_state.pop(page_index, None)
+            if state:
+                self.restore_page_state(page, state)
+        self._pages.move_to_end(page_index)
+        return page
+        
+    def evict_pages(self):
+        """Drop the least recently shown hidden pages beyond page_cache_size (pinned ones aside), saving their state"""
+        current = self.contentStackedWidget.currentWidget()
+        hidden = [index for index, page in self._pages.items()
+                  if page is not current and index not in self.PINNED_PAGES]
+        for index in hidden[:max(0, len(hidden) - self.page_cache_size)]:
+            page = self._pages.pop(index)
+            self._page_state[index] = self.save_page_state(page)
+            self.contentStackedWidget.removeWidget(page)
+            page.deleteLater()
+            
+    def save_page_state(self, page):
+        """What a rebuilt page needs to look as it was left: scroll positions and selected tabs"""
+        return {
+            "scroll": [(area.horizontalScrollBar().value(), area.verticalScrollBar().value())
+                       for area in page.findChildren(QScrollArea)],
+            "tabs": [tabs.currentIndex() for tabs in page.findChildren(QTabWidget)],
+        }
         
-        if 0 <= page_index < len(titles):
-            self.page_title.setText(titles[page_index])
+    def restore_page_state(self, page, state):
+        for tabs, index in zip(page.findChildren(QTabWidget), state["tabs"]):
+            tabs.setCurrentIndex(index)
+        for area, (x, y) in zip(page.findChildren(QScrollArea), state["scroll"]):
+            # The scroll ranges are only known once the page is laid out
+            area.widget().adjustSize()
+            area.horizontalScrollBar().setValue(x)
+            area.verticalScrollBar().setValue(y)
             
     def show_profile_menu(self):
         """Show profile options"""
@@ -1543,17 +1597,28 @@ class WorkingDashboardController(QMainWindow):
         )
         
     def load_user_data(self):
-        """Load user data and refresh dashboard"""
+        """Fetch the dashboard's data concurrently in the background; the page fills in when it arrives"""
+        if self._dashboard_load is not None:
+            self._dashboard_load.cancel()
+        self._dashboard_load = self.async_bridge.submit(
+            self.async_client.gather_dashboard(),
+            on_result=self.on_dashboard_loaded,
+            on_error=lambda e: self.on_dashboard_loaded({"errors": {"user": str(e)}})
+        )
+
+    def on_dashboard_loaded(self, data):
+        """Apply the results of gather_dashboard and rebuild the dashboard page"""
+        self._dashboard_load = None
+        self.dashboard_data = data
         try:
-            # Try to load from API
-            user_data = self.api_client.get_current_user()
+            user_data = data.get("user")
             if user_data:
                 self.current_user = user_data
                 user_name = user_data.get('full_name', user_data.get('username', 'User'))
                 self.userNameLabel.setText(f"👤 {user_name}")
                 print(f"✅ Loaded user data: {user_name}")
             else:
-                raise Exception("No user data returned")
+                raise Exception(data["errors"].get("user", "No user data returned"))
         except Exception as e:
             # Use default for demo
             self.current_user = {
@@ -1572,12 +1637,18 @@ class WorkingDashboardController(QMainWindow):
     def refresh_dashboard_data(self):
         """Refresh dashboard with current user data"""
         try:
-            # Simple refresh - just update the title and user name
-            if hasattr(self, 'page_title'):
-                self.page_title.setText("📊 Dashboard Overview")
-            
-            # The hero section will automatically use the updated self.current_user data
-            # when the dashboard is shown again
+            # Rebuild the dashboard page from the updated self.current_user and self.dashboard_data;
+            # if it is not built, it picks them up when next shown
+            old_page = self._pages.get(0)
+            if old_page is not None:
+                new_page = self.create_dashboard_page()
+                self.contentStackedWidget.insertWidget(self.contentStackedWidget.indexOf(old_page), new_page)
+                if self.contentStackedWidget.currentWidget() is old_page:
+                    self.contentStackedWidget.setCurrentWidget(new_page)
+                self.restore_page_state(new_page, self.save_page_state(old_page))
+                self._pages[0] = new_page
+                self.contentStackedWidget.removeWidget(old_page)
+                old_page.deleteLater()
             print("✅ Dashboard data refreshed for user:", self.current_user.get('full_name', 'User'))
         except Exception as e:
             print(f"Could not refresh dashboard: {e}")
@@ -1595,6 +1666,13 @@ class WorkingDashboardController(QMainWindow):
             QMessageBox.information(self, "✅ Logout", "Logged out successfully!")
             self.close()
 
+    def closeEvent(self, a0):
+        """Drop an unfinished dashboard load and close the async client's connections"""
+        if self._dashboard_load is not None:
+            self._dashboard_load.cancel()
+        self.async_bridge.submit(self.async_client.aclose())
+        super().closeEvent(a0)
+
     def toggle_sidebar(self):
         """Show/hide the left navigation sidebar"""
         try:
@@ -1624,22 +1702,13 @@ class WorkingDashboardController(QMainWindow):
 
     def get_user_streak(self):
         """Get user's activity streak"""
-        try:
-            # Try to get from API
-            response = self.api_client.get("/api/users/streak")
-            if response and 'streak_days' in response:
-                return response['streak_days']
-        except Exception:
-            pass
+        # Fetched with the rest of the dashboard, see load_user_data
+        response = (self.dashboard_data or {}).get("streak")
+        if response and 'streak_days' in response:
+            return response['streak_days']
         
-        # Default streak calculation based on user creation
-        import random
-        from datetime import datetime
-        # Simulate streak based on user activity
-        user_id = self.current_user.get('id', 1)
-        # Use user ID to generate consistent "streak"
-        random.seed(user_id)
-        return random.randint(3, 30)
+        # No streak data (offline or no habit progress yet)
+        return 0
 
     def create_profile_summary(self):
         """Create a compact profile summary widget"""
@@ -1710,7 +1779,10 @@ class WorkingDashboardController(QMainWindow):
         # Get recent health data
         recent_data = self.get_recent_health_data()
         
-        if recent_data:
+        if self.dashboard_data is None:
+            # Skeleton entries until load_user_data delivers
+            layout.addWidget(SkeletonPlaceholder(lines=3, line_height=40, shades=self.HERO_SKELETON_SHADES))
+        elif recent_data:
             for entry in recent_data[:3]:  # Show last 3 entries
                 entry_widget = self.create_health_entry_widget(entry)
                 layout.addWidget(entry_widget)
@@ -1742,14 +1814,14 @@ class WorkingDashboardController(QMainWindow):
         return summary_widget
 
     def get_recent_health_data(self):
-        """Get recent health data entries from API"""
-        try:
-            # Try to get from API
-            response = self.api_client.get("/api/health-data/recent")
-            if response and 'entries' in response:
-                return response['entries']
-        except Exception as e:
-            print(f"Could not fetch health data: {e}")
+        """Recent health data entries, as fetched with the rest of the dashboard"""
+        if self.dashboard_data is None:
+            return []
+        response = self.dashboard_data.get("recent")
+        if response and 'entries' in response:
+            return response['entries']
+        if "recent" in self.dashboard_data["errors"]:
+            print(f"Could not fetch health data: {self.dashboard_data['errors']['recent']}")
         
         # Return sample data for demonstration
         from datetime import datetime, timedelta
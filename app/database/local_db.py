@@ -1,16 +1,73 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from ..utils.config import DB_CONFIG
+from ..utils.config import DATABASE_URL, SQLITE_PRAGMAS
 
-# Create SQLite connection URL
-DATABASE_URL = "sqlite:///smart_health_tracker.db"
+# Async driver used for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def attach_sqlite_pragmas(sync_engine, pragmas=None):
+    """
+    Apply the SQLite pragma profile from config (or the given pragmas) to
+    every new connection of the engine.
+    """
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_db_engine(url=DATABASE_URL, pragmas=None):
+    """
+    Create an engine for the given URL. SQLite connections get the tuned
+    pragma profile on every connect.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True)
+
+    db_engine = create_engine(url, connect_args={"check_same_thread": False})
+    attach_sqlite_pragmas(db_engine, pragmas)
+    return db_engine
+
+def to_async_url(url):
+    """Swap the driver in a database URL for its async counterpart"""
+    scheme, rest = url.split("://", 1)
+    backend = scheme.split("+")[0]
+    return f"{ASYNC_DRIVERS.get(backend, scheme)}://{rest}"
+
+def create_async_db_engine(url=DATABASE_URL, pragmas=None):
+    """
+    Create an AsyncEngine for the given URL (aiosqlite for SQLite, asyncpg
+    for Postgres) with the same SQLite pragma profile as the sync engine.
+    """
+    async_url = to_async_url(url)
+    if not url.startswith("sqlite"):
+        return create_async_engine(async_url, pool_pre_ping=True)
+
+    db_engine = create_async_engine(async_url)
+    attach_sqlite_pragmas(db_engine.sync_engine, pragmas)
+    return db_engine
 
-# Create session factory
+# Create SQLAlchemy engines
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit so responses never trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for declarative models
 Base = declarative_base()
@@ -25,8 +82,54 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """
+    Async generator dependency that yields an AsyncSession, so route
+    handlers await their queries instead of blocking the event loop
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def ensure_indexes(bind=None):
+    """
+    Create any model indexes that are missing from an existing database.
+    create_all() only emits indexes for tables it creates, so databases made
+    before an index was declared would never get it.
+    """
+    bind = bind or engine
+    existing_tables = set(inspect(bind).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+def ensure_columns(bind=None):
+    """
+    Add model columns that are missing from an existing database, like
+    ensure_indexes does for indexes. Only nullable columns or ones with a
+    server default can be added in place; others are left to a migration.
+    """
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
 def init_db():
     """
     Initialize database tables
     """
     Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
@@ -6,15 +6,14 @@ from PyQt6.QtWidgets import QApplication
 project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.insert(0, project_root)
 
-# Now we can import with the full path
+# Now we can import with the full path. Only what the login window needs is
+# imported up front; the dashboard and its widgets load after login.
 try:
     from app.controllers.login_controller import LoginController
-    from app.controllers.working_dashboard_controller import WorkingDashboardController
     from app.services.api_client import APIClient
 except ImportError:
     # Fallback to simple relative imports
     from controllers.login_controller import LoginController
-    from controllers.working_dashboard_controller import WorkingDashboardController
     from services.api_client import APIClient
 
 class SmartHealthTracker:
@@ -25,20 +24,27 @@ class SmartHealthTracker:
         self.dashboard = None
         
     def start(self):
+        self.show_login()
+        
+        # Start event loop
+        return self.app.exec()
+        
+    def show_login(self):
         # Create and show login window
         self.login_window = LoginController(self.api_client)
         self.login_window.set_login_callback(self.on_login_success)
         self.login_window.show()
         
-        # Start event loop
-        return self.app.exec()
-        
     def on_login_success(self):
         # Hide login window
         if self.login_window:
             self.login_window.hide()
             
         # Show modern dashboard
+        try:
+            from app.controllers.working_dashboard_controller import WorkingDashboardController
+        except ImportError:
+            from controllers.working_dashboard_controller import WorkingDashboardController
         self.dashboard = WorkingDashboardController(self.api_client)
         self.dashboard.show()
 
@@ -0,0 +1,13 @@
+# Import every model so relationship() targets given by class name (e.g.
+# User.recommendations) resolve whichever model module a caller imports
+from . import (
+    user_model,
+    habit_model,
+    health_data_model,
+    health_rollup_model,
+    recommendation_model,
+    session_model,
+    habit_event_model,
+    job_model,
+    data_version_model,
+)
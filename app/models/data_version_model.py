@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..database.local_db import Base
+
+class UserDataVersion(Base):
+    """
+    Data version of a user for the response cache, bumped after every
+    write, so all API workers agree on which cached responses and ETags
+    are current
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
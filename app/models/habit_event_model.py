@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index
+from datetime import datetime
+from ..database.local_db import Base
+
+class HabitEvent(Base):
+    """Append-only log of habit progress, one row per increment"""
+    __tablename__ = "habit_events"
+
+    id = Column(Integer, primary_key=True)
+    habit_id = Column(Integer, ForeignKey("habits.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    amount = Column(Float, nullable=False, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# Streak queries scan one user's days in order
+Index("ix_habit_events_user_day", HabitEvent.user_id, HabitEvent.day)
+
+class UserStreak(Base):
+    """Per-user streak cache, advanced incrementally as events are appended"""
+    __tablename__ = "user_streaks"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    current_streak = Column(Integer, nullable=False, default=0)  # run ending on last_day
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_day = Column(Date)  # latest active day
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
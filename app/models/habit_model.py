@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database.local_db import Base
@@ -19,6 +19,21 @@ class Habit(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every write
 
     # Relationships
     user = relationship("User", back_populates="habits")
+
+# 366 days fit in 46 bytes
+ACTIVITY_BITMAP_BYTES = 46
+
+class HabitActivity(Base):
+    """Days with progress on a habit in one year, as a bitmap"""
+    __tablename__ = "habit_activity"
+
+    habit_id = Column(Integer, ForeignKey("habits.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Bit n (little-endian) is set if there was progress on day n of the year, Jan 1 being 0
+    bits = Column(LargeBinary(ACTIVITY_BITMAP_BYTES), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.local_db import Base
@@ -49,4 +49,37 @@ class HealthData(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="health_data")
\ No newline at end of file
+    user = relationship("User", back_populates="health_data")
+
+# Metrics that are only filled in for some readings; each gets a partial index
+# so per-metric charts and "latest value" lookups skip the rows without it
+SPARSE_METRICS = (
+    "systolic_bp",
+    "blood_sugar",
+    "weight",
+    "sleep_hours",
+    "heart_rate",
+    "steps_count",
+    "stress_level",
+    "mood_score",
+    "energy_level",
+)
+
+# Every hot read filters on user_id and orders or ranges on measurement_time
+Index(
+    "ix_health_data_user_time",
+    HealthData.user_id,
+    HealthData.measurement_time.desc(),
+)
+
+for _metric in SPARSE_METRICS:
+    _column = getattr(HealthData, _metric)
+    # Covering (user_id, measurement_time, value) index over non-null rows only
+    Index(
+        f"ix_health_data_user_{_metric}",
+        HealthData.user_id,
+        HealthData.measurement_time,
+        _column,
+        sqlite_where=_column.isnot(None),
+        postgresql_where=_column.isnot(None),
+    )
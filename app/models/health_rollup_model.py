@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey
+from datetime import datetime
+from ..database.local_db import Base
+
+class HealthDailyRollup(Base):
+    """Per-user, per-day, per-metric aggregates of health_data"""
+    __tablename__ = "health_daily_rollup"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String(30), primary_key=True)  # HealthData column name
+
+    value_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0)
+    value_min = Column(Float)
+    value_max = Column(Float)
+    last_value = Column(Float)  # value of the latest reading that day
+    last_time = Column(DateTime)  # measurement_time of that reading
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
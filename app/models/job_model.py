@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from datetime import datetime
+from ..database.local_db import Base
+
+# Statuses of a job that hasn't finished; a user has at most one such job per kind
+ACTIVE_STATUSES = ("queued", "running")
+
+class Job(Base):
+    """Background job run by the API's job queue; result is JSON text"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # handler name, e.g. "recommendations"
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Coalesces duplicate submissions, even across API processes
+        Index(
+            "uq_jobs_active_user_kind", "user_id", "kind", unique=True,
+            sqlite_where=status.in_(ACTIVE_STATUSES), postgresql_where=status.in_(ACTIVE_STATUSES)
+        ),
+        Index("ix_jobs_status", "status"),
+    )
@@ -22,3 +22,4 @@ class User(Base):
     # Relationships
     habits = relationship("Habit", back_populates="user")
     health_data = relationship("HealthData", back_populates="user")
+    recommendations = relationship("Recommendation", back_populates="user")
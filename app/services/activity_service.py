@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from ..models.habit_model import HabitActivity, ACTIVITY_BITMAP_BYTES
+from ..models.habit_event_model import HabitEvent
+
+# Concurrent writers of the same habit-year retry their compare-and-swap
+MAX_CAS_ATTEMPTS = 5
+
+def day_index(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+def days_in_year(year: int) -> int:
+    return (date(year + 1, 1, 1) - date(year, 1, 1)).days
+
+def to_int(bits: bytes) -> int:
+    return int.from_bytes(bits or b"", "little")
+
+def to_bytes(value: int) -> bytes:
+    return value.to_bytes(ACTIVITY_BITMAP_BYTES, "little")
+
+def count_active(value: int, start: int = 0, end: int = 366) -> int:
+    """Popcount of days start..end-1"""
+    return ((value >> start) & ((1 << max(end - start, 0)) - 1)).bit_count()
+
+def run_ending_at(value: int, index: int) -> int:
+    """Length of the run of set bits ending at bit index (0 if that bit is clear)"""
+    window = value & ((1 << (index + 1)) - 1)
+    gaps = ~window & ((1 << (index + 1)) - 1)
+    # The highest clear bit at or below index bounds the run
+    return index + 1 - gaps.bit_length()
+
+def longest_run(value: int) -> int:
+    """Longest run of set bits: each x & (x >> 1) shortens every run by one"""
+    length = 0
+    while value:
+        value &= value >> 1
+        length += 1
+    return length
+
+def active_days(value: int, year: int) -> list:
+    """Dates of the set bits, scanning only set bits"""
+    start = date(year, 1, 1)
+    days = []
+    while value:
+        lowest = value & -value
+        days.append(start + timedelta(days=lowest.bit_length() - 1))
+        value ^= lowest
+    return days
+
+async def load_bitmaps(db, habit_id: int, years) -> dict:
+    """{year: int bitmap} for the requested years, 0 for years without activity"""
+    years = list(years)
+    result = await db.execute(select(HabitActivity.year, HabitActivity.bits).filter(
+        HabitActivity.habit_id == habit_id,
+        HabitActivity.year.in_(years)
+    ))
+    bitmaps = {year: 0 for year in years}
+    bitmaps.update({year: to_int(bits) for year, bits in result.all()})
+    return bitmaps
+
+async def mark_day(db, user_id: int, habit_id: int, day: date, active: bool = True):
+    """
+    Set or clear the day's bit of a habit-year. The blob is swapped with a
+    compare-and-swap UPDATE, so concurrent writers never drop each other's
+    bits. The caller commits.
+    """
+    bit = 1 << day_index(day)
+    dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    for _ in range(MAX_CAS_ATTEMPTS):
+        current = await db.scalar(select(HabitActivity.bits).filter(
+            HabitActivity.habit_id == habit_id,
+            HabitActivity.year == day.year
+        ))
+        if current is None:
+            if not active:
+                return
+            result = await db.execute(dialect_insert(HabitActivity).values(
+                habit_id=habit_id, year=day.year, user_id=user_id, bits=to_bytes(bit)
+            ).on_conflict_do_nothing(index_elements=["habit_id", "year"]))
+        else:
+            value = to_int(current)
+            updated = value | bit if active else value & ~bit
+            if updated == value:
+                return
+            result = await db.execute(update(HabitActivity).filter(
+                HabitActivity.habit_id == habit_id,
+                HabitActivity.year == day.year,
+                HabitActivity.bits == current
+            ).values(bits=to_bytes(updated)))
+        if result.rowcount:
+            return
+    raise RuntimeError(f"Activity bitmap of habit {habit_id} kept changing, gave up after {MAX_CAS_ATTEMPTS} attempts")
+
+async def record_progress(db, user_id: int, habit_id: int, day: date, amount: float):
+    """
+    Keep the bitmap in step with the event log after an event was appended:
+    progress sets the day's bit, an undo clears it once the day's events no
+    longer add up to anything.
+    """
+    if amount > 0:
+        await mark_day(db, user_id, habit_id, day, True)
+        return
+    total = await db.scalar(select(func.coalesce(func.sum(HabitEvent.amount), 0)).filter(
+        HabitEvent.user_id == user_id,
+        HabitEvent.day == day,
+        HabitEvent.habit_id == habit_id
+    ))
+    await mark_day(db, user_id, habit_id, day, total > 0)
+
+async def heatmap(db, habit_id: int, year: int) -> dict:
+    """A year of activity for a calendar heatmap"""
+    value = (await load_bitmaps(db, habit_id, [year]))[year]
+    return {
+        "year": year,
+        "days_in_year": days_in_year(year),
+        "active_days": count_active(value),
+        "longest_streak": longest_run(value),
+        "dates": active_days(value, year),
+        "bitmap": to_bytes(value).hex(),
+    }
+
+async def count_active_days(db, habit_id: int, start: date, end: date) -> int:
+    """Active days between start and end inclusive, one popcount per year"""
+    bitmaps = await load_bitmaps(db, habit_id, range(start.year, end.year + 1))
+    total = 0
+    for year, value in bitmaps.items():
+        first = day_index(start) if year == start.year else 0
+        last = day_index(end) if year == end.year else days_in_year(year) - 1
+        total += count_active(value, first, last + 1)
+    return total
+
+async def streak_summary(db, habit_id: int, today: date = None) -> dict:
+    """
+    Current and longest streak and active days of a habit. All its years
+    are joined into one bitmap, so runs across New Year need no special
+    case; the current streak ends today, or yesterday if today has no
+    progress yet.
+    """
+    today = today or datetime.utcnow().date()
+    result = await db.execute(select(HabitActivity.year, HabitActivity.bits).filter(
+        HabitActivity.habit_id == habit_id,
+        HabitActivity.year <= today.year
+    ).order_by(HabitActivity.year))
+    rows = result.all()
+    if not rows:
+        return {"current_streak": 0, "longest_streak": 0, "active_days": 0}
+    first_year = rows[0].year
+    combined = 0
+    for year, bits in rows:
+        combined |= to_int(bits) << (date(year, 1, 1) - date(first_year, 1, 1)).days
+    position = (today - date(first_year, 1, 1)).days
+    if not combined >> position & 1:
+        position -= 1
+    return {
+        "current_streak": run_ending_at(combined, position) if position >= 0 else 0,
+        "longest_streak": longest_run(combined),
+        "active_days": combined.bit_count(),
+    }
@@ -0,0 +1,389 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+from ..database.local_db import create_db_engine
+from ..models.habit_model import Habit
+from ..models.health_data_model import HealthData
+from ..models.recommendation_model import Recommendation
+from ..models.user_model import User
+from ..utils.config import (
+    DATABASE_URL, MODEL_PATH, RECOMMENDATION_CHUNK_SIZE, RECOMMENDATION_WINDOW_DAYS, RECOMMENDATION_WORKERS
+)
+
+# HealthData columns averaged over the window into one feature each
+HEALTH_FEATURES = (
+    "systolic_bp",
+    "diastolic_bp",
+    "blood_sugar",
+    "sleep_hours",
+    "sleep_quality",
+    "stress_level",
+    "steps_count",
+    "exercise_minutes",
+    "bmi",
+    "heart_rate",
+    "water_intake",
+    "mood_score",
+    "energy_level",
+)
+
+FEATURES = HEALTH_FEATURES + ("reading_count", "active_habits", "habit_completion")
+
+# Threshold rules, evaluated as one vectorized comparison per rule:
+# (type, feature, direction, threshold, span, title, description). The gap
+# past the threshold divided by span gives the severity, capped at 1.
+RULES = (
+    ("sleep", "sleep_hours", "below", 7, 3, "Get more sleep",
+     "You averaged {value:.1f} hours of sleep. Aim for 7-9 hours with a consistent bedtime."),
+    ("blood_pressure", "systolic_bp", "above", 130, 30, "Keep an eye on your blood pressure",
+     "Your systolic pressure averaged {value:.0f} mmHg. Cut back on salt and check it with your doctor."),
+    ("blood_pressure", "diastolic_bp", "above", 85, 20, "Keep an eye on your blood pressure",
+     "Your diastolic pressure averaged {value:.0f} mmHg. Cut back on salt and check it with your doctor."),
+    ("blood_sugar", "blood_sugar", "above", 140, 60, "Watch your blood sugar",
+     "Your blood sugar averaged {value:.0f} mg/dL. Favour whole grains and fibre over sugary food."),
+    ("stress", "stress_level", "above", 6, 4, "Take time to unwind",
+     "Your stress level averaged {value:.1f}/10. Try short breathing or mindfulness breaks."),
+    ("exercise", "steps_count", "below", 7000, 7000, "Walk a little more",
+     "You averaged {value:,.0f} steps a day. Build up towards 7,000-10,000."),
+    ("exercise", "exercise_minutes", "below", 30, 30, "Move for 30 minutes a day",
+     "You averaged {value:.0f} minutes of exercise a day. Aim for at least 30."),
+    ("weight", "bmi", "above", 25, 10, "Work towards a healthy weight",
+     "Your BMI averaged {value:.1f}. Small, steady changes to diet and activity add up."),
+    ("heart", "heart_rate", "above", 100, 30, "Check your resting heart rate",
+     "Your heart rate averaged {value:.0f} bpm, above the usual resting range. Consider seeing a doctor."),
+    ("hydration", "water_intake", "below", 2, 2, "Drink more water",
+     "You averaged {value:.1f} L of water a day. Aim for about 2-2.5 L."),
+    ("mental_health", "mood_score", "below", 5, 4, "Look after your mood",
+     "Your mood averaged {value:.1f}/10. Time outdoors, exercise and talking to someone can help."),
+    ("habits", "habit_completion", "below", 0.5, 0.5, "Keep up with your habits",
+     "You're {value:.0%} of the way to your habit targets. Start with the easiest one."),
+)
+
+# Lifestyle features the wellbeing model learns from, with the healthy
+# target for each and how it reads in a recommendation
+LIFESTYLE_TARGETS = {
+    "sleep_hours": (8, "sleeping {target} hours"),
+    "steps_count": (10000, "walking {target:,} steps a day"),
+    "exercise_minutes": (30, "exercising {target} minutes a day"),
+    "water_intake": (2.5, "drinking {target} L of water a day"),
+    "stress_level": (3, "bringing your stress down to {target}/10"),
+}
+
+# Readings in the window that make a rule's figures fully trusted
+MIN_READINGS = 7
+# Users with complete lifestyle features needed to fit the wellbeing model
+MIN_TRAINING_USERS = 50
+MODEL_SAMPLE_USERS = 20000
+# How often a server without enough data for the model tries fitting again
+MODEL_RETRY_SECONDS = 3600
+# Predicted wellbeing gain (points on the 1-10 scale) worth recommending
+MIN_MODEL_GAIN = 0.5
+MAX_RECOMMENDATIONS_PER_USER = 5
+
+MODEL_FILE = os.path.join(MODEL_PATH, "wellbeing.joblib")
+
+def extract_features(session, user_ids, since: datetime, contiguous: bool = True) -> pd.DataFrame:
+    """
+    Feature matrix of the given users, one float64 row per user id in the
+    given order. user_ids must be sorted: both queries scan the id range
+    with one GROUP BY, so a chunk of thousands of users costs two queries.
+    Pass contiguous=False for scattered ids, such as a random sample, to
+    match them with IN rather than read everyone between them.
+    Users without readings or habits have NaN features.
+    """
+    def of_users(column):
+        return column.between(user_ids[0], user_ids[-1]) if contiguous else column.in_(user_ids)
+
+    health = session.execute(
+        select(
+            HealthData.user_id,
+            *[func.avg(getattr(HealthData, feature)) for feature in HEALTH_FEATURES],
+            func.count(HealthData.id)
+        )
+        .filter(of_users(HealthData.user_id), HealthData.measurement_time >= since)
+        .group_by(HealthData.user_id)
+    ).all()
+    completion = func.coalesce(Habit.current_value, 0) / Habit.target_value
+    habits = session.execute(
+        select(
+            Habit.user_id,
+            func.count(Habit.id),
+            func.avg(case((completion > 1, 1.0), else_=completion))
+        )
+        .filter(of_users(Habit.user_id), Habit.is_active.is_(True), Habit.target_value > 0)
+        .group_by(Habit.user_id)
+    ).all()
+
+    health_frame = pd.DataFrame.from_records(
+        health, columns=["user_id", *HEALTH_FEATURES, "reading_count"], index="user_id", coerce_float=True
+    )
+    habit_frame = pd.DataFrame.from_records(
+        habits, columns=["user_id", "active_habits", "habit_completion"], index="user_id", coerce_float=True
+    )
+    features = health_frame.join(habit_frame, how="outer").reindex(pd.Index(user_ids, name="user_id"))
+    return features[list(FEATURES)].astype(np.float64)
+
+def apply_rules(features: pd.DataFrame) -> pd.DataFrame:
+    """Candidate recommendations from the threshold rules, one row per (user, rule) hit"""
+    # Figures averaged from a handful of readings are trusted less
+    trust = (features["reading_count"] / MIN_READINGS).clip(upper=1.0).fillna(0.0)
+    candidates = []
+    for rec_type, feature, direction, threshold, span, title, description in RULES:
+        values = features[feature]
+        gap = threshold - values if direction == "below" else values - threshold
+        hit = (gap > 0).to_numpy()
+        if not hit.any():
+            continue
+        severity = (gap[hit] / span).clip(upper=1.0).to_numpy()
+        weight = 1.0 if feature.startswith("habit") else trust[hit].to_numpy()
+        candidates.append(pd.DataFrame({
+            "user_id": features.index[hit],
+            "recommendation_type": rec_type,
+            "title": title,
+            "description": [description.format(value=value) for value in values[hit]],
+            "severity": severity,
+            "confidence_score": ((0.6 + 0.35 * severity) * weight).round(2),
+        }))
+    return pd.concat(candidates, ignore_index=True) if candidates else None
+
+class WellbeingModel:
+    """
+    Ridge regression of average mood and energy on lifestyle features,
+    fitted across users. Its coefficients say how much each lifestyle
+    change is associated with feeling better, which turns into a
+    personalised recommendation for the change with the biggest expected
+    gain for each user.
+    """
+
+    def __init__(self):
+        self.pipeline = None
+        self.score = 0.0
+
+    @staticmethod
+    def _training_data(features):
+        data = features[list(LIFESTYLE_TARGETS) + ["mood_score", "energy_level"]].dropna()
+        return data[list(LIFESTYLE_TARGETS)], (data["mood_score"] + data["energy_level"]) / 2
+
+    def fit(self, features: pd.DataFrame) -> bool:
+        """Fit on every user with complete features; False if there are too few"""
+        X, y = self._training_data(features)
+        if len(X) < MIN_TRAINING_USERS:
+            return False
+        self.pipeline = make_pipeline(StandardScaler(), Ridge(alpha=1.0)).fit(X.to_numpy(), y.to_numpy())
+        self.score = float(self.pipeline.score(X.to_numpy(), y.to_numpy()))
+        return True
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """Change in wellbeing per unit of each lifestyle feature"""
+        scaler, ridge = self.pipeline[0], self.pipeline[-1]
+        return ridge.coef_ / scaler.scale_
+
+    def gains(self, features: pd.DataFrame) -> pd.DataFrame:
+        """
+        Expected wellbeing gain for each user and lifestyle feature from
+        moving it to its healthy target. Only moves towards the target
+        count; features already past it, or missing, give NaN.
+        """
+        values = features[list(LIFESTYLE_TARGETS)].to_numpy()
+        targets = np.array([target for target, _ in LIFESTYLE_TARGETS.values()], dtype=np.float64)
+        gains = (targets - values) * self.coefficients
+        gains[(gains <= 0) | np.isnan(values)] = np.nan
+        return pd.DataFrame(gains, index=features.index, columns=list(LIFESTYLE_TARGETS))
+
+    def recommend(self, features: pd.DataFrame) -> pd.DataFrame:
+        """The lifestyle change with the biggest expected gain per user, if it clears MIN_MODEL_GAIN"""
+        gains = self.gains(features)
+        best_gain = gains.max(axis=1)
+        chosen = (best_gain >= MIN_MODEL_GAIN).to_numpy()
+        if not chosen.any():
+            return None
+        best_feature = gains[chosen].idxmax(axis=1)
+        best_gain = best_gain[chosen]
+        descriptions = []
+        for feature, gain in zip(best_feature, best_gain):
+            target, phrase = LIFESTYLE_TARGETS[feature]
+            descriptions.append(
+                f"People with routines like yours who are {phrase.format(target=target)} "
+                f"report about {gain:.1f} points better mood and energy."
+            )
+        severity = (best_gain / 3).clip(upper=1.0).to_numpy()
+        return pd.DataFrame({
+            "user_id": best_gain.index,
+            "recommendation_type": "lifestyle",
+            "title": "Your most promising change",
+            "description": descriptions,
+            "severity": severity,
+            "confidence_score": np.round(np.clip(self.score, 0.3, 0.95) * (0.7 + 0.3 * severity), 2),
+        })
+
+    def save(self, path: str = None):
+        path = path or MODEL_FILE
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({"pipeline": self.pipeline, "score": self.score}, path)
+
+    @classmethod
+    def load(cls, path: str = None):
+        """The saved model, or None if there is none"""
+        path = path or MODEL_FILE
+        if not os.path.exists(path):
+            return None
+        model = cls()
+        saved = joblib.load(path)
+        model.pipeline, model.score = saved["pipeline"], saved["score"]
+        return model
+
+def window_start(window_days: int = RECOMMENDATION_WINDOW_DAYS) -> datetime:
+    return datetime.utcnow() - timedelta(days=window_days)
+
+def fit_model(session, since: datetime, sample_size: int = MODEL_SAMPLE_USERS):
+    """Fit the wellbeing model on a random sample of users; None if there is too little data"""
+    user_ids = session.execute(select(User.id)).scalars().all()
+    sampled = len(user_ids) > sample_size
+    if sampled:
+        user_ids = random.sample(user_ids, sample_size)
+    model = WellbeingModel()
+    features = pd.concat([
+        extract_features(session, chunk, since, contiguous=not sampled)
+        for chunk in _chunks(sorted(user_ids), RECOMMENDATION_CHUNK_SIZE)
+    ]) if user_ids else pd.DataFrame(columns=list(FEATURES))
+    return model if model.fit(features) else None
+
+def score_users(features: pd.DataFrame, model: WellbeingModel = None) -> list:
+    """
+    Recommendation rows for every user in the feature matrix: rule hits
+    and the model's suggestion, keeping the strongest per type and the
+    MAX_RECOMMENDATIONS_PER_USER strongest per user.
+    """
+    candidates = [apply_rules(features)]
+    if model is not None:
+        candidates.append(model.recommend(features))
+    candidates = [frame for frame in candidates if frame is not None]
+    if not candidates:
+        return []
+    scored = pd.concat(candidates, ignore_index=True).sort_values("severity", ascending=False, kind="stable")
+    scored = scored.drop_duplicates(["user_id", "recommendation_type"])
+    scored = scored.groupby("user_id", sort=False).head(MAX_RECOMMENDATIONS_PER_USER)
+    scored["priority_level"] = (2 + (scored["severity"] * 3).round()).astype(int)
+    scored["user_id"] = scored["user_id"].astype(int)
+    return scored.drop(columns="severity").to_dict("records")
+
+def save_recommendations(session, user_ids, rows: list):
+    """
+    Replace the given users' pending recommendations with new rows in
+    bulk. Implemented ones are kept as history. The caller commits.
+    """
+    session.execute(delete(Recommendation).filter(
+        Recommendation.user_id.in_(user_ids),
+        Recommendation.is_implemented.is_(False)
+    ))
+    if rows:
+        now = datetime.utcnow()
+        session.execute(insert(Recommendation), [
+            {**row, "is_implemented": False, "created_at": now, "updated_at": now} for row in rows
+        ])
+
+class AIService:
+    """
+    Health recommendations for one user at a time, for the API. The
+    wellbeing model is loaded from MODEL_FILE (written by the batch job)
+    or fitted on first use, not on import, and then shared by every request.
+    """
+
+    def __init__(self, window_days: int = RECOMMENDATION_WINDOW_DAYS):
+        self.window_days = window_days
+        self.model = None
+        self._model_loaded = False
+        self._last_fit_attempt = None
+        # Requests run on worker threads; one of them loads or fits the model
+        self._model_lock = threading.Lock()
+
+    def get_model(self, session):
+        """The shared model; without one, a fit is retried at most every MODEL_RETRY_SECONDS"""
+        with self._model_lock:
+            if not self._model_loaded:
+                self._model_loaded = True
+                self.model = WellbeingModel.load()
+            if self.model is None and (
+                self._last_fit_attempt is None or time.monotonic() - self._last_fit_attempt > MODEL_RETRY_SECONDS
+            ):
+                self._last_fit_attempt = time.monotonic()
+                self.model = fit_model(session, window_start(self.window_days))
+            return self.model
+
+    def generate_recommendations(self, user_id: int, session) -> list:
+        """Score one user and replace their pending recommendations; the caller commits"""
+        features = extract_features(session, [user_id], window_start(self.window_days))
+        rows = score_users(features, self.get_model(session))
+        save_recommendations(session, [user_id], rows)
+        return rows
+
+ai_service = AIService()
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Each batch worker process opens its own engine and gets the fitted model once
+_worker_engine = None
+_worker_model = None
+
+def _init_worker(url, model):
+    global _worker_engine, _worker_model
+    _worker_engine = create_db_engine(url)
+    _worker_model = model
+
+def _score_chunk(user_ids, since):
+    with Session(_worker_engine) as session:
+        return user_ids, score_users(extract_features(session, user_ids, since), _worker_model)
+
+def generate_all(url: str = DATABASE_URL, chunk_size: int = RECOMMENDATION_CHUNK_SIZE,
+                 workers: int = RECOMMENDATION_WORKERS, window_days: int = RECOMMENDATION_WINDOW_DAYS,
+                 progress=None) -> dict:
+    """
+    Regenerate recommendations for every active user. The wellbeing model
+    is fitted once on a sample and saved; then worker processes extract
+    and score chunks of users in parallel while this process writes each
+    finished chunk in bulk, so SQLite only ever sees one writer.
+    """
+    engine = create_db_engine(url)
+    since = window_start(window_days)
+    with Session(engine) as session:
+        user_ids = session.execute(
+            select(User.id).filter(User.is_active.isnot(False)).order_by(User.id)
+        ).scalars().all()
+        model = fit_model(session, since)
+    if model is not None:
+        model.save()
+
+    chunks = list(_chunks(user_ids, chunk_size))
+    stats = {"users": len(user_ids), "recommendations": 0, "chunks": len(chunks), "model": model is not None}
+
+    def write(results):
+        for chunk_ids, rows in results:
+            with Session(engine) as session:
+                save_recommendations(session, chunk_ids, rows)
+                session.commit()
+            stats["recommendations"] += len(rows)
+            if progress:
+                progress(stats["recommendations"], chunk_ids[-1])
+
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(url, model)
+        write(_score_chunk(chunk, since) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(url, model)) as pool:
+            write(pool.map(_score_chunk, chunks, [since] * len(chunks)))
+    engine.dispose()
+    return stats
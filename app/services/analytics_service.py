@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from ..models.health_data_model import HealthData
+
+# Every numeric HealthData metric
+ANALYTICS_METRICS = (
+    "systolic_bp",
+    "diastolic_bp",
+    "blood_sugar",
+    "sleep_hours",
+    "sleep_quality",
+    "stress_level",
+    "steps_count",
+    "exercise_minutes",
+    "weight",
+    "bmi",
+    "heart_rate",
+    "water_intake",
+    "mood_score",
+    "energy_level",
+)
+
+ROLLING_WINDOWS = (7, 30, 90)
+ROLLING_STATS = ("mean", "median", "std", "min", "max")
+
+# Relative change of the 7-day mean against the 30-day mean that counts as a trend
+TREND_THRESHOLD = 0.02
+
+async def load_daily(db, user_id: int, since: date, metrics=ANALYTICS_METRICS) -> pd.DataFrame:
+    """
+    A user's mean reading per calendar day since the given day, as
+    float64 columns indexed by day. SQLite averages each day, so at most
+    one row per day crosses the cursor, and the rows go straight into
+    column arrays without ORM objects. Days without a reading for a
+    metric are NaN.
+    """
+    day = func.date(HealthData.measurement_time)
+    result = await db.execute(
+        select(day, *[func.avg(getattr(HealthData, metric)) for metric in metrics])
+        .filter(
+            HealthData.user_id == user_id,
+            HealthData.measurement_time >= datetime.combine(since, datetime.min.time())
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+    frame = pd.DataFrame.from_records(result.all(), columns=["day", *metrics], coerce_float=True)
+    index = pd.DatetimeIndex(pd.to_datetime(frame.pop("day")))
+    return frame.set_index(index).astype(np.float64)
+
+def rolling_stats(daily: pd.DataFrame, end: date, windows=ROLLING_WINDOWS) -> pd.DataFrame:
+    """
+    Rolling statistics of every metric column for each window up to end,
+    as one frame with (window, metric, stat) columns. Each statistic is a
+    single vectorized kernel over all metric columns; missing days are
+    NaN rows, so every window covers exactly that many calendar days.
+    """
+    daily = daily.reindex(pd.date_range(daily.index[0], pd.Timestamp(end), freq="D"))
+    frames = {}
+    for window in windows:
+        rolling = daily.rolling(window, min_periods=1)
+        frames[f"{window}d"] = pd.concat({stat: getattr(rolling, stat)() for stat in ROLLING_STATS}, axis=1)
+    # Columns become (window, stat, metric); reorder to (window, metric, stat)
+    return pd.concat(frames, axis=1).swaplevel(1, 2, axis=1)
+
+def _number(value):
+    return None if pd.isna(value) else round(float(value), 2)
+
+def trend_direction(short_mean, long_mean) -> str:
+    if pd.isna(short_mean) or pd.isna(long_mean) or long_mean == 0:
+        return "unknown"
+    change = (short_mean - long_mean) / abs(long_mean)
+    if change > TREND_THRESHOLD:
+        return "up"
+    if change < -TREND_THRESHOLD:
+        return "down"
+    return "stable"
+
+def latest_trends(stats: pd.DataFrame, metrics=ANALYTICS_METRICS) -> dict:
+    """Per metric: each window's statistics as of the last day, and the 7- vs 30-day direction"""
+    if stats.empty:
+        return {}
+    last = stats.iloc[-1]
+    trends = {}
+    for metric in metrics:
+        windows = {
+            f"{window}d": {stat: _number(last[(f"{window}d", metric, stat)]) for stat in ROLLING_STATS}
+            for window in ROLLING_WINDOWS
+        }
+        # Metrics never recorded in the longest window are left out
+        if windows[f"{ROLLING_WINDOWS[-1]}d"]["mean"] is None:
+            continue
+        windows["direction"] = trend_direction(
+            last[("7d", metric, "mean")], last[("30d", metric, "mean")]
+        )
+        trends[metric] = windows
+    return trends
+
+async def compute_trends(db, user_id: int, today: date = None) -> dict:
+    """Rolling 7/30/90-day statistics of every metric as of today, from the last 90 days of readings"""
+    today = today or datetime.utcnow().date()
+    daily = await load_daily(db, user_id, today - timedelta(days=max(ROLLING_WINDOWS) - 1))
+    if daily.empty:
+        return {}
+    return latest_trends(rolling_stats(daily, end=today))
@@ -1,239 +1,542 @@
+import gzip
+import json
+import random
+import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+import struct
 import sys
+import time
 import os
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
 # Add project root to path
 project_root = os.path.join(os.path.dirname(__file__), '../..')
 sys.path.insert(0, project_root)
 
 try:
-    from app.utils.config import API_URL
+    from app.utils.config import API_URL, API_TIMEOUT, API_POOL_SIZE, API_RETRIES, API_BACKOFF, API_GZIP_MIN_BYTES
 except ImportError:
-    from utils.config import API_URL
+    from utils.config import API_URL, API_TIMEOUT, API_POOL_SIZE, API_RETRIES, API_BACKOFF, API_GZIP_MIN_BYTES
 
-class APIClient:
-    def __init__(self):
-        self.base_url = API_URL
-        self.token = None
+# Columnar response formats offered by the chart and listing endpoints
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+COLUMNS_MEDIA_TYPE = "application/vnd.smart-health.columns"
+COLUMNS_MAGIC = b"SHC1"
+
+# Longest the server is asked to hold a job status request open
+JOB_POLL_WAIT = 10
+
+# Methods that are safe to send again after a dropped connection, a timeout
+# or a gateway/overload status; POSTs are never retried
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+# Body fields that make a write conditional on the version the client read.
+# If the first attempt lands but its response is lost, a retry fails with
+# 409, so such writes are not retried
+VERSION_FIELDS = ("version", "expected_version")
+# Cap on a single backoff sleep, in seconds
+MAX_BACKOFF = 8
+
+def decode_columns(payload: bytes) -> Dict:
+    """
+    Decode the compact column format into {name: float64 ndarray}, NaN
+    meaning null. The arrays are views over the payload, no copying.
+    """
+    import numpy as np
+
+    if payload[:4] != COLUMNS_MAGIC:
+        raise ValueError("Not a smart-health columns payload")
+    rows, count = struct.unpack_from("<II", payload, 4)
+    offset = 12
+    names = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", payload, offset)
+        names.append(payload[offset + 2:offset + 2 + length].decode("utf-8"))
+        offset += 2 + length
+    columns = {}
+    for name in names:
+        columns[name] = np.frombuffer(payload, dtype="<f8", count=rows, offset=offset)
+        offset += rows * 8
+    return columns
+
+def decode_arrow(payload: bytes) -> Dict:
+    """Decode an Arrow IPC stream into {name: float64 ndarray}, nulls as NaN"""
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(payload).read_all()
+    return {
+        name: table.column(name).to_numpy(zero_copy_only=False).astype(float)
+        for name in table.column_names
+    }
+
+def decode_columnar(content_type: str, payload: bytes) -> Dict:
+    if content_type.startswith(ARROW_MEDIA_TYPE):
+        return decode_arrow(payload)
+    return decode_columns(payload)
+
+def decode_columnar_response(response) -> Dict:
+    """decode_columnar for a requests or httpx response"""
+    return decode_columnar(response.headers.get('Content-Type', ''), response.content)
+
+def encode_json_body(json_body, headers: Dict) -> Optional[bytes]:
+    """
+    Request body for json_body (None for no body), gzipped from
+    API_GZIP_MIN_BYTES on; sets the matching headers in place
+    """
+    if json_body is None:
+        return None
+    data = json.dumps(json_body, allow_nan=False).encode('utf-8')
+    headers.setdefault('Content-Type', 'application/json')
+    if len(data) >= API_GZIP_MIN_BYTES:
+        data = gzip.compress(data, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    return data
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+def shared_session() -> requests.Session:
+    """
+    Process-wide Session, so every APIClient (and thread) reuses the same
+    kept-alive connections instead of a new TCP connection per call.
+    Retries are done by APIClient, not by urllib3.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=API_POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _shared_session = session
+        return _shared_session
+
+def backoff_delay(attempt: int, base: float = API_BACKOFF) -> float:
+    """Full-jitter exponential backoff: uniform over [0, base * 2**attempt], capped at MAX_BACKOFF"""
+    return random.uniform(0, min(MAX_BACKOFF, base * 2 ** attempt))
+
+def default_retries(method: str, json_body=None) -> int:
+    """How often a request is retried unless the caller says otherwise"""
+    if method not in IDEMPOTENT_METHODS:
+        return 0
+    if isinstance(json_body, dict) and any(field in json_body for field in VERSION_FIELDS):
+        return 0
+    return API_RETRIES
+
+def retry_after(response) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds; HTTP dates are ignored"""
+    try:
+        return min(MAX_BACKOFF, max(0.0, float(response.headers["Retry-After"])))
+    except (KeyError, ValueError):
+        return None
+
+def retry_delay(attempt: int, retries: int, response=None) -> Optional[float]:
+    """
+    Seconds to wait before sending a request again, or None if the attempt
+    is final. response is the attempt's response, None if it failed to
+    connect or timed out.
+    """
+    if attempt >= retries:
+        return None
+    if response is None:
+        return backoff_delay(attempt)
+    if response.status_code not in RETRY_STATUSES:
+        return None
+    delay = retry_after(response)
+    return backoff_delay(attempt) if delay is None else delay
+
+class EndpointTimings:
+    """
+    Wall-clock time per endpoint, retries and backoff included. Query
+    strings are dropped and numeric path segments folded into {id}, so
+    /api/habits/7 and /api/habits/9 count as one endpoint. Thread-safe.
+    """
+
+    def __init__(self, samples: int = 256):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    @staticmethod
+    def endpoint(method: str, path: str) -> str:
+        path = path.split('?', 1)[0]
+        return f"{method} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)}"
+
+    def record(self, method: str, path: str, elapsed: float, failed: bool, retries: int):
+        key = self.endpoint(method, path)
+        with self._lock:
+            entry = self._endpoints.get(key)
+            if entry is None:
+                entry = self._endpoints[key] = {
+                    "count": 0, "errors": 0, "retries": 0, "total": 0.0, "max": 0.0,
+                    "recent": deque(maxlen=self.samples),
+                }
+            entry["count"] += 1
+            entry["errors"] += failed
+            entry["retries"] += retries
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+            entry["recent"].append(elapsed)
+
+    def snapshot(self) -> Dict:
+        """Per endpoint: counts, and mean/max plus p50/p95 over recent calls, in ms"""
+        with self._lock:
+            endpoints = {key: dict(entry, recent=sorted(entry["recent"])) for key, entry in self._endpoints.items()}
+        stats = {}
+        for key, entry in endpoints.items():
+            recent = entry["recent"]
+            stats[key] = {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "retries": entry["retries"],
+                "mean_ms": round(entry["total"] / entry["count"] * 1000, 2),
+                "p50_ms": round(recent[len(recent) // 2] * 1000, 2),
+                "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 2),
+                "max_ms": round(entry["max"] * 1000, 2),
+            }
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+class APIClientBase:
+    """
+    Everything APIClient and AsyncAPIClient share besides sending requests:
+    auth headers, body encoding, the retry policy, timings, the ETag cache
+    and how endpoint requests are built. A fix here applies to both.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, token: Optional[str] = None,
+                 timings: Optional[EndpointTimings] = None):
+        self.base_url = base_url or API_URL
+        self.token = token
+        self.timings = timings or EndpointTimings()
+        # Last 200 response per (path, params, Accept) for If-None-Match revalidation
+        self._etag_cache = {}
 
     def _get_headers(self) -> Dict:
         headers = {'Content-Type': 'application/json'}
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
+        headers.update(self.auth_headers())
         return headers
 
+    def auth_headers(self) -> Dict:
+        """Authorization header for the logged-in session, for widgets calling the API directly"""
+        return {'Authorization': f'Bearer {self.token}'} if self.token else {}
+
+    def _prepare(self, method: str, json_body, headers: Optional[Dict], retries: Optional[int]):
+        """(body, headers, retries) of a request about to be sent"""
+        headers = dict(headers) if headers is not None else self._get_headers()
+        data = encode_json_body(json_body, headers)
+        if retries is None:
+            retries = default_retries(method, json_body)
+        return data, headers, retries
+
+    def _record(self, method: str, path: str, started: float, retries: int, response=None):
+        """Time a finished request; no response means it failed to connect or timed out"""
+        failed = response is None or response.status_code >= 400
+        self.timings.record(method, path, time.perf_counter() - started, failed, retries)
+
+    def _revalidation(self, path: str, params: Optional[Dict], headers: Optional[Dict]):
+        """
+        (cache key, stored response, headers) for a conditional GET; the
+        headers carry the stored response's ETag as If-None-Match
+        """
+        headers = headers or self._get_headers()
+        key = (path, tuple(sorted((params or {}).items())), headers.get('Accept'))
+        cached = self._etag_cache.get(key)
+        if cached is not None:
+            headers['If-None-Match'] = cached.headers['ETag']
+        return key, cached, headers
+
+    def _revalidated(self, key, cached, response):
+        """The stored response for a 304, else the new one, stored if it has an ETag"""
+        if response.status_code == 304 and cached is not None:
+            return cached
+        if response.status_code == 200 and 'ETag' in response.headers:
+            self._etag_cache[key] = response
+        return response
+
+    def _logged_in(self, data: Dict) -> Dict:
+        self.token = data['access_token']
+        self._etag_cache.clear()
+        return data
+
+    def _logged_out(self):
+        self.token = None
+        self._etag_cache.clear()
+
+    def timing_stats(self) -> Dict:
+        """Latency per endpoint of this client's requests, see EndpointTimings"""
+        return self.timings.snapshot()
+
+    @staticmethod
+    def _chart_params(days: int, max_points: Optional[int]) -> Dict:
+        params = {"days": days}
+        if max_points:
+            params["max_points"] = max_points
+        return params
+
+    def _columnar_headers(self, arrow: bool = False) -> Dict:
+        headers = self._get_headers()
+        headers['Accept'] = ARROW_MEDIA_TYPE if arrow else COLUMNS_MEDIA_TYPE
+        return headers
+
+    @staticmethod
+    def _page_params(limit: int, cursor: Optional[str]) -> Dict:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        return params
+
+    @staticmethod
+    def _dated(data: Dict, date: Optional[str]) -> Dict:
+        """A health condition reading, with its date if given"""
+        if date:
+            data["date"] = date
+        return data
+
+    @staticmethod
+    def _job_wait(deadline: float) -> float:
+        """How long to have the server hold the next job status request"""
+        return round(max(0, min(JOB_POLL_WAIT, deadline - time.monotonic())), 1)
+
+    @staticmethod
+    def _finished_job(job: Dict, job_id: int, deadline: float, timeout: float) -> bool:
+        """Whether polling a job is over; raises TimeoutError past the deadline"""
+        if job["status"] in ("done", "failed"):
+            return True
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Job {job_id} did not finish within {timeout}s")
+        return False
+
+    @staticmethod
+    def _generated(job: Dict):
+        if job["status"] == "failed":
+            raise RuntimeError(job.get("error") or "Recommendation generation failed")
+
+class APIClient(APIClientBase):
+    def __init__(self, base_url: Optional[str] = None, session: Optional[requests.Session] = None):
+        super().__init__(base_url)
+        self.session = session or shared_session()
+
+    def _request(self, method: str, path: str, json_body=None, params: Optional[Dict] = None,
+                 headers: Optional[Dict] = None, timeout=None, retries: Optional[int] = None) -> requests.Response:
+        """
+        Send a request on the shared session with a timeout (API_TIMEOUT
+        unless given). Idempotent methods, except writes conditional on a
+        version, are retried on connection errors, timeouts and
+        502/503/504, sleeping with jittered exponential backoff or for the
+        server's Retry-After. JSON bodies of API_GZIP_MIN_BYTES or more
+        are sent gzipped.
+        """
+        data, headers, retries = self._prepare(method, json_body, headers, retries)
+        url = f"{self.base_url}{path}"
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method, url, params=params, data=data, headers=headers, timeout=timeout or API_TIMEOUT
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                delay = retry_delay(attempt, retries)
+                if delay is None:
+                    self._record(method, path, started, attempt)
+                    raise
+            else:
+                delay = retry_delay(attempt, retries, response)
+                if delay is None:
+                    self._record(method, path, started, attempt, response)
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    def _conditional_get(self, path: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                         timeout: Optional[float] = None, retries: Optional[int] = None) -> requests.Response:
+        """
+        GET that sends the ETag of the last response for the same request as
+        If-None-Match; a 304 is answered with that stored response.
+        """
+        key, cached, headers = self._revalidation(path, params, headers)
+        response = self._request("GET", path, params=params, headers=headers, timeout=timeout, retries=retries)
+        return self._revalidated(key, cached, response)
+
+    def _json(self, method: str, path: str, json_body=None, **kwargs):
+        response = self._request(method, path, json_body=json_body, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
     def login(self, email: str, password: str) -> Dict:
-        response = requests.post(
-            f"{self.base_url}/api/users/login",
-            json={"email": email, "password": password}
+        response = self._request(
+            "POST", "/api/users/login",
+            json_body={"email": email, "password": password},
+            headers={'Content-Type': 'application/json'}
         )
         if response.status_code == 200:
-            data = response.json()
-            self.token = data['access_token']
-            return data
+            return self._logged_in(response.json())
         response.raise_for_status()
 
+    def logout(self) -> None:
+        if self.token:
+            self._request("POST", "/api/users/logout", timeout=5)
+        self._logged_out()
+
     def register(self, user_data: Dict) -> Dict:
-        response = requests.post(
-            f"{self.base_url}/api/users/register",
-            json=user_data
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("POST", "/api/users/register", user_data, headers={'Content-Type': 'application/json'})
 
     def get_current_user(self) -> Dict:
-        response = requests.get(
-            f"{self.base_url}/api/users/me",
-            headers=self._get_headers()
-        )
+        response = self._conditional_get("/api/users/me")
         response.raise_for_status()
         return response.json()
 
     def update_user(self, user_data: Dict) -> Dict:
-        response = requests.put(
-            f"{self.base_url}/api/users/me",
-            headers=self._get_headers(),
-            json=user_data
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("PUT", "/api/users/me", user_data)
 
     def get_habits(self) -> List[Dict]:
-        response = requests.get(
-            f"{self.base_url}/api/habits",
-            headers=self._get_headers()
-        )
+        response = self._conditional_get("/api/habits")
         response.raise_for_status()
         return response.json()
 
     def create_habit(self, habit_data: Dict) -> Dict:
-        response = requests.post(
-            f"{self.base_url}/api/habits",
-            headers=self._get_headers(),
-            json=habit_data
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("POST", "/api/habits", habit_data)
 
     def update_habit(self, habit_id: int, habit_data: Dict) -> Dict:
-        response = requests.put(
-            f"{self.base_url}/api/habits/{habit_id}",
-            headers=self._get_headers(),
-            json=habit_data
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("PUT", f"/api/habits/{habit_id}", habit_data)
 
     def delete_habit(self, habit_id: int) -> None:
-        response = requests.delete(
-            f"{self.base_url}/api/habits/{habit_id}",
-            headers=self._get_headers()
-        )
+        response = self._request("DELETE", f"/api/habits/{habit_id}")
         response.raise_for_status()
 
     def get_recommendations(self) -> List[Dict]:
-        response = requests.get(
-            f"{self.base_url}/api/recommendations",
-            headers=self._get_headers()
-        )
+        response = self._conditional_get("/api/recommendations")
         response.raise_for_status()
         return response.json()
 
-    def generate_recommendations(self) -> List[Dict]:
-        response = requests.post(
-            f"{self.base_url}/api/recommendations/generate",
-            headers=self._get_headers()
+    def generate_recommendations(self, timeout: float = 60) -> List[Dict]:
+        """
+        Queue generation on the server, wait for the job and return the new
+        recommendations. Raises TimeoutError if it takes longer than timeout.
+        """
+        self._generated(self.wait_for_job(self.submit_recommendations()["id"], timeout))
+        return self.get_recommendations()
+
+    def submit_recommendations(self) -> Dict:
+        """Queue generation and return the job; a repeat returns the same unfinished job"""
+        # Submitting is coalesced server-side, so it is safe to retry like a PUT
+        return self._json("POST", "/api/recommendations/generate", retries=API_RETRIES)
+
+    def get_recommendation_job(self, job_id: int, wait: float = 0) -> Dict:
+        """The job's status; with wait, the server holds the request up to that many seconds until it finishes"""
+        return self._json(
+            "GET", f"/api/recommendations/jobs/{job_id}",
+            params={"wait": wait},
+            timeout=(API_TIMEOUT[0], wait + API_TIMEOUT[1])
         )
-        response.raise_for_status()
-        return response.json()
+
+    def wait_for_job(self, job_id: int, timeout: float = 60) -> Dict:
+        """Long-poll a recommendation job until it is done or failed"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_recommendation_job(job_id, wait=self._job_wait(deadline))
+            if self._finished_job(job, job_id, deadline, timeout):
+                return job
 
     def mark_recommendation_implemented(self, recommendation_id: int) -> Dict:
-        response = requests.put(
-            f"{self.base_url}/api/recommendations/{recommendation_id}/implement",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("PUT", f"/api/recommendations/{recommendation_id}/implement")
 
     # Health tracking methods
     def get_health_stats(self) -> Dict:
         """Get quick health statistics"""
-        response = requests.get(
-            f"{self.base_url}/api/health/stats",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/health/stats")
 
     def get_recent_activities(self) -> List[Dict]:
         """Get recent health activities"""
-        response = requests.get(
-            f"{self.base_url}/api/health/activities",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/health/activities")
 
     def get_notifications(self) -> List[Dict]:
         """Get user notifications"""
-        response = requests.get(
-            f"{self.base_url}/api/notifications",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/notifications")
 
     def mark_notification_read(self, notification_id: int) -> Dict:
         """Mark notification as read"""
-        response = requests.post(
-            f"{self.base_url}/api/notifications/{notification_id}/read",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("POST", f"/api/notifications/{notification_id}/read")
 
     # Health conditions methods
     def get_health_conditions(self) -> Dict:
         """Get health conditions data"""
-        response = requests.get(
-            f"{self.base_url}/api/health/conditions",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/health/conditions")
 
     def log_blood_pressure(self, systolic: int, diastolic: int, date: Optional[str] = None) -> Dict:
         """Log blood pressure reading"""
-        data = {"systolic": systolic, "diastolic": diastolic}
-        if date:
-            data["date"] = date
-        
-        response = requests.post(
-            f"{self.base_url}/api/health/conditions/blood_pressure",
-            headers=self._get_headers(),
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._dated({"systolic": systolic, "diastolic": diastolic}, date)
+        return self._json("POST", "/api/health/conditions/blood_pressure", data)
 
     def log_blood_sugar(self, level: float, meal_relation: str = "fasting", date: Optional[str] = None) -> Dict:
         """Log blood sugar reading"""
-        data = {"level": level, "meal_relation": meal_relation}
-        if date:
-            data["date"] = date
-            
-        response = requests.post(
-            f"{self.base_url}/api/health/conditions/blood_sugar",
-            headers=self._get_headers(),
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._dated({"level": level, "meal_relation": meal_relation}, date)
+        return self._json("POST", "/api/health/conditions/blood_sugar", data)
 
     def log_stress_level(self, level: int, notes: str = "", date: Optional[str] = None) -> Dict:
         """Log stress level (1-10 scale)"""
-        data = {"level": level, "notes": notes}
-        if date:
-            data["date"] = date
-            
-        response = requests.post(
-            f"{self.base_url}/api/health/conditions/stress",
-            headers=self._get_headers(),
-            json=data
-        )
+        data = self._dated({"level": level, "notes": notes}, date)
+        return self._json("POST", "/api/health/conditions/stress", data)
+
+    # Health data methods
+    def get_health_summary(self) -> Dict:
+        """Averages, date range and latest readings over the user's whole history"""
+        response = self._conditional_get("/api/v1/healthdata/summary", timeout=30)
         response.raise_for_status()
         return response.json()
 
+    def get_chart_data(self, days: int = 30, max_points: Optional[int] = None) -> Dict:
+        """Chart series as JSON lists"""
+        params = self._chart_params(days, max_points)
+        response = self._conditional_get("/api/v1/healthdata/charts", params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def get_chart_columns(self, days: int = 30, max_points: Optional[int] = None, arrow: bool = False) -> Dict:
+        """Chart series as {name: ndarray}, with a "timestamp" column in epoch seconds"""
+        response = self._conditional_get(
+            "/api/v1/healthdata/charts", params=self._chart_params(days, max_points),
+            headers=self._columnar_headers(arrow), timeout=30
+        )
+        response.raise_for_status()
+        return decode_columnar_response(response)
+
+    def get_health_data_columns(self, limit: int = 100, cursor: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
+        """One page of health data as numeric columns, plus the cursor for the next page"""
+        response = self._request(
+            "GET", "/api/v1/healthdata", headers=self._columnar_headers(),
+            params=self._page_params(limit, cursor), timeout=30
+        )
+        response.raise_for_status()
+        return decode_columnar_response(response), response.headers.get('X-Next-Cursor')
+
+    def bulk_upload_health_data(self, readings: List[Dict]) -> Dict:
+        """Create many readings in one request; large batches go out gzipped"""
+        return self._json("POST", "/api/v1/healthdata/bulk", readings, timeout=(API_TIMEOUT[0], 60))
+
     # Analytics methods
     def get_health_trends(self) -> Dict:
         """Get health trends for analytics"""
-        response = requests.get(
-            f"{self.base_url}/api/analytics/trends",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/analytics/trends")
 
     # Community methods
     def get_community_insights(self) -> Dict:
         """Get community health insights"""
-        response = requests.get(
-            f"{self.base_url}/api/community/insights",
-            headers=self._get_headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._json("GET", "/api/community/insights")
 
     # Generic HTTP methods
     def get(self, endpoint: str) -> Optional[Dict]:
         """Generic GET request"""
         try:
-            response = requests.get(
-                f"{self.base_url}{endpoint}",
-                headers=self._get_headers(),
-                timeout=5
-            )
+            # Called from the UI thread, so one quick retry at most
+            response = self._conditional_get(endpoint, timeout=5, retries=1)
             if response.status_code == 200:
                 return response.json()
         except Exception:
@@ -243,14 +546,9 @@ class APIClient:
     def post(self, endpoint: str, data: Dict) -> Optional[Dict]:
         """Generic POST request"""
         try:
-            response = requests.post(
-                f"{self.base_url}{endpoint}",
-                headers=self._get_headers(),
-                json=data,
-                timeout=5
-            )
+            response = self._request("POST", endpoint, json_body=data, timeout=5)
             if response.status_code in [200, 201]:
                 return response.json()
         except Exception:
             pass
-        return None
\ No newline at end of file
+        return None
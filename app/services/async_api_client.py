@@ -0,0 +1,306 @@
+import asyncio
+import time
+import httpx
+import sys
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = os.path.join(os.path.dirname(__file__), '../..')
+sys.path.insert(0, project_root)
+
+try:
+    from app.utils.config import API_TIMEOUT, API_POOL_SIZE, API_RETRIES, DASHBOARD_DEADLINE
+except ImportError:
+    from utils.config import API_TIMEOUT, API_POOL_SIZE, API_RETRIES, DASHBOARD_DEADLINE
+
+from app.services.api_client import (
+    APIClient, APIClientBase, EndpointTimings, decode_columnar_response, retry_delay
+)
+
+# What the dashboard shows on load, by name: fetched together by gather_dashboard
+DASHBOARD_ENDPOINTS = {
+    "user": "/api/users/me",
+    "stats": "/api/health/stats",
+    "activities": "/api/health/activities",
+    "notifications": "/api/notifications",
+    "streak": "/api/users/streak",
+    "recent": "/api/health-data/recent",
+}
+
+def httpx_timeout(timeout) -> httpx.Timeout:
+    """An APIClient timeout, a number or (connect, read), as an httpx.Timeout"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+class AsyncAPIClient(APIClientBase):
+    """
+    asyncio counterpart of APIClient: the same methods as coroutines, the
+    same retry, gzip and ETag behaviour (see APIClientBase), on an
+    httpx.AsyncClient. The httpx client is tied to the event loop it was
+    first used on, so one AsyncAPIClient must stay on one loop (see
+    AsyncBridge).
+    """
+
+    def __init__(self, base_url: Optional[str] = None, token: Optional[str] = None,
+                 timings: Optional[EndpointTimings] = None, session_client: Optional[APIClient] = None):
+        # Set before the base class assigns self.token
+        self._session_client = session_client
+        super().__init__(base_url, token, timings)
+        self._client = None
+
+    @classmethod
+    def from_client(cls, client: APIClient) -> "AsyncAPIClient":
+        """
+        An async client for the same server and session, recording into the
+        same timings. The token stays client's: logging in or out on either
+        one applies to both.
+        """
+        return cls(base_url=client.base_url, token=client.token, timings=client.timings, session_client=client)
+
+    @property
+    def token(self) -> Optional[str]:
+        if self._session_client is not None:
+            return self._session_client.token
+        return self._token
+
+    @token.setter
+    def token(self, value: Optional[str]):
+        if self._session_client is not None:
+            self._session_client.token = value
+        else:
+            self._token = value
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(max_connections=API_POOL_SIZE, max_keepalive_connections=API_POOL_SIZE)
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=httpx_timeout(API_TIMEOUT))
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, json_body=None, params: Optional[Dict] = None,
+                       headers: Optional[Dict] = None, timeout=None, retries: Optional[int] = None) -> httpx.Response:
+        """Send a request, retrying like APIClient._request but sleeping with asyncio"""
+        data, headers, retries = self._prepare(method, json_body, headers, retries)
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(
+                    method, path, params=params, content=data, headers=headers,
+                    timeout=httpx_timeout(timeout or API_TIMEOUT)
+                )
+            except httpx.TransportError:
+                delay = retry_delay(attempt, retries)
+                if delay is None:
+                    self._record(method, path, started, attempt)
+                    raise
+            else:
+                delay = retry_delay(attempt, retries, response)
+                if delay is None:
+                    self._record(method, path, started, attempt, response)
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _conditional_get(self, path: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                               timeout=None, retries: Optional[int] = None) -> httpx.Response:
+        key, cached, headers = self._revalidation(path, params, headers)
+        response = await self._request("GET", path, params=params, headers=headers, timeout=timeout, retries=retries)
+        return self._revalidated(key, cached, response)
+
+    async def _json(self, method: str, path: str, json_body=None, **kwargs):
+        response = await self._request(method, path, json_body=json_body, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def _conditional_json(self, path: str, **kwargs):
+        response = await self._conditional_get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def gather_dashboard(self, deadline: float = DASHBOARD_DEADLINE) -> Dict:
+        """
+        Fetch everything in DASHBOARD_ENDPOINTS at once, so a dashboard load
+        takes as long as its slowest call instead of the sum of them. Calls
+        still running after deadline seconds are cancelled. Returns {name:
+        data} for the calls that succeeded, and under "errors" {name:
+        message} for the rest.
+        """
+        tasks = {
+            name: asyncio.ensure_future(self._conditional_json(path, timeout=(API_TIMEOUT[0], deadline)))
+            for name, path in DASHBOARD_ENDPOINTS.items()
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {"errors": {}}
+        for name, task in tasks.items():
+            if task in pending:
+                results["errors"][name] = f"No response within {deadline}s"
+            elif task.exception() is not None:
+                results["errors"][name] = str(task.exception()) or type(task.exception()).__name__
+            else:
+                results[name] = task.result()
+        return results
+
+    async def login(self, email: str, password: str) -> Dict:
+        response = await self._request(
+            "POST", "/api/users/login",
+            json_body={"email": email, "password": password},
+            headers={'Content-Type': 'application/json'}
+        )
+        response.raise_for_status()
+        return self._logged_in(response.json())
+
+    async def logout(self) -> None:
+        if self.token:
+            await self._request("POST", "/api/users/logout", timeout=5)
+        self._logged_out()
+
+    async def register(self, user_data: Dict) -> Dict:
+        return await self._json("POST", "/api/users/register", user_data, headers={'Content-Type': 'application/json'})
+
+    async def get_current_user(self) -> Dict:
+        return await self._conditional_json("/api/users/me")
+
+    async def update_user(self, user_data: Dict) -> Dict:
+        return await self._json("PUT", "/api/users/me", user_data)
+
+    async def get_habits(self) -> List[Dict]:
+        return await self._conditional_json("/api/habits")
+
+    async def create_habit(self, habit_data: Dict) -> Dict:
+        return await self._json("POST", "/api/habits", habit_data)
+
+    async def update_habit(self, habit_id: int, habit_data: Dict) -> Dict:
+        return await self._json("PUT", f"/api/habits/{habit_id}", habit_data)
+
+    async def delete_habit(self, habit_id: int) -> None:
+        response = await self._request("DELETE", f"/api/habits/{habit_id}")
+        response.raise_for_status()
+
+    async def get_recommendations(self) -> List[Dict]:
+        return await self._conditional_json("/api/recommendations")
+
+    async def generate_recommendations(self, timeout: float = 60) -> List[Dict]:
+        self._generated(await self.wait_for_job((await self.submit_recommendations())["id"], timeout))
+        return await self.get_recommendations()
+
+    async def submit_recommendations(self) -> Dict:
+        return await self._json("POST", "/api/recommendations/generate", retries=API_RETRIES)
+
+    async def get_recommendation_job(self, job_id: int, wait: float = 0) -> Dict:
+        return await self._json(
+            "GET", f"/api/recommendations/jobs/{job_id}",
+            params={"wait": wait},
+            timeout=(API_TIMEOUT[0], wait + API_TIMEOUT[1])
+        )
+
+    async def wait_for_job(self, job_id: int, timeout: float = 60) -> Dict:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get_recommendation_job(job_id, wait=self._job_wait(deadline))
+            if self._finished_job(job, job_id, deadline, timeout):
+                return job
+
+    async def mark_recommendation_implemented(self, recommendation_id: int) -> Dict:
+        return await self._json("PUT", f"/api/recommendations/{recommendation_id}/implement")
+
+    # Health tracking methods
+    async def get_health_stats(self) -> Dict:
+        return await self._json("GET", "/api/health/stats")
+
+    async def get_recent_activities(self) -> List[Dict]:
+        return await self._json("GET", "/api/health/activities")
+
+    async def get_notifications(self) -> List[Dict]:
+        return await self._json("GET", "/api/notifications")
+
+    async def mark_notification_read(self, notification_id: int) -> Dict:
+        return await self._json("POST", f"/api/notifications/{notification_id}/read")
+
+    # Health conditions methods
+    async def get_health_conditions(self) -> Dict:
+        return await self._json("GET", "/api/health/conditions")
+
+    async def log_blood_pressure(self, systolic: int, diastolic: int, date: Optional[str] = None) -> Dict:
+        data = self._dated({"systolic": systolic, "diastolic": diastolic}, date)
+        return await self._json("POST", "/api/health/conditions/blood_pressure", data)
+
+    async def log_blood_sugar(self, level: float, meal_relation: str = "fasting", date: Optional[str] = None) -> Dict:
+        data = self._dated({"level": level, "meal_relation": meal_relation}, date)
+        return await self._json("POST", "/api/health/conditions/blood_sugar", data)
+
+    async def log_stress_level(self, level: int, notes: str = "", date: Optional[str] = None) -> Dict:
+        data = self._dated({"level": level, "notes": notes}, date)
+        return await self._json("POST", "/api/health/conditions/stress", data)
+
+    # Health data methods
+    async def get_health_summary(self) -> Dict:
+        return await self._conditional_json("/api/v1/healthdata/summary", timeout=30)
+
+    async def get_chart_data(self, days: int = 30, max_points: Optional[int] = None) -> Dict:
+        params = self._chart_params(days, max_points)
+        return await self._conditional_json("/api/v1/healthdata/charts", params=params, timeout=30)
+
+    async def get_chart_columns(self, days: int = 30, max_points: Optional[int] = None, arrow: bool = False) -> Dict:
+        response = await self._conditional_get(
+            "/api/v1/healthdata/charts", params=self._chart_params(days, max_points),
+            headers=self._columnar_headers(arrow), timeout=30
+        )
+        response.raise_for_status()
+        return decode_columnar_response(response)
+
+    async def get_health_data_columns(self, limit: int = 100, cursor: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
+        response = await self._request(
+            "GET", "/api/v1/healthdata", headers=self._columnar_headers(),
+            params=self._page_params(limit, cursor), timeout=30
+        )
+        response.raise_for_status()
+        return decode_columnar_response(response), response.headers.get('X-Next-Cursor')
+
+    async def bulk_upload_health_data(self, readings: List[Dict]) -> Dict:
+        return await self._json("POST", "/api/v1/healthdata/bulk", readings, timeout=(API_TIMEOUT[0], 60))
+
+    # Analytics methods
+    async def get_health_trends(self) -> Dict:
+        return await self._json("GET", "/api/analytics/trends")
+
+    # Community methods
+    async def get_community_insights(self) -> Dict:
+        return await self._json("GET", "/api/community/insights")
+
+    # Generic HTTP methods
+    async def get(self, endpoint: str) -> Optional[Dict]:
+        try:
+            response = await self._conditional_get(endpoint, timeout=5, retries=1)
+            if response.status_code == 200:
+                return response.json()
+        except Exception:
+            pass
+        return None
+
+    async def post(self, endpoint: str, data: Dict) -> Optional[Dict]:
+        try:
+            response = await self._request("POST", endpoint, json_body=data, timeout=5)
+            if response.status_code in [200, 201]:
+                return response.json()
+        except Exception:
+            pass
+        return None
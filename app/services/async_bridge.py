@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Coroutine, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class AsyncBridge(QObject):
+    """
+    Runs coroutines on an asyncio loop in a background thread and hands
+    their results back on the Qt GUI thread, so the widgets can await
+    AsyncAPIClient calls without blocking the Qt event loop (and without
+    replacing it, as qasync would).
+    """
+
+    # (callback, value): emitted from the loop thread, delivered on the GUI thread
+    _deliver = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self._deliver.connect(self._call)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="async-bridge", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro: Coroutine, on_result: Optional[Callable] = None,
+               on_error: Optional[Callable] = None) -> Future:
+        """
+        Schedule coro on the bridge loop. on_result(value) or on_error(exc)
+        is then called on the GUI thread, unless the returned future was
+        cancelled first.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None and on_result is not None:
+                self._deliver.emit(on_result, future.result())
+            elif error is not None and on_error is not None:
+                self._deliver.emit(on_error, error)
+
+        future.add_done_callback(done)
+        return future
+
+    @staticmethod
+    def _call(callback, value):
+        callback(value)
+
+    def stop(self, timeout: float = 2):
+        """Stop the loop once its pending callbacks have run"""
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+_shared_bridge = None
+
+def shared_bridge() -> AsyncBridge:
+    """Process-wide bridge; create it from the GUI thread, after the QApplication"""
+    global _shared_bridge
+    if _shared_bridge is None:
+        _shared_bridge = AsyncBridge()
+    return _shared_bridge
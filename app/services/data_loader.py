@@ -0,0 +1,125 @@
+from typing import Callable, Hashable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+try:
+    from app.utils.config import API_POOL_SIZE
+except ImportError:
+    from utils.config import API_POOL_SIZE
+
+class LoadTask(QRunnable):
+    """Calls fn() on a pool thread and reports back to its DataLoader through signals"""
+
+    def __init__(self, loader: "DataLoader", key: Hashable, fn: Callable):
+        super().__init__()
+        self.setAutoDelete(False)  # the loader keeps it, to tell its result from a cancelled one's
+        self.loader = loader
+        self.key = key
+        self.fn = fn
+
+    def run(self):
+        try:
+            value = self.fn()
+        except Exception as e:
+            self.loader._failed.emit(self, e)
+        else:
+            self.loader._finished.emit(self, value)
+
+class DataLoader(QObject):
+    """
+    Runs blocking API calls on a QThreadPool and delivers their results on
+    the GUI thread, so widgets never wait on the network themselves.
+
+    Loads are keyed. Loading a key that is already in flight joins that
+    request instead of sending another one; each caller gets the result.
+    Cancelling drops the callbacks of a key or of an owner widget (owners
+    are cancelled automatically when destroyed); a request nobody waits on
+    any more is taken off the queue, or its result ignored if it is already
+    running.
+    """
+
+    # (task, value or exception): emitted on a pool thread, handled on the GUI thread
+    _finished = pyqtSignal(object, object)
+    _failed = pyqtSignal(object, object)
+
+    # Emitted on the GUI thread when a key starts or stops being in flight
+    loading_changed = pyqtSignal(object, bool)
+
+    def __init__(self, pool: Optional[QThreadPool] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        if pool is None:
+            # The loads wait on the network, not the CPU: size the pool like the HTTP connection pool
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(API_POOL_SIZE)
+        self.pool = pool
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+        self._tasks = {}      # key -> LoadTask in flight
+        self._callbacks = {}  # key -> [(owner id, on_result, on_error)]
+        self._owners = set()
+
+    def load(self, key: Hashable, fn: Callable, on_result: Optional[Callable] = None,
+             on_error: Optional[Callable] = None, owner: Optional[QObject] = None):
+        """
+        Run fn() in the background, then call on_result(value) or
+        on_error(exception) on the GUI thread.
+        """
+        owner_id = id(owner) if owner is not None else None
+        if owner is not None and owner_id not in self._owners:
+            self._owners.add(owner_id)
+            owner.destroyed.connect(lambda *_: self.cancel(owner_id=owner_id))
+        self._callbacks.setdefault(key, []).append((owner_id, on_result, on_error))
+        if key in self._tasks:
+            return
+        task = self._tasks[key] = LoadTask(self, key, fn)
+        self.pool.start(task)
+        self.loading_changed.emit(key, True)
+
+    def is_loading(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def cancel(self, key: Hashable = None, owner: Optional[QObject] = None, owner_id: Optional[int] = None):
+        """Forget the callbacks of a key, of an owner, or of the owner's loads of a key"""
+        if owner is not None:
+            owner_id = id(owner)
+        for k in ([key] if key is not None else list(self._callbacks)):
+            callbacks = [c for c in self._callbacks.get(k, ()) if owner_id is not None and c[0] != owner_id]
+            if callbacks:
+                self._callbacks[k] = callbacks
+                continue
+            self._callbacks.pop(k, None)
+            task = self._tasks.pop(k, None)
+            if task is not None:
+                self.pool.tryTake(task)
+                self.loading_changed.emit(k, False)
+        if owner_id is not None and key is None:
+            self._owners.discard(owner_id)
+
+    def _settle(self, task: LoadTask):
+        if self._tasks.get(task.key) is not task:
+            # Cancelled, possibly loaded again since
+            return []
+        del self._tasks[task.key]
+        self.loading_changed.emit(task.key, False)
+        return self._callbacks.pop(task.key, [])
+
+    def _on_finished(self, task: LoadTask, value):
+        for _, on_result, _ in self._settle(task):
+            if on_result is not None:
+                on_result(value)
+
+    def _on_failed(self, task: LoadTask, error: Exception):
+        for _, _, on_error in self._settle(task):
+            if on_error is not None:
+                on_error(error)
+            else:
+                print(f"Background load {task.key!r} failed: {error}")
+
+_shared_loader = None
+
+def shared_loader() -> DataLoader:
+    """Process-wide loader, so identical loads from different widgets are merged; create it after the QApplication"""
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = DataLoader()
+    return _shared_loader
@@ -0,0 +1,82 @@
+from datetime import date, datetime
+from sqlalchemy import func, select, update
+from ..models.habit_model import Habit
+from . import activity_service, streak_service
+
+class VersionConflict(Exception):
+    """The habit changed since the version the client last read"""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Habit is at version {current_version}")
+        self.current_version = current_version
+
+def _returning(stmt):
+    return stmt.returning(*Habit.__table__.c)
+
+async def increment_progress(db, user_id: int, habit_id: int, delta: float):
+    """
+    Add delta to a habit's current_value in one UPDATE ... RETURNING, so
+    concurrent increments never overwrite each other. Returns the updated
+    row as a mapping, or None if the user has no such habit. The caller
+    commits.
+    """
+    result = await db.execute(_returning(
+        update(Habit)
+        .filter(Habit.id == habit_id, Habit.user_id == user_id)
+        .values(current_value=func.coalesce(Habit.current_value, 0) + delta, version=Habit.version + 1)
+    ))
+    row = result.mappings().first()
+    return dict(row) if row else None
+
+async def update_habit(db, user_id: int, habit_id: int, values: dict, expected_version: int = None):
+    """
+    Apply a full update in one UPDATE ... RETURNING. With expected_version
+    the write only happens if nobody changed the habit since the client
+    read it; otherwise VersionConflict is raised. A rise in current_value
+    is logged as progress, like an increment. Returns the updated row as a
+    dict, or None if the user has no such habit. The caller commits.
+    """
+    while True:
+        version, previous = expected_version, None
+        if "current_value" in values:
+            # The progress made is the difference from the value being replaced:
+            # read it, and only write if the habit is still at that version
+            current = (await db.execute(
+                select(Habit.current_value, Habit.version).filter(Habit.id == habit_id, Habit.user_id == user_id)
+            )).first()
+            if current is None:
+                return None
+            if expected_version is not None and current.version != expected_version:
+                raise VersionConflict(current.version)
+            version, previous = current.version, current.current_value or 0
+
+        stmt = update(Habit).filter(Habit.id == habit_id, Habit.user_id == user_id)
+        if version is not None:
+            stmt = stmt.filter(Habit.version == version)
+        result = await db.execute(_returning(stmt.values(**values, version=Habit.version + 1)))
+        row = result.mappings().first()
+        if row is not None:
+            break
+        if version is None:
+            return None
+        # Only the failure path pays for telling a conflict from a missing habit
+        current = await db.scalar(select(Habit.version).filter(Habit.id == habit_id, Habit.user_id == user_id))
+        if current is None:
+            return None
+        if expected_version is not None:
+            raise VersionConflict(current)
+        # Another write landed between the read and the update: read again
+
+    if previous is not None and (row["current_value"] or 0) > previous:
+        await log_progress(db, user_id, habit_id, row["current_value"] - previous)
+    return dict(row)
+
+async def log_progress(db, user_id: int, habit_id: int, amount: float, day: date = None):
+    """
+    Record progress made on a habit: appends it to the event log and brings
+    the user's streak cache and the habit's activity bitmap up to date.
+    The caller commits.
+    """
+    day = day or datetime.utcnow().date()
+    await streak_service.append_event(db, user_id, habit_id, amount, day)
+    await activity_service.record_progress(db, user_id, habit_id, day, amount)
@@ -0,0 +1,173 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import DateTime, case, delete, desc, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from ..models.health_data_model import HealthData
+from ..models.health_rollup_model import HealthDailyRollup
+
+# HealthData columns kept in the daily rollup
+ROLLUP_METRICS = (
+    "systolic_bp",
+    "diastolic_bp",
+    "blood_sugar",
+    "weight",
+    "heart_rate",
+    "sleep_hours",
+    "stress_level",
+    "mood_score",
+    "energy_level",
+    "steps_count",
+    "water_intake",
+)
+
+ROLLUP_COLUMNS = (
+    "user_id", "day", "metric", "value_count", "value_sum",
+    "value_min", "value_max", "last_value", "last_time", "updated_at",
+)
+
+def _reading_value(reading, name):
+    if isinstance(reading, dict):
+        return reading.get(name)
+    return getattr(reading, name)
+
+def summarize_readings(user_id: int, readings) -> list:
+    """
+    Fold new readings (HealthData objects or column dicts) into partial
+    rollup rows, one per (day, metric), ready to be merged by upsert.
+    """
+    partials = {}
+    for reading in readings:
+        measured = _reading_value(reading, "measurement_time")
+        if measured is None:
+            continue
+        for metric in ROLLUP_METRICS:
+            value = _reading_value(reading, metric)
+            if value is None:
+                continue
+            key = (measured.date(), metric)
+            row = partials.get(key)
+            if row is None:
+                partials[key] = {
+                    "user_id": user_id, "day": measured.date(), "metric": metric,
+                    "value_count": 1, "value_sum": value, "value_min": value, "value_max": value,
+                    "last_value": value, "last_time": measured, "updated_at": datetime.utcnow(),
+                }
+                continue
+            row["value_count"] += 1
+            row["value_sum"] += value
+            row["value_min"] = min(row["value_min"], value)
+            row["value_max"] = max(row["value_max"], value)
+            if measured >= row["last_time"]:
+                row["last_value"], row["last_time"] = value, measured
+    return list(partials.values())
+
+def upsert_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT that merges partial rows into existing day rows"""
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(HealthDailyRollup)
+    current = HealthDailyRollup.__table__.c
+    new = stmt.excluded
+    newer = new.last_time >= current.last_time
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "day", "metric"],
+        set_={
+            "value_count": current.value_count + new.value_count,
+            "value_sum": current.value_sum + new.value_sum,
+            "value_min": case((new.value_min < current.value_min, new.value_min), else_=current.value_min),
+            "value_max": case((new.value_max > current.value_max, new.value_max), else_=current.value_max),
+            "last_value": case((newer, new.last_value), else_=current.last_value),
+            "last_time": case((newer, new.last_time), else_=current.last_time),
+            "updated_at": new.updated_at,
+        },
+    )
+
+def rollup_select(metric: str, user_id: int = None, start: datetime = None, end: datetime = None):
+    """
+    Recompute rollup rows for one metric from raw health_data, optionally
+    limited to one user and a measurement_time range. Window functions give
+    the per-day aggregates and the latest value in a single pass.
+    """
+    value = getattr(HealthData, metric)
+    day = func.date(HealthData.measurement_time)
+    partition = (HealthData.user_id, day)
+    filters = [value.isnot(None), HealthData.measurement_time.isnot(None)]
+    if user_id is not None:
+        filters.append(HealthData.user_id == user_id)
+    if start is not None:
+        filters.append(HealthData.measurement_time >= start)
+    if end is not None:
+        filters.append(HealthData.measurement_time < end)
+
+    windowed = select(
+        HealthData.user_id.label("user_id"),
+        day.label("day"),
+        func.count(value).over(partition_by=partition).label("value_count"),
+        func.sum(value).over(partition_by=partition).label("value_sum"),
+        func.min(value).over(partition_by=partition).label("value_min"),
+        func.max(value).over(partition_by=partition).label("value_max"),
+        value.label("last_value"),
+        HealthData.measurement_time.label("last_time"),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=(desc(HealthData.measurement_time), desc(HealthData.id))
+        ).label("position"),
+    ).filter(*filters).subquery()
+
+    return select(
+        windowed.c.user_id,
+        windowed.c.day,
+        literal(metric).label("metric"),
+        windowed.c.value_count,
+        windowed.c.value_sum,
+        windowed.c.value_min,
+        windowed.c.value_max,
+        windowed.c.last_value,
+        windowed.c.last_time,
+        literal(datetime.utcnow(), DateTime).label("updated_at"),
+    ).filter(windowed.c.position == 1)
+
+def recompute_statement(user_id: int = None, start: datetime = None, end: datetime = None):
+    """INSERT ... SELECT of every metric's rollup rows for the given scope"""
+    source = union_all(*[rollup_select(metric, user_id, start, end) for metric in ROLLUP_METRICS])
+    return insert(HealthDailyRollup).from_select(ROLLUP_COLUMNS, source)
+
+async def apply_readings(db, user_id: int, readings):
+    """Merge newly inserted readings into the rollup, inside the caller's transaction"""
+    rows = summarize_readings(user_id, readings)
+    if rows:
+        await db.execute(upsert_statement(db.bind.dialect.name), rows)
+
+async def refresh_days(db, user_id: int, days):
+    """
+    Rebuild the rollup rows of the given days from raw data, for updates and
+    deletes where min/max/last can't be adjusted incrementally. The caller
+    must flush its changes first and commits afterwards.
+    """
+    for day in {d for d in days if d is not None}:
+        start = datetime.combine(day, datetime.min.time())
+        end = start + timedelta(days=1)
+        await db.execute(delete(HealthDailyRollup).filter(
+            HealthDailyRollup.user_id == user_id,
+            HealthDailyRollup.day == day
+        ))
+        await db.execute(recompute_statement(user_id, start, end))
+
+async def get_daily_rollups(db, user_id: int, metrics, start_day: date, end_day: date = None) -> dict:
+    """Rollup rows per metric for a user, oldest day first"""
+    query = select(HealthDailyRollup).filter(
+        HealthDailyRollup.user_id == user_id,
+        HealthDailyRollup.metric.in_(metrics),
+        HealthDailyRollup.day >= start_day
+    )
+    if end_day is not None:
+        query = query.filter(HealthDailyRollup.day <= end_day)
+    result = await db.execute(query.order_by(HealthDailyRollup.day))
+    rollups = {metric: [] for metric in metrics}
+    for row in result.scalars().all():
+        rollups[row.metric].append(row)
+    return rollups
+
+def rebuild_rollups(bind):
+    """Rebuild the whole rollup table from historic health_data"""
+    with bind.begin() as conn:
+        conn.execute(delete(HealthDailyRollup))
+        conn.execute(recompute_statement())
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import Date, case, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from ..models.habit_event_model import HabitEvent, UserStreak
+
+def day_number(column, dialect_name: str):
+    """SQL expression turning a Date column into a running day count"""
+    if dialect_name == "postgresql":
+        # date - date is an integer number of days
+        return column - literal(date(2000, 1, 1), Date)
+    return func.julianday(column)
+
+def streak_runs_query(user_id: int, dialect_name: str, habit_id: int = None):
+    """
+    Gaps-and-islands over the days with positive progress: day number minus
+    row number is constant within a run of consecutive days, so grouping by
+    it yields the runs. Returns one row for the latest run, carrying the
+    longest run, active days and first day as window aggregates over all
+    runs, or no row if there are no active days.
+    """
+    filters = [HabitEvent.user_id == user_id]
+    if habit_id is not None:
+        filters.append(HabitEvent.habit_id == habit_id)
+    days = select(HabitEvent.day).filter(*filters).group_by(HabitEvent.day).having(
+        func.sum(HabitEvent.amount) > 0
+    ).subquery()
+    islands = select(
+        days.c.day,
+        (day_number(days.c.day, dialect_name) - func.row_number().over(order_by=days.c.day)).label("island"),
+    ).subquery()
+    runs = select(
+        func.min(islands.c.day).label("start_day"),
+        func.max(islands.c.day).label("end_day"),
+        func.count().label("length"),
+    ).group_by(islands.c.island).subquery()
+    ranked = select(
+        runs.c.length,
+        runs.c.end_day,
+        func.max(runs.c.length).over().label("longest"),
+        func.sum(runs.c.length).over().label("active_days"),
+        func.min(runs.c.start_day).over().label("first_day"),
+        func.row_number().over(order_by=runs.c.end_day.desc()).label("position"),
+    ).subquery()
+    return select(
+        ranked.c.length, ranked.c.end_day, ranked.c.longest, ranked.c.active_days, ranked.c.first_day
+    ).filter(ranked.c.position == 1)
+
+def _as_date(value):
+    # SQLite hands dates computed in subqueries back as ISO strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def live_streak(length: int, last_day: date, today: date) -> int:
+    """A run stays current until a whole day passes without progress"""
+    if last_day is None or last_day < today - timedelta(days=1):
+        return 0
+    return length
+
+async def compute_stats(db, user_id: int, habit_id: int = None, today: date = None) -> dict:
+    """Current and longest streak, active days and completion rate, in one query over the event log"""
+    today = today or datetime.utcnow().date()
+    row = (await db.execute(streak_runs_query(user_id, db.bind.dialect.name, habit_id))).first()
+    if row is None:
+        return {"current_streak": 0, "longest_streak": 0, "active_days": 0,
+                "completion_rate": 0.0, "last_active_day": None}
+    last_day, first_day = _as_date(row.end_day), _as_date(row.first_day)
+    tracked_days = max((today - first_day).days + 1, row.active_days)
+    return {
+        "current_streak": live_streak(row.length, last_day, today),
+        "longest_streak": row.longest,
+        "active_days": row.active_days,
+        "completion_rate": round(row.active_days / tracked_days, 4),
+        "last_active_day": last_day,
+    }
+
+async def refresh_streak(db, user_id: int):
+    """Rebuild a user's cached streak from the event log. The caller commits."""
+    row = (await db.execute(streak_runs_query(user_id, db.bind.dialect.name))).first()
+    values = {
+        "user_id": user_id,
+        "current_streak": row.length if row else 0,
+        "longest_streak": row.longest if row else 0,
+        "last_day": _as_date(row.end_day) if row else None,
+        "updated_at": datetime.utcnow(),
+    }
+    dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(UserStreak)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={key: stmt.excluded[key] for key in values if key != "user_id"}
+    ), values)
+
+async def append_event(db, user_id: int, habit_id: int, amount: float, day: date = None):
+    """
+    Log progress on a habit and advance the user's cached streak in the
+    same transaction. Progress on a new day after the cached last_day is a
+    single conditional UPDATE; undos, backfills and a missing cache row
+    rebuild the cache from the log instead. The caller commits.
+    """
+    day = day or datetime.utcnow().date()
+    await db.execute(insert(HabitEvent).values(habit_id=habit_id, user_id=user_id, day=day, amount=amount))
+    if amount > 0:
+        extended = case(
+            (UserStreak.last_day == day, UserStreak.current_streak),
+            (UserStreak.last_day == day - timedelta(days=1), UserStreak.current_streak + 1),
+            else_=1
+        )
+        result = await db.execute(
+            update(UserStreak)
+            .filter(UserStreak.user_id == user_id, UserStreak.last_day <= day)
+            .values(
+                current_streak=extended,
+                longest_streak=case((extended > UserStreak.longest_streak, extended), else_=UserStreak.longest_streak),
+                last_day=day,
+                updated_at=datetime.utcnow()
+            )
+        )
+        if result.rowcount:
+            return
+    await refresh_streak(db, user_id)
+
+async def get_streak(db, user_id: int, today: date = None) -> dict:
+    """The user's current and longest streak from the cache, without touching the event log"""
+    today = today or datetime.utcnow().date()
+    cached = await db.get(UserStreak, user_id)
+    if cached is None:
+        stats = await compute_stats(db, user_id, today=today)
+        return {"current_streak": stats["current_streak"], "longest_streak": stats["longest_streak"]}
+    return {
+        "current_streak": live_streak(cached.current_streak, cached.last_day, today),
+        "longest_streak": cached.longest_streak,
+    }
+
+def streak_response(streak: dict) -> dict:
+    """Streak payload of the /streak endpoints; "streak" is kept for older clients"""
+    days = streak["current_streak"]
+    if days:
+        message = f"Great job! {days} day{'s' if days != 1 else ''} in a row!"
+    else:
+        message = "Log progress on a habit today to start a streak!"
+    return {
+        "streak": days,
+        "streak_days": days,
+        "longest_streak": streak["longest_streak"],
+        "message": message
+    }
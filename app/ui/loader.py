@@ -0,0 +1,81 @@
+"""
+Qt Designer forms: taken from the modules compile_ui.py generates ahead of
+time when they still match their .ui file and the installed PyQt6, else
+parsed from the .ui file at runtime as before.
+"""
+
+import compileall
+import hashlib
+import importlib
+import io
+import os
+import xml.etree.ElementTree as ElementTree
+
+UI_DIR = os.path.dirname(__file__)
+COMPILED_DIR = os.path.join(UI_DIR, 'compiled')
+
+def ui_path(name):
+    return os.path.join(UI_DIR, f'{name}.ui')
+
+def source_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def load_ui_type(name):
+    """(form class, Qt base class) for app/ui/<name>.ui, like PyQt6.uic.loadUiType"""
+    from PyQt6 import QtWidgets
+    from PyQt6.QtCore import PYQT_VERSION_STR
+
+    path = ui_path(name)
+    try:
+        module = importlib.import_module(f'.compiled.ui_{name}', __package__)
+    except ImportError:
+        module = None
+    if module is not None:
+        if module.UI_SOURCE_HASH == source_hash(path) and module.PYQT_VERSION == PYQT_VERSION_STR:
+            return getattr(module, module.UI_FORM_CLASS), getattr(QtWidgets, module.UI_BASE_CLASS)
+        print(f"Note: {name}.ui changed since it was compiled, loading it at runtime (run compile_ui.py)")
+
+    from PyQt6.uic.load_ui import loadUiType
+    return loadUiType(path)
+
+def compile_ui(name):
+    """Generate app/ui/compiled/ui_<name>.py from app/ui/<name>.ui"""
+    from PyQt6.QtCore import PYQT_VERSION_STR
+    from PyQt6.uic import compileUi
+
+    path = ui_path(name)
+    root = ElementTree.parse(path).getroot()
+    code = io.StringIO()
+    code.write(f"# Generated by compile_ui.py from {name}.ui; edit the .ui file instead\n")
+    code.write(f"UI_SOURCE_HASH = {source_hash(path)!r}\n")
+    code.write(f"PYQT_VERSION = {PYQT_VERSION_STR!r}\n")
+    code.write(f"UI_FORM_CLASS = {'Ui_' + root.findtext('class')!r}\n")
+    code.write(f"UI_BASE_CLASS = {root.find('widget').get('class')!r}\n\n")
+    with open(path) as ui_file:
+        compileUi(ui_file, code)
+
+    target = os.path.join(COMPILED_DIR, f'ui_{name}.py')
+    with open(target + '.tmp', 'w') as f:
+        f.write(code.getvalue())
+    os.replace(target + '.tmp', target)
+    return target
+
+def compile_all():
+    """
+    Compile every .ui file in app/ui and byte-compile the results. Returns
+    the generated paths, and {name: error} for forms that could not be
+    compiled (those keep loading at runtime, or failing, as before).
+    """
+    os.makedirs(COMPILED_DIR, exist_ok=True)
+    init = os.path.join(COMPILED_DIR, '__init__.py')
+    if not os.path.exists(init):
+        open(init, 'w').close()
+    targets, failed = [], {}
+    for name in sorted(f[:-3] for f in os.listdir(UI_DIR) if f.endswith('.ui')):
+        try:
+            targets.append(compile_ui(name))
+        except Exception as e:
+            failed[name] = str(e)
+    compileall.compile_dir(COMPILED_DIR, quiet=1)
+    return targets, failed
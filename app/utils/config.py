@@ -12,6 +12,24 @@ DB_CONFIG = {
     'database': os.getenv('DB_NAME', 'smart_health_tracker'),
 }
 
+# Local database: defaults to the SQLite file in the project root no matter
+# which directory the app or backend is started from
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+DATABASE_URL = os.getenv(
+    'DATABASE_URL',
+    'sqlite:///' + os.path.join(PROJECT_ROOT, 'smart_health_tracker.db')
+)
+
+# SQLite engine profile, applied to every new connection
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),  # readers don't block on the writer
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),  # safe with WAL, fsync only at checkpoints
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bytes
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),  # negative means KiB, i.e. ~64 MB
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),  # ms to wait on a lock
+}
+
 # JWT Configuration
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-secret-key')
 JWT_ALGORITHM = 'HS256'
@@ -20,5 +38,25 @@ JWT_EXPIRATION = 3600  # 1 hour
 # API Configuration
 API_URL = os.getenv('API_URL', 'http://localhost:8000')
 
+# Desktop API client transport: (connect, read) timeouts in seconds, kept-alive
+# connections per host, retries of idempotent requests with the first backoff
+# delay in seconds, and the JSON body size from which requests are gzipped
+API_TIMEOUT = (float(os.getenv('API_CONNECT_TIMEOUT', 3.05)), float(os.getenv('API_READ_TIMEOUT', 15)))
+API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', 10))
+API_RETRIES = int(os.getenv('API_RETRIES', 3))
+API_BACKOFF = float(os.getenv('API_BACKOFF', 0.25))
+API_GZIP_MIN_BYTES = int(os.getenv('API_GZIP_MIN_BYTES', 16 * 1024))
+# Seconds the dashboard waits for its concurrent requests before showing what it has
+DASHBOARD_DEADLINE = float(os.getenv('DASHBOARD_DEADLINE', 5))
+# Hidden dashboard pages kept built; the least recently shown beyond this are
+# destroyed and rebuilt, with their scroll positions, when shown again
+DASHBOARD_PAGE_CACHE = int(os.getenv('DASHBOARD_PAGE_CACHE', 3))
+
 # AI Model Configuration
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../models/ai_models/')
+
+# Recommendation engine: days of readings behind each user's features, users
+# per feature-extraction chunk, and worker processes for the batch job
+RECOMMENDATION_WINDOW_DAYS = int(os.getenv('RECOMMENDATION_WINDOW_DAYS', 30))
+RECOMMENDATION_CHUNK_SIZE = int(os.getenv('RECOMMENDATION_CHUNK_SIZE', 5000))
+RECOMMENDATION_WORKERS = int(os.getenv('RECOMMENDATION_WORKERS', os.cpu_count() or 1))
@@ -14,6 +14,8 @@ from PyQt6.QtGui import QFont, QPalette, QColor
 import requests
 from datetime import datetime, date
 import json
+from app.services.data_loader import shared_loader
+from app.widgets.skeleton import SkeletonStack
 
 class HealthDataInputWidget(QWidget):
     """Health data input widget for dashboard profile section"""
@@ -26,9 +28,14 @@ class HealthDataInputWidget(QWidget):
         super().__init__()
         self.api_client = api_client
         self.api_base_url = "http://localhost:8000"
+        self.loader = shared_loader()
         self.current_user_data = {}
         self.init_ui()
         
+    def auth_headers(self):
+        """Bearer header of the logged-in session, if there is an API client"""
+        return self.api_client.auth_headers() if self.api_client else {}
+        
     def init_ui(self):
         """Initialize the user interface"""
         self.setStyleSheet("""
@@ -92,7 +99,9 @@ class HealthDataInputWidget(QWidget):
         
         # Profile Information Tab
         profile_tab = self.create_profile_tab()
-        tab_widget.addTab(profile_tab, "👤 Profile")
+        # Skeleton in place of the profile fields until they have loaded
+        self.profile_skeleton = SkeletonStack(profile_tab)
+        tab_widget.addTab(self.profile_skeleton, "👤 Profile")
         
         # Health Data Tab
         health_tab = self.create_health_data_tab()
@@ -426,15 +435,24 @@ class HealthDataInputWidget(QWidget):
             self.bmi_label.setText("BMI: --")
             
     def load_user_data(self):
-        """Load current user data from API"""
-        try:
-            response = requests.get(f"{self.api_base_url}/api/users/me", timeout=5)
-            if response.status_code == 200:
-                user_data = response.json()
-                self.populate_user_fields(user_data)
-                self.current_user_data = user_data
-        except Exception as e:
-            print(f"Error loading user data: {e}")
+        """Load current user data from API in the background"""
+        if not self.api_client:
+            self.profile_skeleton.set_loading(False)
+            return
+        self.profile_skeleton.set_loading(True)
+        self.loader.load(
+            ("users.me", id(self.api_client)), self.api_client.get_current_user,
+            on_result=self.on_user_data_loaded, on_error=self.on_user_data_failed, owner=self
+        )
+        
+    def on_user_data_loaded(self, user_data):
+        self.populate_user_fields(user_data)
+        self.current_user_data = user_data
+        self.profile_skeleton.set_loading(False)
+        
+    def on_user_data_failed(self, error):
+        print(f"Error loading user data: {error}")
+        self.profile_skeleton.set_loading(False)
             
     def populate_user_fields(self, user_data):
         """Populate form fields with user data"""
@@ -474,32 +492,39 @@ class HealthDataInputWidget(QWidget):
             # Remove None values
             update_data = {k: v for k, v in update_data.items() if v is not None and v != ""}
             
-            response = requests.put(
-                f"{self.api_base_url}/api/users/me",
-                json=update_data,
-                timeout=10
+            headers = self.auth_headers()
+            self.loader.load(
+                ("users.me.update", id(self)),
+                lambda: requests.put(f"{self.api_base_url}/api/users/me", json=update_data, headers=headers, timeout=10),
+                on_result=lambda response: self.on_profile_updated(update_data, response),
+                on_error=self.on_profile_update_failed, owner=self
             )
-            
-            if response.status_code == 200:
-                QMessageBox.information(
-                    self,
-                    "✅ Success",
-                    "Profile updated successfully!"
-                )
-                self.user_profile_changed.emit(update_data)
-            else:
-                QMessageBox.warning(
-                    self,
-                    "⚠️ Warning", 
-                    f"Failed to update profile: {response.text}"
-                )
                 
         except Exception as e:
-            QMessageBox.critical(
+            self.on_profile_update_failed(e)
+            
+    def on_profile_updated(self, update_data, response):
+        """Report the server's answer to a profile update"""
+        if response.status_code == 200:
+            QMessageBox.information(
                 self,
-                "❌ Error",
-                f"Error updating profile: {str(e)}"
+                "✅ Success",
+                "Profile updated successfully!"
             )
+            self.user_profile_changed.emit(update_data)
+        else:
+            QMessageBox.warning(
+                self,
+                "⚠️ Warning", 
+                f"Failed to update profile: {response.text}"
+            )
+            
+    def on_profile_update_failed(self, error):
+        QMessageBox.critical(
+            self,
+            "❌ Error",
+            f"Error updating profile: {str(error)}"
+        )
             
     def submit_health_data(self):
         """Submit health data to API"""
@@ -528,11 +553,29 @@ class HealthDataInputWidget(QWidget):
             if self.health_notes.toPlainText():
                 stress_data["notes"] += f" | Notes: {self.health_notes.toPlainText()}"
             
-            # Submit to API endpoints
-            self.submit_to_api("/api/health/conditions/blood_pressure", bp_data)
-            self.submit_to_api("/api/health/conditions/blood_sugar", bs_data)
-            self.submit_to_api("/api/health/conditions/stress", stress_data)
+            # Submit to API endpoints in the background, then report
+            submissions = (
+                ("/api/health/conditions/blood_pressure", bp_data),
+                ("/api/health/conditions/blood_sugar", bs_data),
+                ("/api/health/conditions/stress", stress_data),
+            )
+            self.loader.load(
+                ("health.conditions.submit", json.dumps(submissions, sort_keys=True)),
+                lambda: [self.submit_to_api(endpoint, data) for endpoint, data in submissions],
+                on_result=lambda _: self.on_health_data_submitted(bp_data, bs_data, stress_data),
+                owner=self
+            )
+            
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "❌ Error",
+                f"Failed to submit health data: {str(e)}"
+            )
             
+    def on_health_data_submitted(self, bp_data, bs_data, stress_data):
+        """Confirm a submission and tell the dashboard"""
+        try:
             # Show success message
             QMessageBox.information(
                 self,
@@ -566,11 +609,12 @@ class HealthDataInputWidget(QWidget):
             )
             
     def submit_to_api(self, endpoint, data):
-        """Submit data to specific API endpoint"""
+        """Submit data to specific API endpoint; blocking, so only called from the loader"""
         try:
             response = requests.post(
                 f"{self.api_base_url}{endpoint}",
                 json=data,
+                headers=self.auth_headers(),
                 timeout=10
             )
             if response.status_code != 200:
@@ -42,6 +42,7 @@ import requests
 from datetime import datetime, date, timedelta
 import json
 import math
+from app.services.data_loader import shared_loader
 
 class ModernCard(QFrame):
     """Modern card container with shadow effects"""
@@ -306,6 +307,7 @@ class ModernHealthDataInput(QWidget):
         super().__init__()
         self.api_client = api_client
         self.api_base_url = "http://localhost:8000"
+        self.loader = shared_loader()
         self.current_data = {}
         self.validation_rules = {}
         
@@ -1189,28 +1191,41 @@ class ModernHealthDataInput(QWidget):
             print(f"Auto-save failed: {e}")
             
     def submit_data(self, data, silent=False):
-        """Submit data to API"""
-        try:
-            if self.api_client:
-                response = self.api_client.post("/api/health-data", data)
-            else:
-                # Fallback to direct requests
-                response = requests.post(f"{self.api_base_url}/api/health-data", 
-                                       json=data, timeout=5)
-                                       
-            if response.status_code == 200:
-                self.data_submitted.emit(data)
-                if not silent:
-                    self.update_connection_status(True)
-            else:
-                raise Exception(f"API returned status {response.status_code}")
-                
-        except Exception as e:
-            if not silent:
-                print(f"Failed to submit data: {e}")
-                self.update_connection_status(False)
-            # Store locally for later sync
-            self.store_offline_data(data)
+        """Submit data to API in the background; the same entry twice in flight is sent once"""
+        if not silent:
+            self.connection_status.setText("🟡 Saving...")
+            self.connection_status.setStyleSheet("color: #ff9800; font-weight: bold;")
+        self.loader.load(
+            ("health-data.submit", json.dumps(data, sort_keys=True, default=str)),
+            lambda: self.post_data(data),
+            on_result=lambda _: self.on_data_submitted(data, silent),
+            on_error=lambda e: self.on_submit_failed(data, silent, e),
+            owner=self
+        )
+        
+    def post_data(self, data):
+        """POST one entry; blocking, so only called from the loader"""
+        if self.api_client:
+            if self.api_client.post("/api/health-data", data) is None:
+                raise Exception("API did not accept the data")
+            return
+        # Fallback to direct requests
+        response = requests.post(f"{self.api_base_url}/api/health-data", 
+                               json=data, timeout=5)
+        if response.status_code != 200:
+            raise Exception(f"API returned status {response.status_code}")
+            
+    def on_data_submitted(self, data, silent):
+        self.data_submitted.emit(data)
+        if not silent:
+            self.update_connection_status(True)
+            
+    def on_submit_failed(self, data, silent, error):
+        if not silent:
+            print(f"Failed to submit data: {error}")
+            self.update_connection_status(False)
+        # Store locally for later sync
+        self.store_offline_data(data)
             
     def store_offline_data(self, data):
         """Store data offline for later sync"""
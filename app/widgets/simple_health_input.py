@@ -16,6 +16,7 @@ from PyQt6.QtGui import QFont, QPalette, QColor, QLinearGradient
 import requests
 from datetime import datetime, date, timedelta
 import json
+from app.services.data_loader import shared_loader
 
 class SimpleHealthDataInput(QWidget):
     """Simple health data input system without charts dependency"""
@@ -29,6 +30,7 @@ class SimpleHealthDataInput(QWidget):
         super().__init__()
         self.api_client = api_client
         self.api_base_url = "http://localhost:8000"
+        self.loader = shared_loader()
         self.current_data = {}
         
         self.init_ui()
@@ -410,32 +412,43 @@ class SimpleHealthDataInput(QWidget):
             self.status_label.setStyleSheet("color: #dc3545; padding: 10px; font-weight: bold;")
     
     def submit_data(self, data):
-        """Submit data to API"""
-        try:
-            if self.api_client:
-                response = self.api_client.post("/api/habits", json=data)
-            else:
-                # Fallback to direct requests
-                response = requests.post(f"{self.api_base_url}/api/habits", 
-                                       json=data, timeout=5)
-            
-            if response.status_code in [200, 201]:
-                QMessageBox.information(self, "Success", "Health data saved successfully!")
-                self.status_label.setText("✅ Data saved successfully")
-                self.status_label.setStyleSheet("color: #28a745; padding: 10px; font-weight: bold;")
-                self.data_submitted.emit(data)
-            else:
-                QMessageBox.warning(self, "Warning", f"Server responded with: {response.status_code}")
-                
-        except requests.exceptions.ConnectionError:
+        """Submit data to API in the background"""
+        self.status_label.setText("⏳ Saving...")
+        self.status_label.setStyleSheet("color: #6c757d; padding: 10px; font-weight: bold;")
+        self.loader.load(
+            ("habits.submit", json.dumps(data, sort_keys=True, default=str)),
+            lambda: self.post_data(data),
+            on_result=lambda response: self.on_data_submitted(data, response),
+            on_error=lambda e: self.on_submit_failed(data, e),
+            owner=self
+        )
+    
+    def post_data(self, data):
+        """POST the entry and return the response; blocking, so only called from the loader"""
+        if self.api_client:
+            return self.api_client._request("POST", "/api/habits", json_body=data, timeout=5)
+        # Fallback to direct requests
+        return requests.post(f"{self.api_base_url}/api/habits", 
+                             json=data, timeout=5)
+    
+    def on_data_submitted(self, data, response):
+        if response.status_code in [200, 201]:
+            QMessageBox.information(self, "Success", "Health data saved successfully!")
+            self.status_label.setText("✅ Data saved successfully")
+            self.status_label.setStyleSheet("color: #28a745; padding: 10px; font-weight: bold;")
+            self.data_submitted.emit(data)
+        else:
+            QMessageBox.warning(self, "Warning", f"Server responded with: {response.status_code}")
+    
+    def on_submit_failed(self, data, error):
+        if isinstance(error, requests.exceptions.ConnectionError):
             # Save locally if API is not available
             self.save_locally(data)
             QMessageBox.information(self, "Offline Mode", "Data saved locally. Will sync when online.")
             self.status_label.setText("💾 Saved locally (offline)")
             self.status_label.setStyleSheet("color: #ffc107; padding: 10px; font-weight: bold;")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error submitting data: {str(e)}")
+        else:
+            QMessageBox.critical(self, "Error", f"Error submitting data: {str(error)}")
     
     def save_locally(self, data):
         """Save data locally"""
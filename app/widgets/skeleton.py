@@ -0,0 +1,76 @@
+"""
+Skeleton placeholders
+Grey pulsing blocks shown where data will appear while it is still loading
+"""
+
+from PyQt6.QtWidgets import QWidget, QFrame, QVBoxLayout, QStackedWidget
+from PyQt6.QtCore import QTimer
+
+class SkeletonBlock(QFrame):
+    """A rounded grey bar that pulses between two shades"""
+
+    SHADES = ("#e9ecef", "#dee2e6")
+
+    def __init__(self, height=16, width=None, shades=None, parent=None):
+        super().__init__(parent)
+        self.shades = shades or self.SHADES
+        self.setFixedHeight(height)
+        if width:
+            self.setFixedWidth(width)
+        self._shade = 0
+        self._paint()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._pulse)
+
+    def _paint(self):
+        self.setStyleSheet(f"background-color: {self.shades[self._shade]}; border-radius: 6px; border: none;")
+
+    def _pulse(self):
+        self._shade = 1 - self._shade
+        self._paint()
+
+    def showEvent(self, a0):
+        self._timer.start(600)
+        super().showEvent(a0)
+
+    def hideEvent(self, a0):
+        # No repaints for placeholders nobody sees
+        self._timer.stop()
+        super().hideEvent(a0)
+
+class SkeletonPlaceholder(QWidget):
+    """A column of skeleton lines of varying length, standing in for a block of content"""
+
+    WIDTHS = (0.9, 0.6, 0.75, 0.5)
+
+    def __init__(self, lines=4, line_height=16, shades=None, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+        self.setLayout(layout)
+        self.lines = []
+        for _ in range(lines):
+            block = SkeletonBlock(line_height, shades=shades)
+            self.lines.append(block)
+            layout.addWidget(block)
+        layout.addStretch()
+
+    def resizeEvent(self, a0):
+        width = self.width()
+        for i, block in enumerate(self.lines):
+            block.setFixedWidth(int(width * self.WIDTHS[i % len(self.WIDTHS)]))
+        super().resizeEvent(a0)
+
+class SkeletonStack(QStackedWidget):
+    """Shows a skeleton placeholder in place of `content` while its data is loading"""
+
+    def __init__(self, content, lines=8, parent=None):
+        super().__init__(parent)
+        self.placeholder = SkeletonPlaceholder(lines)
+        self.content = content
+        self.addWidget(self.placeholder)
+        self.addWidget(content)
+
+    def set_loading(self, loading):
+        self.setCurrentWidget(self.placeholder if loading else self.content)
@@ -5,7 +5,6 @@ Comprehensive profile management interface for user information input and update
 """
 
 import sys
-import requests
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox, 
     QSpinBox, QDoubleSpinBox, QTextEdit, QPushButton, QLabel, QFrame, 
@@ -14,6 +13,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QDate
 from PyQt6.QtGui import QFont, QPixmap, QPainter, QBrush, QColor
+from app.services.data_loader import shared_loader
+from app.widgets.skeleton import SkeletonStack
 
 class UserProfileFormWidget(QWidget):
     """User profile form widget for comprehensive profile management"""
@@ -25,6 +26,7 @@ class UserProfileFormWidget(QWidget):
     def __init__(self, api_client=None):
         super().__init__()
         self.api_client = api_client
+        self.loader = shared_loader()
         self.user_data = {}
         self.init_ui()
         self.load_user_profile()
@@ -66,7 +68,10 @@ class UserProfileFormWidget(QWidget):
         self.tab_widget.addTab(preferences_tab, "⚙️ Preferences")
         
         scroll.setWidget(self.tab_widget)
-        main_layout.addWidget(scroll)
+        
+        # Skeleton in place of the form until the profile has loaded
+        self.skeleton = SkeletonStack(scroll)
+        main_layout.addWidget(self.skeleton)
         
         # Action buttons
         button_layout = self.create_action_buttons()
@@ -383,6 +388,7 @@ class UserProfileFormWidget(QWidget):
         # Save Profile Button
         save_button = QPushButton("💾 Save Profile")
         save_button.clicked.connect(self.save_profile)
+        self.save_button = save_button
         save_button.setStyleSheet("""
             QPushButton {
                 background-color: #27ae60;
@@ -524,22 +530,30 @@ class UserProfileFormWidget(QWidget):
         """)
         
     def load_user_profile(self):
-        """Load user profile data from API or default values"""
-        try:
-            if self.api_client:
-                # Try to get current user data from API
-                response = requests.get("http://localhost:8000/api/users/me", timeout=5)
-                if response.status_code == 200:
-                    self.user_data = response.json()
-                    self.populate_form(self.user_data)
-                    QMessageBox.information(self, "✅ Success", "Profile data loaded successfully!")
-                    return
-                    
-        except Exception as e:
-            print(f"Could not load from API: {e}")
+        """Load user profile data from API in the background, or default values"""
+        if not self.api_client:
+            self.populate_form({})
+            self.skeleton.set_loading(False)
+            return
             
-        # Load default/empty values
+        self.skeleton.set_loading(True)
+        self.loader.load(
+            ("users.me", id(self.api_client)), self.api_client.get_current_user,
+            on_result=self.on_profile_loaded, on_error=self.on_profile_failed, owner=self
+        )
+        
+    def on_profile_loaded(self, user_data):
+        """Fill the form with the loaded profile"""
+        self.user_data = user_data
+        self.populate_form(self.user_data)
+        self.skeleton.set_loading(False)
+        QMessageBox.information(self, "✅ Success", "Profile data loaded successfully!")
+        
+    def on_profile_failed(self, error):
+        """Fall back to an empty form"""
+        print(f"Could not load from API: {error}")
         self.populate_form({})
+        self.skeleton.set_loading(False)
         
     def populate_form(self, data):
         """Populate form fields with user data"""
@@ -596,14 +610,10 @@ class UserProfileFormWidget(QWidget):
             if not self.validate_form(profile_data):
                 return
                 
-            # Save to API if available
+            # Save to API if available; the result is reported when it arrives
             if self.api_client:
-                success = self.save_to_api(profile_data)
-                if success:
-                    QMessageBox.information(self, "✅ Success", "Profile saved successfully!")
-                    self.profile_saved.emit(profile_data)
-                    self.profile_updated.emit(profile_data)
-                    return
+                self.save_to_api(profile_data)
+                return
                     
             # Fallback: show success message
             QMessageBox.information(self, "✅ Profile Updated", 
@@ -688,28 +698,32 @@ class UserProfileFormWidget(QWidget):
         return True
         
     def save_to_api(self, data):
-        """Save profile data to API"""
-        try:
-            response = requests.put(
-                "http://localhost:8000/api/users/me", 
-                json=data,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return True
-            else:
-                QMessageBox.warning(self, "⚠️ API Error", 
-                                  f"Could not save to server:\n"
-                                  f"Status: {response.status_code}\n"
-                                  f"Response: {response.text[:200]}")
-                return False
-                
-        except Exception as e:
+        """Save profile data to API in the background"""
+        self.save_button.setEnabled(False)
+        self.loader.load(
+            ("users.me.update", id(self)),
+            lambda: self.api_client.update_user(data),
+            on_result=lambda _: self.on_profile_saved(data),
+            on_error=self.on_save_failed, owner=self
+        )
+        
+    def on_profile_saved(self, data):
+        self.save_button.setEnabled(True)
+        QMessageBox.information(self, "✅ Success", "Profile saved successfully!")
+        self.profile_saved.emit(data)
+        self.profile_updated.emit(data)
+        
+    def on_save_failed(self, error):
+        self.save_button.setEnabled(True)
+        response = getattr(error, 'response', None)
+        if response is not None:
+            QMessageBox.warning(self, "⚠️ API Error", 
+                              f"Could not save to server:\n"
+                              f"Status: {response.status_code}\n"
+                              f"Response: {response.text[:200]}")
+        else:
             QMessageBox.critical(self, "❌ Connection Error", 
-                               f"Could not connect to server:\n{str(e)}")
-            return False
+                               f"Could not connect to server:\n{str(error)}")
             
     def reset_form(self):
         """Reset form to default values"""
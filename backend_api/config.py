@@ -1,5 +1,8 @@
 from dotenv import load_dotenv
 import os
+# Database URL and SQLite engine profile are the desktop app's, so both
+# sides open the shared database file the same way
+from app.utils.config import DATABASE_URL, SQLITE_PRAGMAS  # noqa: F401
 
 # Load environment variables
 load_dotenv()
@@ -11,6 +14,49 @@ DATABASE_CONFIG = {
     'database': os.getenv('DB_NAME', 'smart_health_tracker')
 }
 
+# Per-user response cache for read-heavy endpoints (TTL 0 disables it)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 4096))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 300))
+# Cached responses live in each worker's memory, keyed by the user's data
+# version. With several uvicorn workers (WEB_CONCURRENCY) the versions must
+# be shared, or a write on one worker leaves the others serving stale
+# bodies and 304s; shared versions live in the database and cost a primary
+# key lookup per cached request
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+RESPONSE_CACHE_SHARED_VERSIONS = os.getenv(
+    'RESPONSE_CACHE_SHARED_VERSIONS', str(WEB_CONCURRENCY > 1)
+).lower() in ('1', 'true', 'yes')
+
+# Authenticated principals cached by user id, so requests skip the user lookup.
+# Updates and deactivations only evict the entry on the worker that made
+# them; other workers keep serving the old principal for up to the TTL, so
+# it defaults to a few seconds when WEB_CONCURRENCY > 1
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv('PRINCIPAL_CACHE_MAX_ENTRIES', 10000))
+PRINCIPAL_CACHE_TTL = float(os.getenv('PRINCIPAL_CACHE_TTL', 300 if WEB_CONCURRENCY == 1 else 5))
+
+# bcrypt runs on a bounded thread pool; logins beyond max pending get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+
+# Opaque session tokens of the enhanced API. Persisted sessions live in the
+# database, so every uvicorn worker sees them; each worker caches lookups
+# for SESSION_CACHE_TTL seconds, which also bounds how long a logout takes
+# to reach the other workers
+SESSION_TTL = float(os.getenv('SESSION_TTL', 7 * 24 * 3600))
+SESSION_PERSIST = os.getenv('SESSION_PERSIST', 'true').lower() in ('1', 'true', 'yes')
+SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', 60))
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv('SESSION_CACHE_MAX_ENTRIES', 10000))
+
+# Largest request body accepted once a gzipped upload is inflated (bytes)
+GZIP_REQUEST_MAX_BYTES = int(os.getenv('GZIP_REQUEST_MAX_BYTES', 64 * 1024 * 1024))
+
+# Background jobs (recommendation generation): concurrent jobs per worker
+# process, attempts before a job that keeps dying is marked failed, and how
+# long finished jobs are kept (seconds)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+JOB_RETENTION = float(os.getenv('JOB_RETENTION', 7 * 24 * 3600))
+
 # JWT Settings
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-super-secret-key-change-this-in-production')
 JWT_ALGORITHM = "HS256"
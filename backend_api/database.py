@@ -1,13 +1,10 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_CONFIG
+from app.database.local_db import create_db_engine
+from .config import DATABASE_URL
 
-# Create SQLite connection URL
-DATABASE_URL = "sqlite:///smart_health_tracker.db"
-
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Create SQLAlchemy engine with the shared SQLite pragma profile
+engine = create_db_engine(DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
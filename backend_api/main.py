@@ -1,5 +1,6 @@
 import sys
 import os
+from contextlib import asynccontextmanager
 
 # Add project root to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -9,19 +10,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 try:
-    from routes import user_routes, habit_routes, health_data_routes
+    from routes import user_routes, habit_routes, health_data_routes, recommendation_routes
 except ImportError:
     # Fallback for different import structures
     from . import routes
     user_routes = routes.user_routes
     habit_routes = routes.habit_routes
     health_data_routes = routes.health_data_routes
+    recommendation_routes = routes.recommendation_routes
+from utils.job_queue import job_queue
+from utils.gzip_request import GzipRequestMiddleware
 import uvicorn
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background job workers live as long as the server
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+
 app = FastAPI(
     title="Smart Health Tracker API",
     description="Backend API for Smart Health Tracker application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -33,10 +45,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Large uploads from the desktop client arrive gzipped
+app.add_middleware(GzipRequestMiddleware)
+
 # Include routers
 app.include_router(user_routes.router, prefix="/api/users", tags=["users"])
 app.include_router(habit_routes.router, prefix="/api/habits", tags=["habits"])
 app.include_router(health_data_routes.router, prefix="/api/health-data", tags=["health-data"])
+app.include_router(recommendation_routes.router, prefix="/api/recommendations", tags=["recommendations"])
 
 @app.get("/")
 async def root():
@@ -1,23 +1,35 @@
 import sys
 import os
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Security
+from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from datetime import datetime, date
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, date, timedelta
 import uvicorn
-import hashlib
 
 # Add project paths
 project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.insert(0, project_root)
 
 # Import database and models
-from app.database.local_db import get_db, SessionLocal, engine, Base
+from app.database.local_db import get_async_db, init_db
 from app.models.user_model import User as UserORM
 from app.models.habit_model import Habit as HabitORM
 from app.models.health_data_model import HealthData as HealthDataORM
+from app.models.health_rollup_model import HealthDailyRollup
+from app.models.session_model import UserSession
+from app.models.habit_event_model import HabitEvent, UserStreak
+from app.services import rollup_service, habit_service, streak_service, activity_service, analytics_service
+from utils.response_cache import response_cache
+from utils.conditional import etag_matches, cache_headers, not_modified
+from utils.principal import invalidate_principal
+from utils.password_pool import password_pool
+from utils.sessions import session_store, session_user_id, require_session_user, bearer
+from utils.gzip_request import GzipRequestMiddleware
+from backend_api.config import WEB_CONCURRENCY
 
 # Import routes
 try:
@@ -40,8 +52,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database tables
-Base.metadata.create_all(bind=engine)
+# Large uploads from the desktop client arrive gzipped
+app.add_middleware(GzipRequestMiddleware)
+
+# Initialize database tables and any indexes missing from older databases
+init_db()
 
 # Include health data routes
 if health_data_router:
@@ -98,6 +113,9 @@ class HabitCreate(BaseModel):
     target_value: int = 1
     current_value: int = 0
 
+class HabitIncrement(BaseModel):
+    delta: int = 1
+
 class HabitResponse(BaseModel):
     id: int
     name: str
@@ -108,20 +126,11 @@ class HabitResponse(BaseModel):
     user_id: int
     is_active: bool
     created_at: datetime
+    version: int = 1
 
     class Config:
         from_attributes = True
 
-# Helper functions
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return hash_password(plain_password) == hashed_password
-
-# Create a simple session to store logged-in users (in production, use proper JWT)
-current_user_id = None
-
 @app.get("/")
 async def root():
     return {"message": "Welcome to Smart Health Tracker API - Enhanced"}
@@ -130,15 +139,26 @@ async def root():
 async def health_check():
     return {"status": "healthy", "database": "connected"}
 
+@app.get("/api/cache/stats", dependencies=[Depends(require_session_user)])
+async def cache_stats():
+    """Hit, miss and eviction counters of the per-user response cache; signed-in users only"""
+    return response_cache.stats()
+
+@app.get("/api/auth/pool/stats", dependencies=[Depends(require_session_user)])
+async def password_pool_stats():
+    """Load of the password hashing pool, including logins rejected with 503; signed-in users only"""
+    return password_pool.stats()
+
 @app.post("/api/users/register", response_model=UserResponse)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    existing_user = db.query(UserORM).filter(UserORM.email == user.email).first()
+    result = await db.execute(select(UserORM).filter(UserORM.email == user.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    hashed_password = hash_password(user.password)
+    hashed_password = await password_pool.hash(user.password)
     new_user = UserORM(
         email=user.email,
         username=user.username,
@@ -152,47 +172,70 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    global current_user_id
-    current_user_id = new_user.id
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 @app.post("/api/users/login")
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(UserORM).filter(UserORM.email == user_credentials.email).first()
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(UserORM).filter(UserORM.email == user_credentials.email))
+    user = result.scalars().first()
+    if not user:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    # Don't hold a pooled connection while queued for bcrypt
+    await db.close()
+    valid, new_hash = await password_pool.verify_and_update(user_credentials.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        # Accounts created before bcrypt have an unsalted SHA-256 hash;
+        # replace it now that the password is known
+        await db.execute(update(UserORM).filter(UserORM.id == user.id).values(hashed_password=new_hash))
+        await db.commit()
     
-    global current_user_id
-    current_user_id = user.id
+    # Opaque token resolved per request, so any worker can serve any user
+    access_token = await session_store.create(db, user.id)
     
     return {
-        "access_token": f"user_token_{user.id}", 
+        "access_token": access_token, 
         "token_type": "bearer", 
         "user_id": user.id,
         "message": "Login successful"
     }
 
-@app.get("/api/users/me", response_model=UserResponse)
-async def get_current_user(db: Session = Depends(get_db)):
-    if not current_user_id:
+@app.post("/api/users/logout")
+async def logout(auth: Optional[HTTPAuthorizationCredentials] = Security(bearer), db: AsyncSession = Depends(get_async_db)):
+    if auth is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    await session_store.revoke(db, auth.credentials)
+    return {"status": "success", "message": "Logged out"}
+
+@app.get("/api/users/me", response_model=UserResponse)
+async def get_current_user(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    etag = await response_cache.etag(db, user_id, "users.me", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     
-    user = db.query(UserORM).filter(UserORM.id == current_user_id).first()
+    user = await db.get(UserORM, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return user
 
 @app.put("/api/users/me", response_model=UserResponse)
-async def update_current_user(user_update: UserUpdate, db: Session = Depends(get_db)):
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    user = db.query(UserORM).filter(UserORM.id == current_user_id).first()
+async def update_current_user(
+    user_update: UserUpdate,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.get(UserORM, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -202,67 +245,124 @@ async def update_current_user(user_update: UserUpdate, db: Session = Depends(get
         setattr(user, key, value)
     
     user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_principal(user_id)
+    await response_cache.invalidate(db, user_id)
+    await db.refresh(user)
     
     return user
 
 # Habit management endpoints
 @app.post("/api/habits", response_model=HabitResponse)
-async def create_habit(habit: HabitCreate, db: Session = Depends(get_db)):
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
+async def create_habit(
+    habit: HabitCreate,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
     new_habit = HabitORM(
         name=habit.name,
         description=habit.description,
         frequency=habit.frequency,
         target_value=habit.target_value,
         current_value=habit.current_value,
-        user_id=current_user_id,
+        user_id=user_id,
         is_active=True
     )
     
     db.add(new_habit)
-    db.commit()
-    db.refresh(new_habit)
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
+    await db.refresh(new_habit)
     
     return new_habit
 
 @app.get("/api/habits", response_model=List[HabitResponse])
-async def get_habits(db: Session = Depends(get_db)):
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+async def get_habits(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    etag = await response_cache.etag(db, user_id, "habits.enhanced", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     
-    habits = db.query(HabitORM).filter(HabitORM.user_id == current_user_id).all()
-    return habits
+    async def load_habits():
+        result = await db.execute(select(HabitORM).filter(HabitORM.user_id == user_id))
+        return [HabitResponse.model_validate(habit) for habit in result.scalars().all()]
+    
+    return await response_cache.get_or_compute(db, user_id, "habits.enhanced", {}, load_habits)
 
 @app.put("/api/habits/{habit_id}/progress")
-async def update_habit_progress(habit_id: int, progress: dict, db: Session = Depends(get_db)):
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    habit = db.query(HabitORM).filter(
-        HabitORM.id == habit_id, 
-        HabitORM.user_id == current_user_id
-    ).first()
-    
+async def update_habit_progress(
+    habit_id: int,
+    progress: dict,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Sets an absolute value; pass the habit's version to refuse stale writes
+    values = {"current_value": progress["current_value"]} if "current_value" in progress else {}
+    try:
+        habit = await habit_service.update_habit(db, user_id, habit_id, values, progress.get("version"))
+    except habit_service.VersionConflict as e:
+        raise HTTPException(status_code=409, detail=f"Habit was modified concurrently (now version {e.current_version})")
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    habit.current_value = progress.get("current_value", habit.current_value)
-    habit.updated_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(habit)
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
     
     return {"status": "success", "message": "Habit progress updated", "habit": habit}
 
+@app.post("/api/habits/{habit_id}/increment", response_model=HabitResponse)
+async def increment_habit_progress(
+    habit_id: int,
+    increment: HabitIncrement,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add to a habit's progress in one atomic UPDATE; concurrent increments all count"""
+    habit = await habit_service.increment_progress(db, user_id, habit_id, increment.delta)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    await habit_service.log_progress(db, user_id, habit_id, increment.delta)
+    
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
+    return habit
+
+@app.get("/api/habits/{habit_id}/heatmap")
+async def get_habit_heatmap(
+    habit_id: int,
+    year: Optional[int] = None,
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Active dates of one year (the current one by default), read from the habit's activity bitmap"""
+    habit = await db.get(HabitORM, habit_id)
+    if not habit or habit.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    heatmap = await activity_service.heatmap(db, habit_id, year or datetime.utcnow().year)
+    summary = await activity_service.streak_summary(db, habit_id)
+    return dict(heatmap, current_streak=summary["current_streak"])
+
+@app.get("/api/users/streak")
+async def get_user_streak(user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
+    """Current streak of days with habit progress, served from the per-user streak cache"""
+    streak = await streak_service.get_streak(db, user_id)
+    return streak_service.streak_response(streak)
+
+@app.get("/api/users/streak/stats")
+async def get_user_streak_stats(user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
+    """Streaks, active days and completion rate computed from the habit event log"""
+    return await streak_service.compute_stats(db, user_id)
+
 # Health tracking endpoints
 @app.get("/api/health/stats")
-async def get_health_stats(db: Session = Depends(get_db)):
+async def get_health_stats(user_id: Optional[int] = Depends(session_user_id), db: AsyncSession = Depends(get_async_db)):
     """Get quick health statistics for current user"""
-    if not current_user_id:
+    if not user_id:
         # Return sample data for unauthenticated users
         return {
             "steps": 8450,
@@ -272,15 +372,22 @@ async def get_health_stats(db: Session = Depends(get_db)):
             "user_authenticated": False
         }
     
-    # In a real implementation, calculate from user's actual data
-    # For now, return sample data with user authentication
+    # Today's figures come straight from the daily rollup
+    today = datetime.utcnow().date()
+    rollups = await rollup_service.get_daily_rollups(
+        db, user_id, ["steps_count", "sleep_hours", "water_intake", "mood_score"], today
+    )
+    steps, sleep, water, mood = (
+        rows[-1] if rows else None for rows in rollups.values()
+    )
+    
     return {
-        "steps": 8450,
-        "sleep_hours": 7.5,
-        "water_intake": 2.1,
-        "mood_score": 8.2,
+        "steps": int(steps.value_sum) if steps else 0,
+        "sleep_hours": sleep.last_value if sleep else None,
+        "water_intake": round(water.value_sum, 2) if water else 0,
+        "mood_score": round(mood.value_sum / mood.value_count, 1) if mood else None,
         "user_authenticated": True,
-        "user_id": current_user_id
+        "user_id": user_id
     }
 
 @app.get("/api/health/activities")
@@ -334,10 +441,8 @@ async def get_health_conditions():
     }
 
 @app.post("/api/health/conditions/blood_pressure")
-async def log_blood_pressure(data: dict, db: Session = Depends(get_db)):
+async def log_blood_pressure(data: dict, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Log blood pressure reading"""
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
     
     # In a real implementation, save to a health_data table
     # For now, just return success
@@ -345,49 +450,77 @@ async def log_blood_pressure(data: dict, db: Session = Depends(get_db)):
         "status": "success", 
         "message": "Blood pressure logged successfully",
         "data": data,
-        "user_id": current_user_id,
+        "user_id": user_id,
         "recorded_at": datetime.utcnow().isoformat()
     }
 
 @app.post("/api/health/conditions/blood_sugar")
-async def log_blood_sugar(data: dict, db: Session = Depends(get_db)):
+async def log_blood_sugar(data: dict, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Log blood sugar reading"""
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
     
     return {
         "status": "success", 
         "message": "Blood sugar logged successfully",
         "data": data,
-        "user_id": current_user_id,
+        "user_id": user_id,
         "recorded_at": datetime.utcnow().isoformat()
     }
 
 @app.post("/api/health/conditions/stress")
-async def log_stress_level(data: dict, db: Session = Depends(get_db)):
+async def log_stress_level(data: dict, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Log stress level"""
-    if not current_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
     
     return {
         "status": "success", 
         "message": "Stress level logged successfully",
         "data": data,
-        "user_id": current_user_id,
+        "user_id": user_id,
         "recorded_at": datetime.utcnow().isoformat()
     }
 
 # Analytics endpoints
 @app.get("/api/analytics/trends")
-async def get_health_trends():
+async def get_health_trends(
+    days: int = 7,
+    user_id: Optional[int] = Depends(session_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get health trends for analytics"""
-    return {
-        "weight_trend": [70.2, 70.0, 69.8, 69.9, 70.1],
-        "sleep_trend": [7.5, 8.0, 7.2, 6.8, 7.5],
-        "steps_trend": [8450, 9200, 7800, 8900, 8450],
-        "mood_trend": [8.2, 7.8, 8.5, 7.9, 8.2],
-        "user_authenticated": current_user_id is not None
-    }
+    if not user_id:
+        return {
+            "weight_trend": [70.2, 70.0, 69.8, 69.9, 70.1],
+            "sleep_trend": [7.5, 8.0, 7.2, 6.8, 7.5],
+            "steps_trend": [8450, 9200, 7800, 8900, 8450],
+            "mood_trend": [8.2, 7.8, 8.5, 7.9, 8.2],
+            "user_authenticated": False
+        }
+    
+    # Rolling statistics are a pandas pass over 90 days, so the result is
+    # cached until the user's next write (keyed by day, as windows end today)
+    today = datetime.utcnow().date()
+    
+    async def load_trends():
+        # One value per day with data, oldest first, read from the daily rollup
+        start_day = today - timedelta(days=days - 1)
+        rollups = await rollup_service.get_daily_rollups(
+            db, user_id, ["weight", "sleep_hours", "steps_count", "mood_score"], start_day
+        )
+        
+        def daily_average(rows):
+            return [round(row.value_sum / row.value_count, 1) for row in rows]
+        
+        return {
+            "weight_trend": daily_average(rollups["weight"]),
+            "sleep_trend": [row.last_value for row in rollups["sleep_hours"]],
+            "steps_trend": [int(row.value_sum) for row in rollups["steps_count"]],
+            "mood_trend": daily_average(rollups["mood_score"]),
+            "rolling": await analytics_service.compute_trends(db, user_id, today),
+            "user_authenticated": True
+        }
+    
+    return await response_cache.get_or_compute(
+        db, user_id, "analytics.trends", {"days": days, "day": today.isoformat()}, load_trends
+    )
 
 # Community endpoints
 @app.get("/api/community/insights")
@@ -410,19 +543,22 @@ async def get_community_insights():
 
 # Debug endpoints
 @app.get("/api/debug/users")
-async def debug_get_all_users(db: Session = Depends(get_db)):
+async def debug_get_all_users(
+    user_id: Optional[int] = Depends(session_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Debug endpoint to see all users in database"""
-    users = db.query(UserORM).all()
+    users = (await db.execute(select(UserORM))).scalars().all()
     return {
         "total_users": len(users),
         "users": [{"id": u.id, "email": u.email, "username": u.username} for u in users],
-        "current_user_id": current_user_id
+        "current_user_id": user_id
     }
 
 @app.get("/api/debug/habits")
-async def debug_get_all_habits(db: Session = Depends(get_db)):
+async def debug_get_all_habits(db: AsyncSession = Depends(get_async_db)):
     """Debug endpoint to see all habits in database"""
-    habits = db.query(HabitORM).all()
+    habits = (await db.execute(select(HabitORM))).scalars().all()
     return {
         "total_habits": len(habits),
         "habits": [{"id": h.id, "name": h.name, "user_id": h.user_id} for h in habits]
@@ -433,7 +569,8 @@ if __name__ == "__main__":
     print("📊 Backend available at: http://localhost:8000")
     print("📖 API documentation: http://localhost:8000/docs")
     print("💾 Database: SQLite with real persistence")
-    print("🔐 Authentication: Simple session-based")
+    print("🔐 Authentication: Bearer session tokens")
     print("⚡ Features: User registration, habits, health tracking")
     print("🛑 Press Ctrl+C to stop the server")
-    uvicorn.run("main_enhanced:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    # Sessions and response cache versions live in the database, so requests can land on any worker
+    uvicorn.run("main_enhanced:app", host="0.0.0.0", port=8000, reload=False, workers=WEB_CONCURRENCY)
\ No newline at end of file
@@ -21,6 +21,11 @@ class HabitUpdate(BaseModel):
     current_value: Optional[float] = None
     unit: Optional[str] = None
     is_active: Optional[bool] = None
+    # Version the client last read; the update is refused with 409 if it moved on
+    version: Optional[int] = None
+
+class HabitIncrement(BaseModel):
+    delta: float = 1
 
 class HabitResponse(HabitBase):
     id: int
@@ -30,6 +35,7 @@ class HabitResponse(HabitBase):
     updated_at: datetime
     start_date: datetime
     end_date: Optional[datetime] = None
+    version: int = 1
 
     class Config:
         orm_mode = True
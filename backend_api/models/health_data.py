@@ -1,8 +1,18 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
-from datetime import datetime, date
+from typing import Optional, List
+from datetime import datetime, date, timezone
 from enum import Enum
 
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Times are stored as naive UTC, like the server's utcnow() defaults;
+    convert aware ones (e.g. ISO strings ending in "Z") so the two can be
+    compared and sorted together
+    """
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 class SugarTestType(str, Enum):
     FASTING = "fasting"
     AFTER_MEAL = "after_meal"
@@ -45,6 +55,8 @@ class HealthDataCreate(BaseModel):
     notes: Optional[str] = Field(None, max_length=1000, description="Additional notes")
     measurement_time: Optional[datetime] = Field(None, description="When measurement was taken")
 
+    _measurement_time_utc = validator('measurement_time', allow_reuse=True)(to_naive_utc)
+
     @validator('systolic_bp', 'diastolic_bp')
     def validate_blood_pressure(cls, v, values):
         if v is not None:
@@ -113,6 +125,8 @@ class HealthDataUpdate(BaseModel):
     notes: Optional[str] = Field(None, max_length=1000)
     measurement_time: Optional[datetime] = None
 
+    _measurement_time_utc = validator('measurement_time', allow_reuse=True)(to_naive_utc)
+
 class HealthDataSummary(BaseModel):
     """Summary statistics for health data visualization"""
     total_entries: int
@@ -131,4 +145,17 @@ class HealthDataChartData(BaseModel):
     sleep_hours: list[Optional[float]]
     stress_level: list[Optional[int]]
     mood_score: list[Optional[int]]
-    energy_level: list[Optional[int]]
\ No newline at end of file
+    energy_level: list[Optional[int]]
+
+class HealthDataBulkItemStatus(BaseModel):
+    """Outcome for one item of a bulk upload, in request order"""
+    index: int
+    status: str  # "created" or "invalid"
+    errors: Optional[List[dict]] = None
+
+class HealthDataBulkResponse(BaseModel):
+    """Result of a bulk health data upload"""
+    total: int
+    created: int
+    failed: int
+    items: List[HealthDataBulkItemStatus]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, validator
+from typing import Any, Optional
+from datetime import datetime
+import json
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str  # queued, running, done, failed
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @validator("result", pre=True)
+    def parse_result(cls, value):
+        # Stored as JSON text in the jobs table
+        return json.loads(value) if isinstance(value, str) else value
+
+    class Config:
+        from_attributes = True
@@ -1,89 +1,162 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from models.habit import HabitCreate, HabitResponse, HabitUpdate
-from utils.security import SecurityUtils
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime
+from models.habit import HabitCreate, HabitResponse, HabitUpdate, HabitIncrement
+from utils.principal import Principal, current_principal
+from utils.response_cache import response_cache
+from utils.conditional import etag_matches, cache_headers, not_modified
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from app.database.local_db import get_db
-from app.models.user_model import User
-from app.models.habit_model import Habit
+from app.database.local_db import get_async_db
+from app.models.habit_model import Habit, HabitActivity
+from app.services import habit_service, streak_service, activity_service
+from app.models.habit_event_model import HabitEvent
 
 router = APIRouter()
 
 @router.post("/", response_model=HabitResponse)
 async def create_habit(
     habit: HabitCreate,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    db_habit = Habit(**habit.dict(), user_id=user.id)
+    db_habit = Habit(**habit.dict(), user_id=principal.user_id)
     db.add(db_habit)
-    db.commit()
-    db.refresh(db_habit)
+    await db.commit()
+    await response_cache.invalidate(db, principal.user_id)
+    await db.refresh(db_habit)
     return db_habit
 
 @router.get("/", response_model=List[HabitResponse])
 async def get_habits(
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    etag = await response_cache.etag(db, principal.user_id, "habits", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    
+    async def load_habits():
+        result = await db.execute(select(Habit).filter(Habit.user_id == principal.user_id))
+        return [HabitResponse.model_validate(habit, from_attributes=True) for habit in result.scalars().all()]
     
-    habits = db.query(Habit).filter(Habit.user_id == user.id).all()
-    return habits
+    return await response_cache.get_or_compute(db, principal.user_id, "habits", {}, load_habits)
 
 @router.get("/{habit_id}", response_model=HabitResponse)
 async def get_habit(
     habit_id: int,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+    habit = await db.get(Habit, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
-    if habit.user_id != user.id:
+    if habit.user_id != principal.user_id:
         raise HTTPException(status_code=403, detail="Not authorized to access this habit")
     return habit
 
+async def get_own_habit(db: AsyncSession, principal: Principal, habit_id: int) -> Habit:
+    habit = await db.get(Habit, habit_id)
+    if not habit or habit.user_id != principal.user_id:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    return habit
+
+@router.get("/{habit_id}/streak")
+async def get_habit_streak(
+    habit_id: int,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Current and longest streak and active days of one habit, from its activity bitmaps"""
+    await get_own_habit(db, principal, habit_id)
+    return await activity_service.streak_summary(db, habit_id)
+
+@router.get("/{habit_id}/heatmap")
+async def get_habit_heatmap(
+    habit_id: int,
+    year: Optional[int] = Query(None, ge=1970, le=9999),
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Active dates of one year (the current one by default) for a calendar heatmap"""
+    await get_own_habit(db, principal, habit_id)
+    return await activity_service.heatmap(db, habit_id, year or datetime.utcnow().year)
+
+@router.get("/{habit_id}/active-days")
+async def get_habit_active_days(
+    habit_id: int,
+    start_date: date,
+    end_date: date,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Number of days with progress between start_date and end_date inclusive"""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    await get_own_habit(db, principal, habit_id)
+    count = await activity_service.count_active_days(db, habit_id, start_date, end_date)
+    return {"start_date": start_date, "end_date": end_date, "active_days": count}
+
 @router.put("/{habit_id}", response_model=HabitResponse)
 async def update_habit(
     habit_id: int,
     habit_update: HabitUpdate,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    habit = db.query(Habit).filter(Habit.id == habit_id, Habit.user_id == user.id).first()
+    values = habit_update.dict(exclude_unset=True)
+    expected_version = values.pop("version", None)
+    try:
+        habit = await habit_service.update_habit(db, principal.user_id, habit_id, values, expected_version)
+    except habit_service.VersionConflict as e:
+        raise HTTPException(status_code=409, detail=f"Habit was modified concurrently (now version {e.current_version})")
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    for key, value in habit_update.dict(exclude_unset=True).items():
-        setattr(habit, key, value)
+    await db.commit()
+    await response_cache.invalidate(db, principal.user_id)
+    return habit
+
+@router.post("/{habit_id}/increment", response_model=HabitResponse)
+async def increment_habit(
+    habit_id: int,
+    increment: HabitIncrement,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add to the habit's progress atomically; safe to call from several clients at once"""
+    habit = await habit_service.increment_progress(db, principal.user_id, habit_id, increment.delta)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    await habit_service.log_progress(db, principal.user_id, habit_id, increment.delta)
     
-    db.commit()
-    db.refresh(habit)
+    await db.commit()
+    await response_cache.invalidate(db, principal.user_id)
     return habit
 
 @router.delete("/{habit_id}")
 async def delete_habit(
     habit_id: int,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    habit = db.query(Habit).filter(Habit.id == habit_id, Habit.user_id == user.id).first()
+    result = await db.execute(select(Habit).filter(Habit.id == habit_id, Habit.user_id == principal.user_id))
+    habit = result.scalars().first()
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     
-    db.delete(habit)
-    db.commit()
+    await db.execute(delete(HabitEvent).filter(HabitEvent.habit_id == habit_id))
+    await db.execute(delete(HabitActivity).filter(HabitActivity.habit_id == habit_id))
+    await db.delete(habit)
+    await db.flush()
+    # The habit's events may have carried the streak
+    await streak_service.refresh_streak(db, principal.user_id)
+    await db.commit()
+    await response_cache.invalidate(db, principal.user_id)
     return {"message": "Habit deleted successfully"}
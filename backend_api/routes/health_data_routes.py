@@ -1,27 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, desc, func, and_, or_
+from pydantic import ValidationError
 from typing import List, Optional
 from datetime import datetime, date, timedelta
+import base64
+import json
 import sys
 import os
+import numpy as np
 
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
-from app.database.local_db import get_db
+from app.database.local_db import get_async_db
 from app.models.user_model import User
 from app.models.health_data_model import HealthData
+from app.services import rollup_service, analytics_service
 from models.health_data import (
     HealthDataCreate, 
     HealthDataResponse, 
     HealthDataUpdate,
     HealthDataSummary,
-    HealthDataChartData
+    HealthDataChartData,
+    HealthDataBulkItemStatus,
+    HealthDataBulkResponse
 )
+from utils.downsampling import downsample_series
+from utils.columnar import negotiate_columnar, encode_columnar, epoch_seconds, rows_to_columns
+from utils.response_cache import response_cache
+from utils.conditional import etag_matches, cache_headers, not_modified
+from utils.sessions import require_session_user
 
 router = APIRouter()
 
+# Bulk uploads: rows per INSERT executemany, and the largest accepted batch
+BULK_CHUNK_SIZE = 1000
+MAX_BULK_ITEMS = 100000
+
+# Metrics averaged in the summary, in response order
+SUMMARY_METRICS = (
+    "systolic_bp",
+    "diastolic_bp",
+    "blood_sugar",
+    "sleep_hours",
+    "stress_level",
+    "weight",
+    "heart_rate",
+    "mood_score",
+    "energy_level",
+)
+
+# Chart response field -> HealthData column, in response order
+CHART_SERIES = (
+    ("blood_pressure_systolic", "systolic_bp"),
+    ("blood_pressure_diastolic", "diastolic_bp"),
+    ("blood_sugar", "blood_sugar"),
+    ("weight", "weight"),
+    ("sleep_hours", "sleep_hours"),
+    ("stress_level", "stress_level"),
+    ("mood_score", "mood_score"),
+    ("energy_level", "energy_level"),
+)
+INTEGER_CHART_COLUMNS = {"stress_level", "mood_score", "energy_level"}
+
+# Columns of the columnar (Arrow / float64) listing format. Datetimes are
+# sent as epoch seconds; the free-text columns are JSON-only.
+LIST_NUMERIC_COLUMNS = (
+    "id", "user_id", "systolic_bp", "diastolic_bp", "blood_sugar", "sleep_hours",
+    "sleep_quality", "stress_level", "steps_count", "exercise_minutes", "weight",
+    "height", "bmi", "heart_rate", "water_intake", "mood_score", "energy_level",
+)
+LIST_TIME_COLUMNS = ("measurement_time", "created_at", "updated_at")
+
 def calculate_bmi(weight_kg: float, height_cm: float) -> float:
     """Calculate BMI from weight and height"""
     if weight_kg and height_cm:
@@ -29,22 +80,56 @@ def calculate_bmi(weight_kg: float, height_cm: float) -> float:
         return round(weight_kg / (height_m ** 2), 2)
     return None
 
-def get_current_user_id():
-    """Get current user ID - simplified for demo, in production use JWT"""
-    # This should be replaced with proper JWT token validation
-    # For now, we'll use a global variable as in the enhanced main
-    global current_user_id
-    return getattr(sys.modules.get('__main__', sys.modules[__name__]), 'current_user_id', None)
+def calculate_bmi_batch(weights: list, heights: list, user: User) -> list:
+    """
+    Vectorized calculate_bmi for a batch of readings. Missing weight or
+    height falls back to the user's stored value, as in create_health_data.
+    """
+    weight = np.array([np.nan if w is None else w for w in weights], dtype=float)
+    height = np.array([np.nan if h is None else h for h in heights], dtype=float)
+    weight = np.where(np.isnan(weight), user.weight or np.nan, weight)
+    height = np.where(np.isnan(height), user.height or np.nan, height)
+    with np.errstate(invalid="ignore"):
+        bmi = np.round(weight / (height / 100) ** 2, 2)
+    return [None if np.isnan(value) else float(value) for value in bmi]
+
+def parse_bulk_body(body: bytes, content_type: str) -> list:
+    """Decode a bulk upload sent as a JSON array or as NDJSON (one object per line)"""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed JSON body")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of health data items")
+    return items
+
+def encode_cursor(health_data: HealthData) -> str:
+    """Opaque keyset cursor for the (measurement_time, id) position after this row"""
+    position = {"t": health_data.measurement_time.isoformat(), "id": health_data.id}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor, rejecting anything a client made up"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(position["t"]), int(position["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def columnar_list_columns(dialect_name: str) -> list:
+    """Select list for the columnar listing format, all numeric"""
+    return [getattr(HealthData, name) for name in LIST_NUMERIC_COLUMNS] + [
+        epoch_seconds(getattr(HealthData, name), dialect_name).label(name)
+        for name in LIST_TIME_COLUMNS
+    ]
 
 @router.post("/api/v1/healthdata", response_model=HealthDataResponse)
-async def create_health_data(health_data: HealthDataCreate, db: Session = Depends(get_db)):
+async def create_health_data(health_data: HealthDataCreate, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Create new health data entry"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
     # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -84,25 +169,85 @@ async def create_health_data(health_data: HealthDataCreate, db: Session = Depend
     )
     
     db.add(db_health_data)
-    db.commit()
-    db.refresh(db_health_data)
+    await rollup_service.apply_readings(db, user_id, [db_health_data])
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
+    await db.refresh(db_health_data)
     
     return db_health_data
 
+@router.post("/api/v1/healthdata/bulk", response_model=HealthDataBulkResponse)
+async def create_health_data_bulk(request: Request, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many health data entries in one request, e.g. a wearable backfill.
+    Accepts a JSON array or an NDJSON body of HealthDataCreate items. Valid
+    items are inserted in chunks inside a single transaction; invalid ones
+    are reported per item and skipped.
+    """
+    items = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Validate the whole batch before touching the database; invalid items are skipped
+    statuses = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(HealthDataCreate.parse_obj(item))
+            statuses.append(HealthDataBulkItemStatus(index=index, status="created"))
+        except ValidationError as e:
+            errors = [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]
+            statuses.append(HealthDataBulkItemStatus(index=index, status="invalid", errors=errors))
+    
+    bmis = calculate_bmi_batch([hd.weight for hd in valid], [hd.height for hd in valid], user)
+    now = datetime.utcnow()
+    rows = [
+        dict(hd.dict(), user_id=user_id, bmi=bmi, measurement_time=hd.measurement_time or now)
+        for hd, bmi in zip(valid, bmis)
+    ]
+    
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        await db.execute(insert(HealthData), rows[start:start + BULK_CHUNK_SIZE])
+    await rollup_service.apply_readings(db, user_id, rows)
+    await db.commit()
+    if rows:
+        await response_cache.invalidate(db, user_id)
+    
+    return HealthDataBulkResponse(
+        total=len(items),
+        created=len(rows),
+        failed=len(items) - len(rows),
+        items=statuses
+    )
+
 @router.get("/api/v1/healthdata", response_model=List[HealthDataResponse])
 async def get_health_data(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db)
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get health data entries for current user"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    """
+    Get health data entries for current user, newest first.
     
-    query = db.query(HealthData).filter(HealthData.user_id == user_id)
+    Pages with skip/limit by default. Passing the X-Next-Cursor header of a
+    previous page as ?cursor= switches to keyset pagination on
+    (measurement_time, id): each page is an index range scan regardless of
+    depth, and rows inserted meanwhile don't shift later pages.
+    
+    Clients sending Accept: application/vnd.apache.arrow.stream or
+    application/vnd.smart-health.columns get the page as numeric columns.
+    """
+    query = select(HealthData).filter(HealthData.user_id == user_id)
     
     # Filter by date range if provided
     if start_date:
@@ -110,20 +255,211 @@ async def get_health_data(
     if end_date:
         query = query.filter(HealthData.measurement_time <= end_date + timedelta(days=1))
     
-    health_data = query.order_by(desc(HealthData.measurement_time)).offset(skip).limit(limit).all()
+    if cursor:
+        cursor_time, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            HealthData.measurement_time < cursor_time,
+            and_(HealthData.measurement_time == cursor_time, HealthData.id < cursor_id)
+        ))
+    else:
+        query = query.offset(skip)
+    
+    query = query.order_by(desc(HealthData.measurement_time), desc(HealthData.id)).limit(limit)
+    
+    media_type = negotiate_columnar(request.headers.get("accept"))
+    if media_type:
+        result = await db.execute(query.with_only_columns(*columnar_list_columns(db.bind.dialect.name)))
+        names = LIST_NUMERIC_COLUMNS + LIST_TIME_COLUMNS
+        columns = rows_to_columns(result.all(), len(names))
+        headers = {}
+        if len(columns[0]) == limit:
+            last = await db.get(HealthData, int(columns[0][-1]))
+            if last.measurement_time:
+                headers["X-Next-Cursor"] = encode_cursor(last)
+        return Response(encode_columnar(media_type, list(names), columns), media_type=media_type, headers=headers)
+    
+    result = await db.execute(query)
+    health_data = result.scalars().all()
+    
+    # A full page means there may be more; hand out the cursor for the next one
+    if len(health_data) == limit and health_data[-1].measurement_time:
+        response.headers["X-Next-Cursor"] = encode_cursor(health_data[-1])
     return health_data
 
+async def build_health_data_summary(db: AsyncSession, user_id: int) -> HealthDataSummary:
+    """
+    Compute the summary with one aggregate query plus an indexed lookup of
+    the latest reading, instead of loading the user's whole history
+    """
+    stats = (await db.execute(select(
+        func.count(HealthData.id),
+        func.min(HealthData.measurement_time),
+        func.max(HealthData.measurement_time),
+        *[func.avg(getattr(HealthData, metric)) for metric in SUMMARY_METRICS]
+    ).filter(HealthData.user_id == user_id))).one()
+    
+    total_entries, earliest, latest_time = stats[:3]
+    if not total_entries:
+        return HealthDataSummary(
+            total_entries=0,
+            date_range={},
+            averages={},
+            latest_readings={},
+            trends={}
+        )
+    
+    # Date range
+    date_range = {
+        "earliest": earliest.isoformat() if earliest else None,
+        "latest": latest_time.isoformat() if latest_time else None
+    }
+    
+    # AVG() already skips NULLs, like the old safe_average
+    averages = {
+        metric: round(float(value), 2) if value is not None else None
+        for metric, value in zip(SUMMARY_METRICS, stats[3:])
+    }
+    
+    # Latest readings
+    latest = (await db.execute(select(
+        HealthData.systolic_bp,
+        HealthData.diastolic_bp,
+        HealthData.blood_sugar,
+        HealthData.weight,
+        HealthData.measurement_time
+    ).filter(
+        HealthData.user_id == user_id
+    ).order_by(desc(HealthData.measurement_time)).limit(1))).one()
+    latest_readings = {
+        "systolic_bp": latest.systolic_bp,
+        "diastolic_bp": latest.diastolic_bp,
+        "blood_sugar": latest.blood_sugar,
+        "weight": latest.weight,
+        "measurement_time": latest.measurement_time.isoformat() if latest.measurement_time else None
+    }
+    
+    return HealthDataSummary(
+        total_entries=total_entries,
+        date_range=date_range,
+        averages=averages,
+        latest_readings=latest_readings,
+        trends=await analytics_service.compute_trends(db, user_id)
+    )
+
+@router.get("/api/v1/healthdata/summary", response_model=HealthDataSummary)
+async def get_health_data_summary(request: Request, response: Response, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
+    """Get health data summary for analytics"""
+    etag = await response_cache.etag(db, user_id, "healthdata.summary", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    
+    return await response_cache.get_or_compute(
+        db, user_id, "healthdata.summary", {},
+        lambda: build_health_data_summary(db, user_id)
+    )
+
+def downsample_chart_data(rows: list, max_points: int, method: str) -> HealthDataChartData:
+    """Reduce chart rows to at most max_points per series with NumPy"""
+    times = np.array([row.measurement_time.timestamp() for row in rows])
+    columns = [
+        np.array([row[i + 1] for row in rows], dtype=float)
+        for i in range(len(CHART_SERIES))
+    ]
+    kept_rows, reduced = downsample_series(times, columns, max_points, method)
+    
+    series = {}
+    for (field, column), values in zip(CHART_SERIES, reduced):
+        cast = int if column in INTEGER_CHART_COLUMNS else float
+        series[field] = [None if np.isnan(value) else cast(value) for value in values]
+    
+    return HealthDataChartData(
+        dates=[rows[i].measurement_time.strftime("%Y-%m-%d") for i in kept_rows],
+        **series
+    )
+
+async def build_chart_columns(db: AsyncSession, user_id: int, days: int, max_points: Optional[int],
+                              downsample: str, media_type: str) -> bytes:
+    """Chart series encoded as columns, built straight from NumPy arrays"""
+    start_date = datetime.utcnow() - timedelta(days=days)
+    result = await db.execute(select(
+        epoch_seconds(HealthData.measurement_time, db.bind.dialect.name),
+        *[getattr(HealthData, column) for _, column in CHART_SERIES]
+    ).filter(
+        HealthData.user_id == user_id,
+        HealthData.measurement_time >= start_date
+    ).order_by(HealthData.measurement_time))
+    timestamps, *series = rows_to_columns(result.all(), len(CHART_SERIES) + 1)
+    if max_points and len(timestamps) > max_points:
+        kept_rows, series = downsample_series(timestamps, series, max_points, downsample)
+        timestamps = timestamps[kept_rows]
+    names = ["timestamp"] + [field for field, _ in CHART_SERIES]
+    return encode_columnar(media_type, names, [timestamps] + series)
+
+async def build_chart_data(db: AsyncSession, user_id: int, days: int, max_points: Optional[int],
+                           downsample: str) -> HealthDataChartData:
+    # Get health data for the specified number of days
+    start_date = datetime.utcnow() - timedelta(days=days)
+    result = await db.execute(select(
+        HealthData.measurement_time,
+        *[getattr(HealthData, column) for _, column in CHART_SERIES]
+    ).filter(
+        HealthData.user_id == user_id,
+        HealthData.measurement_time >= start_date
+    ).order_by(HealthData.measurement_time))
+    rows = result.all()
+    
+    if max_points and len(rows) > max_points:
+        return downsample_chart_data(rows, max_points, downsample)
+    
+    # Format data for charts
+    return HealthDataChartData(
+        dates=[row.measurement_time.strftime("%Y-%m-%d") for row in rows],
+        **{field: [row[i + 1] for row in rows] for i, (field, _) in enumerate(CHART_SERIES)}
+    )
+
+@router.get("/api/v1/healthdata/charts", response_model=HealthDataChartData)
+async def get_chart_data(
+    request: Request,
+    response: Response,
+    days: int = Query(30, ge=1, le=365),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample each series to at most this many points"),
+    downsample: str = Query("lttb", pattern="^(lttb|minmax)$", description="Downsampling method: lttb or minmax"),
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get health data formatted for charts. With a columnar Accept header the
+    series come back as float64 columns plus a "timestamp" column in epoch
+    seconds, built straight from NumPy arrays.
+    """
+    media_type = negotiate_columnar(request.headers.get("accept"))
+    params = {"days": days, "max_points": max_points, "downsample": downsample, "format": media_type}
+    etag = await response_cache.etag(db, user_id, "healthdata.charts", params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    if media_type:
+        payload = await response_cache.get_or_compute(
+            db, user_id, "healthdata.charts", params,
+            lambda: build_chart_columns(db, user_id, days, max_points, downsample, media_type)
+        )
+        return Response(payload, media_type=media_type, headers=cache_headers(etag))
+    
+    response.headers.update(cache_headers(etag))
+    return await response_cache.get_or_compute(
+        db, user_id, "healthdata.charts", params,
+        lambda: build_chart_data(db, user_id, days, max_points, downsample)
+    )
+
 @router.get("/api/v1/healthdata/{health_data_id}", response_model=HealthDataResponse)
-async def get_health_data_by_id(health_data_id: int, db: Session = Depends(get_db)):
+async def get_health_data_by_id(health_data_id: int, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Get specific health data entry"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    health_data = db.query(HealthData).filter(
+    result = await db.execute(select(HealthData).filter(
         HealthData.id == health_data_id,
         HealthData.user_id == user_id
-    ).first()
+    ))
+    health_data = result.scalars().first()
     
     if not health_data:
         raise HTTPException(status_code=404, detail="Health data not found")
@@ -134,21 +470,21 @@ async def get_health_data_by_id(health_data_id: int, db: Session = Depends(get_d
 async def update_health_data(
     health_data_id: int, 
     health_data_update: HealthDataUpdate, 
-    db: Session = Depends(get_db)
+    user_id: int = Depends(require_session_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update health data entry"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    health_data = db.query(HealthData).filter(
+    result = await db.execute(select(HealthData).filter(
         HealthData.id == health_data_id,
         HealthData.user_id == user_id
-    ).first()
+    ))
+    health_data = result.scalars().first()
     
     if not health_data:
         raise HTTPException(status_code=404, detail="Health data not found")
     
+    old_time = health_data.measurement_time
+    
     # Update fields
     update_data = health_data_update.dict(exclude_unset=True)
     for key, value in update_data.items():
@@ -162,159 +498,48 @@ async def update_health_data(
             health_data.bmi = calculate_bmi(weight, height)
     
     health_data.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(health_data)
+    await db.flush()
+    
+    # Values or the day may have changed: rebuild both affected rollup days
+    new_time = health_data.measurement_time
+    await rollup_service.refresh_days(db, user_id, [
+        old_time.date() if old_time else None,
+        new_time.date() if new_time else None
+    ])
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
+    await db.refresh(health_data)
     
     return health_data
 
 @router.delete("/api/v1/healthdata/{health_data_id}")
-async def delete_health_data(health_data_id: int, db: Session = Depends(get_db)):
+async def delete_health_data(health_data_id: int, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
     """Delete health data entry"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    health_data = db.query(HealthData).filter(
+    result = await db.execute(select(HealthData).filter(
         HealthData.id == health_data_id,
         HealthData.user_id == user_id
-    ).first()
+    ))
+    health_data = result.scalars().first()
     
     if not health_data:
         raise HTTPException(status_code=404, detail="Health data not found")
     
-    db.delete(health_data)
-    db.commit()
+    measured = health_data.measurement_time
+    await db.delete(health_data)
+    await db.flush()
+    if measured:
+        await rollup_service.refresh_days(db, user_id, [measured.date()])
+    await db.commit()
+    await response_cache.invalidate(db, user_id)
     
     return {"message": "Health data deleted successfully"}
 
-@router.get("/api/v1/healthdata/summary", response_model=HealthDataSummary)
-async def get_health_data_summary(db: Session = Depends(get_db)):
-    """Get health data summary for analytics"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Get all health data for user
-    health_data = db.query(HealthData).filter(HealthData.user_id == user_id).all()
-    
-    if not health_data:
-        return HealthDataSummary(
-            total_entries=0,
-            date_range={},
-            averages={},
-            latest_readings={},
-            trends={}
-        )
-    
-    # Calculate summary statistics
-    total_entries = len(health_data)
-    
-    # Date range
-    dates = [hd.measurement_time for hd in health_data if hd.measurement_time]
-    date_range = {
-        "earliest": min(dates).isoformat() if dates else None,
-        "latest": max(dates).isoformat() if dates else None
-    }
-    
-    # Calculate averages
-    def safe_average(values):
-        filtered = [v for v in values if v is not None]
-        return round(sum(filtered) / len(filtered), 2) if filtered else None
-    
-    averages = {
-        "systolic_bp": safe_average([hd.systolic_bp for hd in health_data]),
-        "diastolic_bp": safe_average([hd.diastolic_bp for hd in health_data]),
-        "blood_sugar": safe_average([hd.blood_sugar for hd in health_data]),
-        "sleep_hours": safe_average([hd.sleep_hours for hd in health_data]),
-        "stress_level": safe_average([hd.stress_level for hd in health_data]),
-        "weight": safe_average([hd.weight for hd in health_data]),
-        "heart_rate": safe_average([hd.heart_rate for hd in health_data]),
-        "mood_score": safe_average([hd.mood_score for hd in health_data]),
-        "energy_level": safe_average([hd.energy_level for hd in health_data])
-    }
-    
-    # Latest readings
-    latest = max(health_data, key=lambda x: x.measurement_time or datetime.min)
-    latest_readings = {
-        "systolic_bp": latest.systolic_bp,
-        "diastolic_bp": latest.diastolic_bp,
-        "blood_sugar": latest.blood_sugar,
-        "weight": latest.weight,
-        "measurement_time": latest.measurement_time.isoformat() if latest.measurement_time else None
-    }
-    
-    return HealthDataSummary(
-        total_entries=total_entries,
-        date_range=date_range,
-        averages=averages,
-        latest_readings=latest_readings,
-        trends={}  # Could implement trend analysis here
-    )
-
-@router.get("/api/v1/healthdata/charts", response_model=HealthDataChartData)
-async def get_chart_data(
-    days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
-):
-    """Get health data formatted for charts"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Get health data for the specified number of days
-    start_date = datetime.utcnow() - timedelta(days=days)
-    
-    health_data = db.query(HealthData).filter(
-        HealthData.user_id == user_id,
-        HealthData.measurement_time >= start_date
-    ).order_by(HealthData.measurement_time).all()
-    
-    # Format data for charts
-    dates = []
-    blood_pressure_systolic = []
-    blood_pressure_diastolic = []
-    blood_sugar = []
-    weight = []
-    sleep_hours = []
-    stress_level = []
-    mood_score = []
-    energy_level = []
-    
-    for hd in health_data:
-        date_str = hd.measurement_time.strftime("%Y-%m-%d") if hd.measurement_time else ""
-        dates.append(date_str)
-        blood_pressure_systolic.append(hd.systolic_bp)
-        blood_pressure_diastolic.append(hd.diastolic_bp)
-        blood_sugar.append(hd.blood_sugar)
-        weight.append(hd.weight)
-        sleep_hours.append(hd.sleep_hours)
-        stress_level.append(hd.stress_level)
-        mood_score.append(hd.mood_score)
-        energy_level.append(hd.energy_level)
-    
-    return HealthDataChartData(
-        dates=dates,
-        blood_pressure_systolic=blood_pressure_systolic,
-        blood_pressure_diastolic=blood_pressure_diastolic,
-        blood_sugar=blood_sugar,
-        weight=weight,
-        sleep_hours=sleep_hours,
-        stress_level=stress_level,
-        mood_score=mood_score,
-        energy_level=energy_level
-    )
-
-@router.get("/recent")
-async def get_recent_health_data(db: Session = Depends(get_db)):
-    """Get recent health data for dashboard display"""
-    user_id = get_current_user_id()
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
+async def build_recent_health_data(db: AsyncSession, user_id: int) -> dict:
     # Get last 5 health data entries
-    recent_data = db.query(HealthData).filter(
+    result = await db.execute(select(HealthData).filter(
         HealthData.user_id == user_id
-    ).order_by(desc(HealthData.measurement_time)).limit(5).all()
+    ).order_by(desc(HealthData.measurement_time)).limit(5))
+    recent_data = result.scalars().all()
     
     if not recent_data:
         return {"message": "No health data found", "data": []}
@@ -331,4 +556,17 @@ async def get_recent_health_data(db: Session = Depends(get_db)):
             "notes": data.notes or ""
         })
     
-    return {"data": formatted_data}
\ No newline at end of file
+    return {"data": formatted_data}
+
+@router.get("/recent")
+async def get_recent_health_data(request: Request, response: Response, user_id: int = Depends(require_session_user), db: AsyncSession = Depends(get_async_db)):
+    """Get recent health data for dashboard display"""
+    etag = await response_cache.etag(db, user_id, "healthdata.recent", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    
+    return await response_cache.get_or_compute(
+        db, user_id, "healthdata.recent", {},
+        lambda: build_recent_health_data(db, user_id)
+    )
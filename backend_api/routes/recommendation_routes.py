@@ -1,70 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..models.recommendation import RecommendationResponse
-from ..utils.security import SecurityUtils
-from ...app.database.local_db import get_db
-from ...app.models.recommendation_model import Recommendation
-from ...app.models.user_model import User
-from ...app.services.ai_service import AIService
+from models.recommendation import RecommendationResponse
+from models.job import JobResponse
+from utils.principal import Principal, current_principal
+from utils.response_cache import response_cache
+from utils.conditional import etag_matches, cache_headers, not_modified
+from utils.job_queue import job_queue
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from app.database.local_db import get_async_db, SessionLocal, AsyncSessionLocal
+from app.models.recommendation_model import Recommendation
+from app.services.ai_service import ai_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[RecommendationResponse])
 async def get_recommendations(
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    etag = await response_cache.etag(db, principal.user_id, "recommendations", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     
-    # Get user's habits and health metrics for AI analysis
-    recommendations = db.query(Recommendation).filter(
-        Recommendation.user_id == user.id
-    ).order_by(Recommendation.created_at.desc()).all()
+    async def load_recommendations():
+        result = await db.execute(select(Recommendation).filter(
+            Recommendation.user_id == principal.user_id
+        ).order_by(Recommendation.created_at.desc()))
+        return [RecommendationResponse.model_validate(rec, from_attributes=True) for rec in result.scalars().all()]
     
-    return recommendations
+    return await response_cache.get_or_compute(db, principal.user_id, "recommendations", {}, load_recommendations)
 
-@router.post("/generate", response_model=List[RecommendationResponse])
+@job_queue.handler("recommendations")
+async def run_recommendations_job(job):
+    # Scoring is pandas work on a sync Session, so it runs on a thread and
+    # the event loop keeps serving requests; rows are written in bulk
+    def generate():
+        with SessionLocal() as session:
+            rows = ai_service.generate_recommendations(job.user_id, session)
+            session.commit()
+            return len(rows)
+    
+    count = await asyncio.to_thread(generate)
+    async with AsyncSessionLocal() as db:
+        await response_cache.invalidate(db, job.user_id)
+    return {"recommendations": count}
+
+@router.post("/generate", response_model=JobResponse, status_code=202)
 async def generate_recommendations(
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Generate new recommendations using AI service
-    ai_service = AIService()
-    new_recommendations = ai_service.generate_recommendations(user, db)
-    
-    # Save new recommendations to database
-    for rec in new_recommendations:
-        db_rec = Recommendation(**rec.dict(), user_id=user.id)
-        db.add(db_rec)
-    
-    db.commit()
-    
-    return new_recommendations
+    """
+    Queue recommendation generation and return the job at once; while it
+    is unfinished, asking again returns the same job. Poll
+    /jobs/{job_id} until it is done, then fetch the recommendations.
+    """
+    return await job_queue.submit(db, "recommendations", principal.user_id)
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_recommendation_job(
+    job_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for an unfinished job"),
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await job_queue.get(db, job_id, principal.user_id, wait=wait)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.put("/{recommendation_id}/implement")
 async def mark_recommendation_implemented(
     recommendation_id: int,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    recommendation = db.query(Recommendation).filter(
+    result = await db.execute(select(Recommendation).filter(
         Recommendation.id == recommendation_id,
-        Recommendation.user_id == user.id
-    ).first()
+        Recommendation.user_id == principal.user_id
+    ))
+    recommendation = result.scalars().first()
     
     if not recommendation:
         raise HTTPException(status_code=404, detail="Recommendation not found")
     
     recommendation.is_implemented = True
-    db.commit()
-    db.refresh(recommendation)
+    await db.commit()
+    await response_cache.invalidate(db, principal.user_id)
+    await db.refresh(recommendation)
     
-    return {"message": "Recommendation marked as implemented"}
\ No newline at end of file
+    return {"message": "Recommendation marked as implemented"}
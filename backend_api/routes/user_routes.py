@@ -1,25 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from models.user import UserCreate, UserResponse, UserLogin, UserUpdate
 from utils.security import SecurityUtils
+from utils.password_pool import password_pool
+from utils.principal import Principal, current_principal, invalidate_principal
+from utils.response_cache import response_cache
+from utils.conditional import etag_matches, cache_headers, not_modified
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from app.database.local_db import get_db
+from app.database.local_db import get_async_db
 from app.models.user_model import User
+from app.services import streak_service
 
 router = APIRouter()
 
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).filter(User.email == email))
+    return result.scalars().first()
+
 @router.post("/register", response_model=UserResponse)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await get_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    hashed_password = SecurityUtils.get_password_hash(user.password)
+    hashed_password = await password_pool.hash(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -32,49 +42,78 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login")
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-    if not user or not SecurityUtils.verify_password(user_credentials.password, user.hashed_password):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email(db, user_credentials.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    # Don't hold a pooled connection while queued for bcrypt
+    await db.close()
+    valid, new_hash = await password_pool.verify_and_update(user_credentials.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        # Legacy SHA-256 hash: store the bcrypt replacement now we know the password
+        await db.execute(update(User).filter(User.id == user.id).values(hashed_password=new_hash))
+        await db.commit()
     
-    access_token = SecurityUtils.create_access_token(data={"sub": user.email})
+    access_token = SecurityUtils.create_access_token(data={"sub": user.email}, user_id=user.id)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(token: dict = Depends(SecurityUtils.auth_wrapper), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+async def get_current_user(
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    etag = await response_cache.etag(db, principal.user_id, "users.me", {})
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return await db.get(User, principal.user_id)
 
 @router.put("/me", response_model=UserResponse)
 async def update_user(
     user_update: UserUpdate,
-    token: dict = Depends(SecurityUtils.auth_wrapper),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = await db.get(User, principal.user_id)
     
     for key, value in user_update.dict(exclude_unset=True).items():
         setattr(user, key, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_principal(user.id)
+    await response_cache.invalidate(db, user.id)
+    await db.refresh(user)
     return user
 
+@router.delete("/me")
+async def deactivate_user(
+    principal: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.get(User, principal.user_id)
+    user.is_active = False
+    await db.commit()
+    # Outstanding tokens stop working as soon as the cached principal is gone
+    invalidate_principal(user.id)
+    await response_cache.invalidate(db, user.id)
+    return {"message": "Account deactivated"}
+
 @router.get("/streak")
-async def get_user_streak(token: dict = Depends(SecurityUtils.auth_wrapper), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == token["sub"]).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Calculate user streak (simplified version)
-    # This would normally calculate based on health data entries
-    return {"streak": 7, "message": "Great job! 7 days in a row!"}
+async def get_user_streak(principal: Principal = Depends(current_principal), db: AsyncSession = Depends(get_async_db)):
+    """Current streak of days with habit progress, served from the per-user streak cache"""
+    streak = await streak_service.get_streak(db, principal.user_id)
+    return streak_service.streak_response(streak)
+
+@router.get("/streak/stats")
+async def get_user_streak_stats(principal: Principal = Depends(current_principal), db: AsyncSession = Depends(get_async_db)):
+    """Streaks, active days and completion rate computed from the habit event log"""
+    return await streak_service.compute_stats(db, principal.user_id)
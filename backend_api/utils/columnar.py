@@ -0,0 +1,65 @@
+import struct
+import numpy as np
+from sqlalchemy import func, extract
+
+# Optional Arrow support - only offered when pyarrow is installed
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+COLUMNS_MEDIA_TYPE = "application/vnd.smart-health.columns"
+
+# Compact column format, all little-endian:
+#   magic b"SHC1", uint32 row count, uint32 column count,
+#   per column: uint16 name length + UTF-8 name,
+#   then each column as row-count float64 values, NaN meaning null.
+COLUMNS_MAGIC = b"SHC1"
+
+def negotiate_columnar(accept: str):
+    """Pick a columnar media type from an Accept header, or None for JSON"""
+    accept = accept or ""
+    if ARROW_MEDIA_TYPE in accept and ARROW_AVAILABLE:
+        return ARROW_MEDIA_TYPE
+    if COLUMNS_MEDIA_TYPE in accept:
+        return COLUMNS_MEDIA_TYPE
+    return None
+
+def epoch_seconds(column, dialect_name: str):
+    """SQL expression turning a DateTime column into float epoch seconds (UTC)"""
+    if dialect_name == "postgresql":
+        return extract("epoch", column)
+    # SQLite stores datetimes as text; julianday() parses them
+    return (func.julianday(column) - 2440587.5) * 86400.0
+
+def encode_columns(names: list, columns: list) -> bytes:
+    """Serialize equal-length float64 columns in the compact column format"""
+    rows = len(columns[0]) if columns else 0
+    header = [COLUMNS_MAGIC, struct.pack("<II", rows, len(names))]
+    for name in names:
+        encoded = name.encode("utf-8")
+        header.append(struct.pack("<H", len(encoded)) + encoded)
+    body = [np.ascontiguousarray(column, dtype="<f8").tobytes() for column in columns]
+    return b"".join(header + body)
+
+def encode_arrow(names: list, columns: list) -> bytes:
+    """Serialize float64 columns as an Arrow IPC stream, NaN becoming null"""
+    table = pa.table({name: pa.array(column, from_pandas=True) for name, column in zip(names, columns)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def encode_columnar(media_type: str, names: list, columns: list) -> bytes:
+    if media_type == ARROW_MEDIA_TYPE:
+        return encode_arrow(names, columns)
+    return encode_columns(names, columns)
+
+def rows_to_columns(rows: list, width: int) -> list:
+    """Turn numeric result rows into float64 columns in one NumPy conversion"""
+    if not rows:
+        return [np.empty(0) for _ in range(width)]
+    matrix = np.array(rows, dtype=float)
+    return [matrix[:, i] for i in range(width)]
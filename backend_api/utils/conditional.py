@@ -0,0 +1,20 @@
+from fastapi import Request, Response
+
+# Clients may reuse a stored body but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match names this ETag (or is *)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response; nothing is queried or serialized"""
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,102 @@
+import numpy as np
+
+# Supported downsampling methods for chart series
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of the `threshold` points that
+    best preserve the visual shape of (x, y). The first and last points are
+    always kept. Bucket averages are computed in one vectorized pass; only
+    the per-bucket argmax depends on the previous pick.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 buckets over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:edges[-1]], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:edges[-1]], edges[:-1]) / counts
+    # The last bucket looks ahead to the final point instead of a bucket average
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Min/max bucketing: split the series into (threshold - 2) // 2 equal-count
+    buckets and keep the lowest and highest point of each, plus both ends.
+    Fully vectorized, and guaranteed to keep every spike.
+    """
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 4:
+        return np.array([0, n - 1])
+
+    buckets = (threshold - 2) // 2
+    bucket = np.arange(n) * buckets // n
+    # Sort by bucket, then value: each bucket's first/last entries are its min/max
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate(([0, n - 1], order[starts], order[ends])))
+
+# Smallest per-series budget worth shrinking to: min/max bucketing needs 4
+MIN_SERIES_BUDGET = 4
+
+def _pick_rows(x: np.ndarray, columns: list, budget: int, method: str) -> np.ndarray:
+    """(series, row) mask of the points each column keeps with this budget"""
+    keep = np.zeros((len(columns), len(x)), dtype=bool)
+    for i, column in enumerate(columns):
+        valid = np.flatnonzero(~np.isnan(column))
+        if len(valid) <= budget:
+            keep[i, valid] = True
+        elif method == "minmax":
+            keep[i, valid[minmax_indices(column[valid], budget)]] = True
+        else:
+            keep[i, valid[lttb_indices(x[valid], column[valid], budget)]] = True
+    return keep
+
+def downsample_series(x: np.ndarray, columns: list, max_points: int, method: str = "lttb"):
+    """
+    Reduce several series sharing one x axis to at most `max_points` rows.
+    Every column is downsampled over its own non-null points; the returned
+    row indices are the union of all picks, and each column is NaN at rows
+    that were picked for other series only.
+
+    Series measured at different times pick different rows, so the union
+    could reach len(columns) * max_points and with it the shared axis
+    (e.g. the JSON "dates" list). The per-series budget therefore shrinks
+    until the union fits; if even the smallest budget overflows (fewer than
+    MIN_SERIES_BUDGET points per series), the union is thinned evenly and
+    a sparse series may lose all its points.
+
+    Returns (rows, reduced_columns).
+    """
+    budget = max_points
+    while True:
+        keep = _pick_rows(x, columns, budget, method)
+        rows = np.flatnonzero(keep.any(axis=0))
+        if len(rows) <= max_points or budget <= MIN_SERIES_BUDGET:
+            break
+        budget = max(MIN_SERIES_BUDGET, min(budget - 1, budget * max_points // len(rows)))
+    if len(rows) > max_points:
+        rows = rows[np.unique(np.linspace(0, len(rows) - 1, max_points).round().astype(int))]
+
+    reduced = [np.where(keep[i, rows], column[rows], np.nan) for i, column in enumerate(columns)]
+    return rows, reduced
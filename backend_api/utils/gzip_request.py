@@ -0,0 +1,55 @@
+import zlib
+from starlette.responses import JSONResponse
+from backend_api.config import GZIP_REQUEST_MAX_BYTES
+
+class GzipRequestMiddleware:
+    """
+    ASGI middleware that inflates request bodies sent with
+    Content-Encoding: gzip, which the desktop client uses for large
+    uploads, so routes see plain JSON. Bodies that inflate past max_size
+    get a 413 instead of being decompressed into memory.
+    """
+
+    def __init__(self, app, max_size: int = GZIP_REQUEST_MAX_BYTES):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = [(name, value) for name, value in scope["headers"] if name != b"content-encoding"]
+        encoding = next((value for name, value in scope["headers"] if name == b"content-encoding"), None)
+        if encoding is None or encoding.strip().lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        compressed = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            compressed += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = inflater.decompress(bytes(compressed), self.max_size + 1)
+        except zlib.error:
+            await JSONResponse({"detail": "Invalid gzip request body"}, status_code=400)(scope, receive, send)
+            return
+        if len(body) > self.max_size or inflater.unconsumed_tail:
+            await JSONResponse({"detail": "Request body too large"}, status_code=413)(scope, receive, send)
+            return
+
+        headers = [(name, value) for name, value in headers if name != b"content-length"]
+        headers.append((b"content-length", str(len(body)).encode()))
+        delivered = False
+
+        async def inflated_receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(dict(scope, headers=headers), inflated_receive, send)
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from app.database.local_db import AsyncSessionLocal
+from app.models.job_model import Job, ACTIVE_STATUSES
+from backend_api.config import JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_RETENTION
+
+logger = logging.getLogger(__name__)
+
+# A job left "running" this long is assumed to belong to a dead process
+STALE_AFTER = timedelta(minutes=10)
+
+class JobQueue:
+    """
+    In-process asyncio job queue backed by the jobs table. Submitting
+    inserts a queued row and hands its id to this process' workers; a
+    worker claims it with a conditional UPDATE, so a job runs once even
+    when several API processes see it. A user has at most one unfinished
+    job of each kind (a partial unique index enforces it), and submitting
+    again returns that job instead of queueing a duplicate.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, retention: float, session_factory=AsyncSessionLocal):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.session_factory = session_factory
+        self.handlers = {}
+        self._queue = None
+        self._tasks = []
+        self._finished = {}  # job id -> Event set when it finishes in this process
+        self._waiters = {}  # job id -> number of get() calls waiting on that Event
+
+    def handler(self, kind: str):
+        """Register an async handler(job) -> JSON-able result for a job kind"""
+        def register(func):
+            self.handlers[kind] = func
+            return func
+        return register
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self):
+        """Start the workers and pick up jobs left over from before a restart"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        await self._recover()
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _recover(self):
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            await db.execute(delete(Job).filter(
+                Job.status.notin_(ACTIVE_STATUSES),
+                Job.finished_at <= now - timedelta(seconds=self.retention)
+            ))
+            await self._release_stale(db)
+            queued = await db.execute(select(Job.id).filter(Job.status == "queued").order_by(Job.id))
+        for job_id in queued.scalars():
+            self._queue.put_nowait(job_id)
+
+    async def _release_stale(self, db: AsyncSession, *filters) -> list:
+        """
+        Stale running jobs (matching filters) go back to the queue, unless
+        they keep dying; returns the ids of the requeued ones
+        """
+        now = datetime.utcnow()
+        stale = Job.status == "running", Job.started_at <= now - STALE_AFTER, *filters
+        await db.execute(update(Job).filter(*stale, Job.attempts >= self.max_attempts).values(
+            status="failed", error="Job did not finish", finished_at=now
+        ))
+        requeued = await db.execute(update(Job).filter(*stale).values(status="queued").returning(Job.id))
+        job_ids = list(requeued.scalars())
+        await db.commit()
+        return job_ids
+
+    async def submit(self, db: AsyncSession, kind: str, user_id: int) -> Job:
+        """Queue a job, or return the user's unfinished job of the same kind"""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler for job kind {kind!r}")
+        await self.start()
+        existing = await self._active_job(db, kind, user_id)
+        if existing is not None and existing.status == "running" and existing.started_at <= datetime.utcnow() - STALE_AFTER:
+            # Its worker died after start(); without this the unique index
+            # would block the user's jobs of this kind until a restart
+            for job_id in await self._release_stale(db, Job.id == existing.id):
+                self._queue.put_nowait(job_id)
+            db.expire_all()
+            existing = await self._active_job(db, kind, user_id)
+        if existing is not None:
+            return existing
+        job = Job(kind=kind, user_id=user_id, status="queued", attempts=0, created_at=datetime.utcnow())
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another request for the same user got there first
+            await db.rollback()
+            return await self._active_job(db, kind, user_id)
+        self._queue.put_nowait(job.id)
+        return job
+
+    @staticmethod
+    async def _active_job(db: AsyncSession, kind: str, user_id: int) -> Optional[Job]:
+        result = await db.execute(select(Job).filter(
+            Job.user_id == user_id, Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)
+        ))
+        return result.scalars().first()
+
+    async def get(self, db: AsyncSession, job_id: int, user_id: int, wait: float = 0) -> Optional[Job]:
+        """
+        The user's job, or None. With wait, an unfinished job is awaited for
+        up to that many seconds first; that only shortens the wait when the
+        job runs in this process, otherwise the caller just polls again.
+        """
+        finished = None
+        if wait > 0:
+            finished = self._finished.setdefault(job_id, asyncio.Event())
+            self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            job = await self._load(db, job_id, user_id)
+            if job is None or finished is None or job.status not in ACTIVE_STATUSES:
+                return job
+            try:
+                await asyncio.wait_for(finished.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            return await self._load(db, job_id, user_id)
+        finally:
+            if finished is not None:
+                # The last waiter drops the Event if the job hasn't finished
+                # here; earlier ones leave it to the rest
+                self._waiters[job_id] -= 1
+                if not self._waiters[job_id]:
+                    del self._waiters[job_id]
+                    self._finished.pop(job_id, None)
+
+    @staticmethod
+    async def _load(db: AsyncSession, job_id: int, user_id: int) -> Optional[Job]:
+        db.expire_all()
+        result = await db.execute(select(Job).filter(Job.id == job_id, Job.user_id == user_id))
+        return result.scalars().first()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("Job %s could not be run", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: int):
+        async with self.session_factory() as db:
+            claimed = await db.execute(
+                update(Job)
+                .filter(Job.id == job_id, Job.status == "queued")
+                .values(status="running", attempts=Job.attempts + 1, started_at=datetime.utcnow())
+                .returning(Job)
+            )
+            job = claimed.scalars().first()
+            await db.commit()
+        if job is None:
+            # Already claimed by another process, or no longer queued
+            return
+
+        try:
+            result = await self.handlers[job.kind](job)
+            values = {"status": "done", "result": json.dumps(result)}
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            values = {"status": "failed", "error": str(exc)}
+        async with self.session_factory() as db:
+            await db.execute(update(Job).filter(Job.id == job.id).values(finished_at=datetime.utcnow(), **values))
+            await db.commit()
+        finished = self._finished.pop(job.id, None)
+        if finished is not None:
+            finished.set()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "kinds": sorted(self.handlers),
+        }
+
+job_queue = JobQueue(JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_RETENTION)
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from backend_api.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+from .security import SecurityUtils
+
+class PasswordPool:
+    """
+    Runs bcrypt hashing and verification on a small dedicated thread pool,
+    so a login burst can't stall the event loop (bcrypt releases the GIL).
+    At most max_pending calls are queued or running; beyond that callers
+    get a 503 right away instead of waiting behind the queue.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many login attempts in progress, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(SecurityUtils.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(SecurityUtils.verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify, also returning a bcrypt rehash for legacy hashes (see SecurityUtils)"""
+        return await self.run(SecurityUtils.verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+password_pool = PasswordPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from app.database.local_db import get_async_db
+from app.models.user_model import User
+from backend_api.config import PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL
+from .security import SecurityUtils
+from .response_cache import MemoryCacheBackend
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated, active user behind a request"""
+    user_id: int
+    email: str
+
+# Only active users are cached; update and deactivation evict the entry.
+# The cache is per process, so other workers see the change once their
+# entry expires (PRINCIPAL_CACHE_TTL, kept short with several workers)
+principal_cache = MemoryCacheBackend(PRINCIPAL_CACHE_MAX_ENTRIES)
+
+def _cache_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+def invalidate_principal(user_id: int):
+    """
+    Drop this process' cached principal, e.g. after the user was updated or
+    deactivated. Other workers keep theirs until PRINCIPAL_CACHE_TTL ends.
+    """
+    principal_cache.delete(_cache_key(user_id))
+
+async def current_principal(
+    token: dict = Depends(SecurityUtils.auth_wrapper),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Resolve the request's principal from the token's uid claim. Cached
+    principals cost no query; tokens issued before the uid claim existed
+    fall back to looking the user up by email.
+    """
+    user_id = token.get("uid")
+    if user_id is not None:
+        principal = principal_cache.get(_cache_key(user_id))
+        if principal is not None:
+            return principal
+        user = await db.get(User, user_id)
+    else:
+        result = await db.execute(select(User).filter(User.email == token.get("sub")))
+        user = result.scalars().first()
+    
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="Inactive user")
+    
+    principal = Principal(user_id=user.id, email=user.email)
+    principal_cache.set(_cache_key(user.id), principal, PRINCIPAL_CACHE_TTL)
+    return principal
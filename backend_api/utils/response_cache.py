@@ -0,0 +1,204 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.data_version_model import UserDataVersion
+from backend_api.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, RESPONSE_CACHE_SHARED_VERSIONS
+
+class CacheBackend:
+    """
+    Storage interface for ResponseCache. The default MemoryCacheBackend is
+    per-process; a shared backend (e.g. Redis) implements the same methods,
+    keeping data versions in the shared store too so every worker sees a
+    bump. Keys are strings and values must be picklable.
+    """
+
+    def get(self, key: str):
+        """Return the cached value, or None if missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def get_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def bump_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+    @property
+    def instance_id(self) -> str:
+        """
+        Identifies whose version counters these are, so ETags built from
+        them can't collide across restarts or between processes. A shared
+        backend returns a stable id for its store.
+        """
+        raise NotImplementedError
+
+class MemoryCacheBackend(CacheBackend):
+    """Size-bounded LRU with per-entry TTL, safe to share between threads"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+        self._instance_id = uuid.uuid4().hex[:12]
+
+    @property
+    def instance_id(self) -> str:
+        return self._instance_id
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_version(self, user_id: int) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def bump_version(self, user_id: int) -> int:
+        # Entries of older versions are never read again and age out of the LRU
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            return version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+class DatabaseVersions:
+    """
+    Data versions kept in the user_data_versions table instead of a
+    backend's memory, so a write on any worker process invalidates the
+    cached responses and ETags of all of them. Versions survive restarts,
+    so their ETags can share one instance id.
+    """
+
+    instance_id = "db"
+
+    async def get(self, db, user_id: int) -> int:
+        version = await db.scalar(select(UserDataVersion.version).filter(UserDataVersion.user_id == user_id))
+        return version or 0
+
+    async def bump(self, db, user_id: int):
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(UserDataVersion).values(user_id=user_id, version=1)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id"], set_={"version": UserDataVersion.version + 1}
+        ))
+        await db.commit()
+
+class ResponseCache:
+    """
+    Per-user cache for read-heavy endpoints, keyed by
+    (user_id, endpoint, params, data_version). Mutating routes call
+    invalidate(user_id) after committing, which bumps the user's
+    data_version so every older entry stops matching. Versions come from
+    the backend, or from the database when shared_versions is set.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 60.0, shared_versions: bool = False):
+        self.backend = backend
+        self.ttl = ttl
+        self.versions = DatabaseVersions() if shared_versions else None
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, user_id: int, endpoint: str, params: dict, version: int) -> str:
+        return f"{user_id}:{endpoint}:{version}:{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    async def data_version(self, db, user_id: int) -> int:
+        if self.versions is not None:
+            return await self.versions.get(db, user_id)
+        return self.backend.get_version(user_id)
+
+    async def etag(self, db, user_id: int, endpoint: str, params: dict) -> str:
+        """
+        Strong ETag for a user-scoped response: it changes whenever the
+        user's data_version does. Compute it before loading the data, so a
+        write racing with the request can only make the tag older.
+        """
+        version = await self.data_version(db, user_id)
+        digest = hashlib.sha1(self.make_key(user_id, endpoint, params, version).encode()).hexdigest()[:16]
+        instance_id = self.versions.instance_id if self.versions is not None else self.backend.instance_id
+        return f'"{instance_id}-{version}-{digest}"'
+
+    async def invalidate(self, db, user_id: int):
+        """Bump the user's data_version; call after the write has committed"""
+        if self.versions is not None:
+            await self.versions.bump(db, user_id)
+        else:
+            self.backend.bump_version(user_id)
+
+    async def get_or_compute(self, db, user_id: int, endpoint: str, params: dict, compute):
+        """
+        Return the cached response for this key, or await compute() and
+        cache its result. The version is read before computing, so a result
+        racing with a write is stored under the old version and never served.
+        """
+        if self.ttl <= 0:
+            return await compute()
+        key = self.make_key(user_id, endpoint, params, await self.data_version(db, user_id))
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = await compute()
+        self.backend.set(key, value, self.ttl)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "ttl": self.ttl,
+            "shared_versions": self.versions is not None,
+            **self.backend.stats(),
+        }
+
+response_cache = ResponseCache(
+    MemoryCacheBackend(RESPONSE_CACHE_MAX_ENTRIES), ttl=RESPONSE_CACHE_TTL, shared_versions=RESPONSE_CACHE_SHARED_VERSIONS
+)
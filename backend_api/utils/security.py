@@ -1,26 +1,59 @@
+import hashlib
+import hmac
+import re
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import bcrypt
 import jwt
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
 from backend_api.config import JWT_SECRET, JWT_ALGORITHM
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Unsalted SHA-256 hex digests are the legacy hashes main_enhanced used to
+# write; they still verify, but a successful login replaces them with bcrypt
+LEGACY_SHA256_HASH = re.compile(r"[0-9a-f]{64}")
+# bcrypt only reads the first 72 bytes; bcrypt 5 raises instead of
+# truncating, so truncate here to keep matching existing hashes
+BCRYPT_MAX_BYTES = 72
 security = HTTPBearer()
 
+def _bcrypt_secret(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
 class SecurityUtils:
     @staticmethod
     def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+        return bcrypt.hashpw(_bcrypt_secret(password), bcrypt.gensalt()).decode("ascii")
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        if LEGACY_SHA256_HASH.fullmatch(hashed_password):
+            digest = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(digest, hashed_password)
+        try:
+            return bcrypt.checkpw(_bcrypt_secret(plain_password), hashed_password.encode("ascii"))
+        except (ValueError, UnicodeEncodeError):
+            # Not a bcrypt hash at all
+            return False
+
+    @staticmethod
+    def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if its hash is a legacy SHA-256 one, return
+        a new bcrypt hash to store as well (otherwise None)
+        """
+        valid = SecurityUtils.verify_password(plain_password, hashed_password)
+        if valid and LEGACY_SHA256_HASH.fullmatch(hashed_password):
+            return True, SecurityUtils.get_password_hash(plain_password)
+        return valid, None
 
     @staticmethod
-    def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, user_id: Optional[int] = None):
         to_encode = data.copy()
+        # The user id never changes, unlike the email in "sub", so the
+        # current_principal dependency can trust it without a lookup
+        if user_id is not None:
+            to_encode["uid"] = user_id
         if expires_delta:
             expire = datetime.utcnow() + expires_delta
         else:
@@ -36,7 +69,8 @@ class SecurityUtils:
             return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
+            # Base of every PyJWT decoding error: bad signature, malformed, wrong algorithm...
             raise HTTPException(status_code=401, detail="Could not validate credentials")
 
     @staticmethod
@@ -0,0 +1,109 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import Depends, HTTPException, Security
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from app.database.local_db import get_async_db
+from app.models.session_model import UserSession
+from backend_api.config import SESSION_TTL, SESSION_PERSIST, SESSION_CACHE_TTL, SESSION_CACHE_MAX_ENTRIES
+from .security import SecurityUtils
+from .response_cache import MemoryCacheBackend
+from .principal import current_principal
+
+class SessionStore:
+    """
+    Opaque bearer tokens of the enhanced API, mapped to user ids. Persisted
+    sessions are rows in user_sessions, shared by every worker, and each
+    process caches lookups for cache_ttl seconds. Without persistence they
+    only exist in this process' memory, so that mode is single-worker.
+    """
+
+    def __init__(self, ttl: float, persist: bool, cache_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.persist = persist
+        self.cache_ttl = cache_ttl if persist else ttl
+        self._cache = MemoryCacheBackend(max_entries)
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _remember(self, digest: str, user_id: int, expires_at: datetime):
+        self._cache.set(digest, (user_id, expires_at), min(self.cache_ttl, self.ttl))
+
+    async def create(self, db: AsyncSession, user_id: int) -> str:
+        """Start a session for the user and return its token"""
+        token = secrets.token_urlsafe(32)
+        digest = self._digest(token)
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+        if self.persist:
+            # Logins sweep expired sessions, which the expires_at index keeps cheap
+            await db.execute(delete(UserSession).filter(UserSession.expires_at <= now))
+            db.add(UserSession(token_hash=digest, user_id=user_id, created_at=now, expires_at=expires_at))
+            await db.commit()
+        self._remember(digest, user_id, expires_at)
+        return token
+
+    async def resolve(self, db: AsyncSession, token: str) -> Optional[int]:
+        """User id of a live session token, or None if unknown or expired"""
+        digest = self._digest(token)
+        now = datetime.utcnow()
+        cached = self._cache.get(digest)
+        if cached is not None:
+            user_id, expires_at = cached
+            return user_id if expires_at > now else None
+        if not self.persist:
+            return None
+        session = await db.get(UserSession, digest)
+        if session is None or session.expires_at <= now:
+            return None
+        self._remember(digest, session.user_id, session.expires_at)
+        return session.user_id
+
+    async def revoke(self, db: AsyncSession, token: str):
+        """End a session; other workers notice once their cached lookup expires"""
+        digest = self._digest(token)
+        self._cache.delete(digest)
+        if self.persist:
+            await db.execute(delete(UserSession).filter(UserSession.token_hash == digest))
+            await db.commit()
+
+session_store = SessionStore(SESSION_TTL, SESSION_PERSIST, SESSION_CACHE_TTL, SESSION_CACHE_MAX_ENTRIES)
+bearer = HTTPBearer(auto_error=False)
+
+async def session_user_id(
+    auth: Optional[HTTPAuthorizationCredentials] = Security(bearer),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[int]:
+    """
+    User id behind the request's bearer token, or None for anonymous
+    requests. An unknown or expired token is a 401 rather than anonymous.
+    """
+    if auth is None:
+        return None
+    user_id = await session_store.resolve(db, auth.credentials)
+    if user_id is None and auth.credentials.count(".") == 2:
+        # JWTs from the main API, which mounts the health data router too;
+        # they go through the same active-user check as its own routes
+        try:
+            principal = await current_principal(SecurityUtils.decode_token(auth.credentials), db)
+        except HTTPException as exc:
+            if exc.status_code != 404:
+                raise
+        else:
+            user_id = principal.user_id
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    return user_id
+
+async def require_session_user(user_id: Optional[int] = Depends(session_user_id)) -> int:
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user_id
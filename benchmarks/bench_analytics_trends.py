@@ -0,0 +1,145 @@
+"""
+Benchmark for the rolling 7/30/90-day health trends at 10k, 100k and 1M rows.
+
+Compares a per-row Python implementation (ORM objects grouped into days,
+then statistics computed window by window) with analytics_service, which
+averages each day in SQLite, loads the days from the cursor into column
+arrays and runs the rolling statistics as vectorized pandas kernels.
+Readings are spread over the last 90 days.
+
+    python benchmarks/bench_analytics_trends.py --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.local_db import Base, create_async_db_engine, create_db_engine
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+from app.services import analytics_service
+from app.services.analytics_service import ANALYTICS_METRICS, ROLLING_WINDOWS
+
+DAYS = 90
+
+async def legacy_trends(db, user_id):
+    """Per-row loops over ORM objects, for comparison"""
+    today = datetime.utcnow().date()
+    since = datetime.combine(today - timedelta(days=DAYS - 1), datetime.min.time())
+    result = await db.execute(select(HealthData).filter(
+        HealthData.user_id == user_id,
+        HealthData.measurement_time >= since
+    ))
+    by_day = defaultdict(lambda: defaultdict(list))
+    for hd in result.scalars():
+        for metric in ANALYTICS_METRICS:
+            value = getattr(hd, metric)
+            if value is not None:
+                by_day[hd.measurement_time.date()][metric].append(value)
+
+    days = [today - timedelta(days=offset) for offset in range(DAYS - 1, -1, -1)]
+    rolling = {}
+    for metric in ANALYTICS_METRICS:
+        daily = [statistics.fmean(by_day[day][metric]) if by_day[day][metric] else None for day in days]
+        for window in ROLLING_WINDOWS:
+            series = []
+            for i in range(len(days)):
+                values = [v for v in daily[max(0, i - window + 1):i + 1] if v is not None]
+                series.append({
+                    "mean": statistics.fmean(values) if values else None,
+                    "median": statistics.median(values) if values else None,
+                    "std": statistics.stdev(values) if len(values) > 1 else None,
+                    "min": min(values, default=None),
+                    "max": max(values, default=None),
+                })
+            rolling[(metric, window)] = series
+    return rolling
+
+def populate(url, rows):
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, HealthData.__table__])
+    end = datetime.utcnow()
+    step = DAYS * 86400 / rows
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("INSERT INTO users (id, username, email, hashed_password, is_active) "
+                       "VALUES (1, 'bench', 'bench@example.com', 'x', 1)")
+        cursor.executemany(
+            "INSERT INTO health_data (user_id, systolic_bp, diastolic_bp, blood_sugar, sleep_hours, "
+            "sleep_quality, stress_level, steps_count, exercise_minutes, weight, bmi, heart_rate, "
+            "water_intake, mood_score, energy_level, measurement_time) "
+            "VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((random.uniform(100, 160), random.uniform(60, 100), random.uniform(70, 200),
+              random.uniform(4, 10), random.randint(1, 10), random.randint(1, 10),
+              random.randint(0, 20000), random.randint(0, 120), random.uniform(50, 120),
+              random.uniform(18, 35), random.randint(50, 120), random.uniform(0, 4),
+              random.randint(1, 10), random.randint(1, 10),
+              (end - timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S.%f"))
+             for i in range(rows)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    engine.dispose()
+
+async def time_call(Session, func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        async with Session() as db:
+            started = time.perf_counter()
+            result = await func(db, 1)
+            best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+def check(legacy, vectorized):
+    """The last day of the loop-based series must match the vectorized figures"""
+    for metric, windows in vectorized.items():
+        for window in ROLLING_WINDOWS:
+            expected = legacy[(metric, window)][-1]
+            for stat, value in windows[f"{window}d"].items():
+                if value is None or expected[stat] is None:
+                    assert value is None and expected[stat] is None, (metric, window, stat)
+                else:
+                    assert math.isclose(value, expected[stat], abs_tol=0.01), (metric, window, stat)
+
+async def run_size(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        populate(url, rows)
+        engine = create_async_db_engine(url)
+        Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+        legacy, legacy_result = await time_call(Session, legacy_trends, repeat)
+        vectorized, vectorized_result = await time_call(Session, analytics_service.compute_trends, repeat)
+        await engine.dispose()
+    check(legacy_result, vectorized_result)
+    print(f"{rows:>10,}{legacy:>14.1f}{vectorized:>16.1f}{legacy / vectorized:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'rows':>10}{'loop ms':>14}{'vectorized ms':>16}{'speedup':>10}")
+    for rows in args.sizes:
+        asyncio.run(run_size(rows, args.repeat))
+
+if __name__ == "__main__":
+    main()
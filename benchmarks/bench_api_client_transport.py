@@ -0,0 +1,132 @@
+"""
+Round trips of a dashboard load through the desktop APIClient, before and
+after the pooled transport.
+
+Serves the enhanced API with uvicorn on a local port against a temporary
+database, then repeats the GETs a dashboard load makes with module-level
+requests.get (a new connection per call, as before) and with APIClient on
+the shared keep-alive session. ETags are not sent in either run, so only
+the transport differs. Also times a bulk upload sent plain and gzipped.
+
+    python benchmarks/bench_api_client_transport.py --rows 5000 --loads 50
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+from bench_conditional_refresh import seed
+
+DASHBOARD_PATHS = (
+    "/api/users/me",
+    "/api/habits",
+    "/api/users/streak",
+    "/api/health/stats",
+    "/api/analytics/trends",
+    "/api/v1/healthdata/summary",
+    "/api/v1/healthdata/charts?days=30",
+    "/recent",
+)
+
+def serve(app):
+    """Run uvicorn on a free local port in a daemon thread and return the base URL"""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+def legacy_load(base_url, auth):
+    for path in DASHBOARD_PATHS:
+        requests.get(f"{base_url}{path}", headers=auth).raise_for_status()
+
+def pooled_load(client):
+    for path in DASHBOARD_PATHS:
+        client._request("GET", path).raise_for_status()
+
+def time_loads(load, loads):
+    latencies = []
+    for _ in range(loads):
+        started = time.perf_counter()
+        load()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+def readings(count):
+    start = datetime.utcnow() - timedelta(days=400)
+    return [{
+        "systolic_bp": random.randint(100, 160), "diastolic_bp": random.randint(60, 100),
+        "heart_rate": random.randint(50, 120), "sleep_hours": round(random.uniform(4, 10), 1),
+        "measurement_time": (start + timedelta(minutes=7 * i)).isoformat(),
+    } for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--loads", type=int, default=50)
+    parser.add_argument("--upload", type=int, default=5000, help="readings in the bulk upload")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.chdir(os.path.join(project_root, 'backend_api'))
+        import main_enhanced
+        from app.services.api_client import APIClient
+
+        auth = seed(main_enhanced.app, args.rows)
+        base_url = serve(main_enhanced.app)
+        client = APIClient(base_url=base_url)
+        client.token = auth["Authorization"].split(" ", 1)[1]
+
+        # Warm the server's caches so both runs measure the same work
+        legacy_load(base_url, auth)
+        pooled_load(client)
+        client.timings.reset()
+
+        print(f"dashboard load: {len(DASHBOARD_PATHS)} GETs, {args.loads} loads")
+        print(f"{'transport':<22}{'p50 ms/load':>14}{'p95 ms/load':>14}")
+        for label, load in (("requests.get", lambda: legacy_load(base_url, auth)),
+                            ("pooled APIClient", lambda: pooled_load(client))):
+            p50, p95 = time_loads(load, args.loads)
+            print(f"{label:<22}{p50:>14.2f}{p95:>14.2f}")
+
+        batch = readings(args.upload)
+        raw_size = len(json.dumps(batch).encode())
+        started = time.perf_counter()
+        requests.post(f"{base_url}/api/v1/healthdata/bulk", json=batch, headers=auth).raise_for_status()
+        plain_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        client.bulk_upload_health_data(batch)
+        gzip_ms = (time.perf_counter() - started) * 1000
+        import gzip
+        gzip_size = len(gzip.compress(json.dumps(batch, allow_nan=False).encode(), compresslevel=6))
+        print(f"\nbulk upload of {args.upload:,} readings")
+        print(f"{'plain':<22}{raw_size:>12,} B{plain_ms:>12.1f} ms")
+        print(f"{'gzip':<22}{gzip_size:>12,} B{gzip_ms:>12.1f} ms")
+
+        print("\nper-endpoint timings from APIClient (ms)")
+        for endpoint, stats in sorted(client.timing_stats().items()):
+            print(f"  {endpoint:<48}{stats['count']:>5}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Mixed-load latency benchmark for sync vs async database sessions.
+
+Serves the same two handlers twice from one FastAPI app: once on a sync
+Session (the old get_db) and once on an AsyncSession (get_async_db). A
+handful of slow full-history aggregate requests run concurrently with many
+fast "recent readings" requests; with the sync session every slow query
+stalls the event loop, so the fast requests queue up behind it.
+
+Requires httpx in addition to the backend requirements.
+
+    python benchmarks/bench_async_db_latency.py --rows 2000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.database.local_db import Base, create_async_db_engine, create_db_engine
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+
+USERS = 100
+
+def populate(engine, rows):
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, HealthData.__table__])
+    start = datetime.utcnow() - timedelta(days=365)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT INTO users (id, username, email, hashed_password, is_active) VALUES (?, ?, ?, ?, 1)",
+            ((i, f"user{i}", f"user{i}@example.com", "x") for i in range(1, USERS + 1)),
+        )
+        cursor.executemany(
+            "INSERT INTO health_data (user_id, heart_rate, weight, measurement_time) VALUES (?, ?, ?, ?)",
+            ((random.randint(1, USERS), random.randint(50, 120), random.uniform(50, 120),
+              (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S.%f")) for i in range(rows)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+def slow_query():
+    # Unindexed expression forces a scan of the whole table
+    return select(func.count(HealthData.id), func.avg(HealthData.heart_rate * HealthData.weight)).filter(
+        func.abs(HealthData.user_id) > 0
+    )
+
+def fast_query(user_id):
+    return select(HealthData).filter(HealthData.user_id == user_id).order_by(
+        desc(HealthData.measurement_time)
+    ).limit(5)
+
+def build_app(url):
+    sync_engine = create_db_engine(url)
+    async_engine = create_async_db_engine(url)
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSessionFactory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def get_async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    app = FastAPI()
+
+    # The sync handlers open their session inline rather than through a
+    # generator dependency: its cleanup needs the (blocked) event loop, so
+    # pooled connections would never come back and the run would deadlock
+    @app.get("/sync/slow")
+    async def sync_slow():
+        with SyncSession() as db:
+            return list(db.execute(slow_query()).one())
+
+    @app.get("/sync/fast/{user_id}")
+    async def sync_fast(user_id: int):
+        with SyncSession() as db:
+            return len(db.execute(fast_query(user_id)).scalars().all())
+
+    @app.get("/async/slow")
+    async def async_slow(db: AsyncSession = Depends(get_async_db)):
+        return list((await db.execute(slow_query())).one())
+
+    @app.get("/async/fast/{user_id}")
+    async def async_fast(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        return len((await db.execute(fast_query(user_id))).scalars().all())
+
+    return app, sync_engine, async_engine
+
+async def run_mode(client, mode, slow_requests, fast_requests, window):
+    """
+    Open-loop run: every request has a planned arrival time inside `window`
+    seconds, and fast-request latency is measured from that planned time, so
+    time spent waiting for a blocked event loop is counted too.
+    """
+    fast_latencies = []
+    started = time.perf_counter()
+
+    async def slow(offset):
+        await asyncio.sleep(offset)
+        (await client.get(f"/{mode}/slow")).raise_for_status()
+
+    async def fast(offset, user_id):
+        await asyncio.sleep(offset)
+        response = await client.get(f"/{mode}/fast/{user_id}")
+        response.raise_for_status()
+        fast_latencies.append((time.perf_counter() - started - offset) * 1000)
+
+    await asyncio.gather(
+        *(slow(i * window / slow_requests) for i in range(slow_requests)),
+        *(fast(random.uniform(0, window), random.randint(1, USERS)) for _ in range(fast_requests)),
+    )
+    wall = time.perf_counter() - started
+    fast_latencies.sort()
+    p95 = fast_latencies[int(len(fast_latencies) * 0.95) - 1]
+    print(f"{mode:<8}{statistics.median(fast_latencies):>12.1f}{p95:>12.1f}{fast_latencies[-1]:>12.1f}{wall:>10.2f}")
+
+async def run(args, url):
+    app, sync_engine, async_engine = build_app(url)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"{'session':<8}{'fast p50 ms':>12}{'fast p95 ms':>12}{'fast max':>12}{'wall s':>10}")
+        for mode in ("sync", "async"):
+            await run_mode(client, mode, args.slow, args.fast, args.window)
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--slow", type=int, default=4, help="concurrent slow summary requests")
+    parser.add_argument("--fast", type=int, default=200, help="concurrent fast recent requests")
+    parser.add_argument("--window", type=float, default=2.0, help="seconds over which requests arrive")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        populate(create_db_engine(url), args.rows)
+        asyncio.run(run(args, url))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Bandwidth and latency of a dashboard refresh cycle with and without ETags.
+
+Runs the enhanced API in-process against a temporary database, then
+repeats the requests a dashboard refresh makes (profile, habits, summary,
+30-day charts, recent readings) with plain GETs and with If-None-Match
+revalidation. Nothing changes between cycles, so the conditional run is
+answered with bodiless 304s.
+
+Requires httpx in addition to the backend requirements.
+
+    python benchmarks/bench_conditional_refresh.py --rows 50000 --cycles 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+
+REFRESH_PATHS = (
+    "/api/users/me",
+    "/api/habits",
+    "/api/v1/healthdata/summary",
+    "/api/v1/healthdata/charts?days=30",
+    "/recent",
+)
+
+def seed(client_app, rows):
+    """Create the bench user and its data, returning the session's auth header"""
+    from fastapi.testclient import TestClient
+
+    with TestClient(client_app) as client:
+        credentials = {"email": "bench@example.com", "password": "bench"}
+        client.post("/api/users/register", json=dict(credentials, username="bench")).raise_for_status()
+        response = client.post("/api/users/login", json=credentials)
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        for name in ("Walk", "Water", "Sleep"):
+            client.post("/api/habits", json={"name": name}).raise_for_status()
+        # Readings every 10 minutes up to now, so the 30-day chart is full
+        start = datetime.utcnow() - timedelta(minutes=10 * rows)
+        items = [{
+            "systolic_bp": random.randint(100, 160), "diastolic_bp": random.randint(60, 100),
+            "weight": random.uniform(60, 90), "heart_rate": random.randint(50, 120),
+            "sleep_hours": random.uniform(4, 10), "mood_score": random.randint(1, 10),
+            "measurement_time": (start + timedelta(minutes=10 * i)).isoformat(),
+        } for i in range(rows)]
+        client.post("/api/v1/healthdata/bulk", json=items).raise_for_status()
+        return {"Authorization": client.headers["Authorization"]}
+
+async def run_cycles(client, cycles, conditional):
+    etags = {}
+    transferred = 0
+    not_modified = 0
+    latencies = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        for path in REFRESH_PATHS:
+            headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+            response = await client.get(path, headers=headers)
+            if response.status_code == 304:
+                not_modified += 1
+            else:
+                response.raise_for_status()
+                etags[path] = response.headers.get("etag")
+            transferred += len(response.content) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return transferred / cycles, latencies[len(latencies) // 2], not_modified
+
+async def run(app, cycles, auth):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=auth) as client:
+        # One warm-up cycle so both runs start with a populated response cache
+        await run_cycles(client, 1, conditional=False)
+        print(f"{'mode':<14}{'bytes/cycle':>14}{'p50 ms/cycle':>14}{'304s':>8}")
+        for label, conditional in (("plain GET", False), ("If-None-Match", True)):
+            size, p50, hits = await run_cycles(client, cycles, conditional)
+            print(f"{label:<14}{size:>14,.0f}{p50:>14.2f}{hits:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--cycles", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.chdir(os.path.join(project_root, 'backend_api'))
+        import main_enhanced
+
+        auth = seed(main_enhanced.app, args.rows)
+        asyncio.run(run(main_enhanced.app, args.cycles, auth))
+
+if __name__ == "__main__":
+    main()
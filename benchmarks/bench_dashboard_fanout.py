@@ -0,0 +1,99 @@
+"""
+Time-to-data of a dashboard load: the requests one after another through
+APIClient, as the dashboard made them before, against all of them at once
+through AsyncAPIClient.gather_dashboard.
+
+Serves the enhanced API with uvicorn on a local port against a temporary
+database. Every request is held for --latency ms first, standing in for
+the round trip to a remote server; on localhost the calls themselves take
+a few ms and the difference would mostly measure the local CPU.
+
+    python benchmarks/bench_dashboard_fanout.py --latency 40 --loads 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_api_client_transport import serve
+from bench_conditional_refresh import seed
+
+def with_latency(app, seconds):
+    """Wrap an ASGI app so every HTTP request waits `seconds` before being handled"""
+    async def delayed(scope, receive, send):
+        if scope["type"] == "http":
+            await asyncio.sleep(seconds)
+        await app(scope, receive, send)
+    return delayed
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+def sequential_loads(client, endpoints, loads):
+    latencies = []
+    for _ in range(loads):
+        started = time.perf_counter()
+        for path in endpoints.values():
+            client._conditional_get(path).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+async def gathered_loads(client, loads):
+    latencies = []
+    async with client:
+        for _ in range(loads):
+            started = time.perf_counter()
+            data = await client.gather_dashboard()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if data["errors"]:
+                raise RuntimeError(f"Dashboard calls failed: {data['errors']}")
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--loads", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=40, help="ms added to every request")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.chdir(os.path.join(project_root, 'backend_api'))
+        import main_enhanced
+        from app.services.api_client import APIClient
+        from app.services.async_api_client import AsyncAPIClient, DASHBOARD_ENDPOINTS
+
+        # The enhanced API mounts the health data routes without a prefix
+        DASHBOARD_ENDPOINTS["recent"] = "/recent"
+
+        auth = seed(main_enhanced.app, args.rows)
+        base_url = serve(with_latency(main_enhanced.app, args.latency / 1000))
+        client = APIClient(base_url=base_url)
+        client.token = auth["Authorization"].split(" ", 1)[1]
+        async_client = AsyncAPIClient.from_client(client)
+
+        # Warm connections and the server's caches for both
+        sequential_loads(client, DASHBOARD_ENDPOINTS, 1)
+        asyncio.run(gathered_loads(AsyncAPIClient.from_client(client), 1))
+
+        print(f"dashboard load: {len(DASHBOARD_ENDPOINTS)} GETs, +{args.latency:g} ms each, {args.loads} loads")
+        print(f"{'client':<28}{'p50 ms/load':>14}{'p95 ms/load':>14}")
+        for label, latencies in (
+            ("APIClient, sequential", sequential_loads(client, DASHBOARD_ENDPOINTS, args.loads)),
+            ("AsyncAPIClient, gathered", asyncio.run(gathered_loads(async_client, args.loads))),
+        ):
+            p50, p95 = percentiles(latencies)
+            print(f"{label:<28}{p50:>14.2f}{p95:>14.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Desktop dashboard start-up: time to first paint and resident memory, with
+every page built up front against pages built on first switch_page and
+evicted past the LRU budget.
+
+Each mode runs in a fresh process on Qt's offscreen platform, with an
+APIClient pointed at a closed port so the background dashboard load fails
+fast and the numbers are about widget construction only. Reports time
+from constructing WorkingDashboardController to its first paint event,
+RSS at that point and after visiting every page, and the slowest page
+switch.
+
+    python benchmarks/bench_dashboard_pages.py --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+def child(mode):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent, QObject
+
+    app = QApplication([])
+    from app.services.api_client import APIClient
+    from app.controllers.working_dashboard_controller import WorkingDashboardController
+
+    class FirstPaint(QObject):
+        at = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and self.at is None:
+                self.at = time.perf_counter()
+            return False
+
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    client = APIClient(base_url="http://127.0.0.1:9")
+    pages = len(WorkingDashboardController.PAGES)
+
+    started = time.perf_counter()
+    if mode == "eager":
+        # Every page built before the window shows, as init_ui used to
+        dashboard = WorkingDashboardController(client, page_cache_size=pages)
+        for index in range(pages):
+            dashboard.page(index)
+    else:
+        dashboard = WorkingDashboardController(client)
+    dashboard.show()
+    while first_paint.at is None:
+        app.processEvents()
+    first_paint_ms = (first_paint.at - started) * 1000
+    startup_rss = rss_mb()
+
+    slowest = 0.0
+    for index in list(range(1, pages)) + [0]:
+        started = time.perf_counter()
+        dashboard.switch_page(index)
+        app.processEvents()
+        slowest = max(slowest, (time.perf_counter() - started) * 1000)
+    app.processEvents()
+
+    print(json.dumps({
+        "first_paint_ms": first_paint_ms, "startup_rss_mb": startup_rss,
+        "visited_rss_mb": rss_mb(), "slowest_switch_ms": slowest,
+    }))
+    # Skip interpreter teardown: locals going away in arbitrary order after the
+    # QApplication can crash PyQt on exit, and the numbers are already out
+    sys.stdout.flush()
+    os._exit(0)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=("eager", "lazy"))
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child)
+
+    print(f"{'pages':<8}{'first paint ms':>16}{'RSS at paint MB':>18}{'RSS all visited MB':>21}{'slowest switch ms':>19}")
+    for mode in ("eager", "lazy"):
+        results = [
+            json.loads(subprocess.run(
+                [sys.executable, __file__, "--child", mode], capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1])
+            for _ in range(args.runs)
+        ]
+        median = {key: sorted(r[key] for r in results)[len(results) // 2] for key in results[0]}
+        print(f"{mode:<8}{median['first_paint_ms']:>16.1f}{median['startup_rss_mb']:>18.1f}"
+              f"{median['visited_rss_mb']:>21.1f}{median['slowest_switch_ms']:>19.1f}")
+
+if __name__ == "__main__":
+    main()
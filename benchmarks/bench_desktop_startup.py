@@ -0,0 +1,99 @@
+"""
+Desktop start-up: wall-clock time from launching the interpreter to the
+first paint of the login window, and the import time behind it.
+
+"before" loads login_window.ui at runtime with uic and imports the
+dashboard controller ahead of login, as app/main.py used to; "after" uses
+the forms compiled by compile_ui.py (compiled first if needed) and defers
+the dashboard to after login. Each run is a fresh process with
+-X importtime on Qt's offscreen platform.
+
+    python benchmarks/bench_desktop_startup.py --runs 7
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+def child(mode, launched):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent, QObject
+
+    if mode == "before":
+        # Hide the compiled form so the loader falls back to uic, and import
+        # the dashboard up front
+        sys.modules["app.ui.compiled.ui_login_window"] = None
+        import app.controllers.working_dashboard_controller  # noqa: F401
+    from app.main import SmartHealthTracker
+
+    class FirstPaint(QObject):
+        at = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and self.at is None:
+                self.at = time.time()
+            return False
+
+    tracker = SmartHealthTracker()
+    first_paint = FirstPaint()
+    tracker.app.installEventFilter(first_paint)
+    tracker.show_login()
+    while first_paint.at is None:
+        tracker.app.processEvents()
+    print(json.dumps({"login_window_ms": (first_paint.at - launched) * 1000}))
+    sys.stdout.flush()
+    os._exit(0)
+
+def import_times(stderr):
+    """{module: cumulative µs} from -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+def run(mode):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=project_root)
+    launched = time.time()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--child", mode, "--launched", repr(launched)],
+        capture_output=True, text=True, check=True, env=env, cwd=project_root
+    )
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["imports"] = import_times(result.stderr)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--child", choices=("before", "after"))
+    parser.add_argument("--launched", type=float)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.launched)
+
+    from app.ui.loader import compile_all
+    compile_all()
+
+    watched = ("app.main", "app.controllers.login_controller", "app.controllers.working_dashboard_controller",
+               "PyQt6.uic", "httpx", "requests", "PyQt6.QtWidgets")
+    print(f"{'mode':<8}{'to login window ms':>20}  import ms (cumulative, median)")
+    for mode in ("before", "after"):
+        runs = [run(mode) for _ in range(args.runs)]
+        wall = sorted(r["login_window_ms"] for r in runs)[len(runs) // 2]
+        imports = []
+        for module in watched:
+            times = sorted(r["imports"].get(module, 0) for r in runs)
+            if times[len(times) // 2]:
+                imports.append(f"{module} {times[len(times) // 2] / 1000:.0f}")
+        print(f"{mode:<8}{wall:>20.0f}  {', '.join(imports)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Lost updates under concurrent habit progress writes.
+
+Runs the enhanced API in-process against a temporary database and has
+many clients add 1 to the same habit at once: first the old way (read the
+habit, then PUT current_value + 1 to /progress), then with the atomic
+POST /increment. Exits non-zero if the atomic run loses any increment.
+
+Requires httpx in addition to the backend requirements.
+
+    python benchmarks/bench_habit_increments.py --clients 50 --rounds 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+
+async def read_modify_write(client, habit_id):
+    habits = (await client.get("/api/habits")).json()
+    current = next(h for h in habits if h["id"] == habit_id)["current_value"]
+    response = await client.put(f"/api/habits/{habit_id}/progress", json={"current_value": current + 1})
+    response.raise_for_status()
+
+async def atomic_increment(client, habit_id):
+    response = await client.post(f"/api/habits/{habit_id}/increment", json={"delta": 1})
+    response.raise_for_status()
+
+async def run_mode(client, habit_id, clients, rounds, step):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(step(client, habit_id) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    habits = (await client.get("/api/habits")).json()
+    return next(h for h in habits if h["id"] == habit_id)["current_value"], elapsed
+
+async def run(app, clients, rounds):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"email": "bench@example.com", "password": "bench"}
+        (await client.post("/api/users/register", json=dict(credentials, username="bench"))).raise_for_status()
+        login = (await client.post("/api/users/login", json=credentials)).json()
+        client.headers["Authorization"] = f"Bearer {login['access_token']}"
+
+        expected = clients * rounds
+        lost_atomic = 0
+        print(f"{'mode':<20}{'expected':>10}{'final':>8}{'lost':>8}{'ms/update':>11}")
+        for label, step in (("read-modify-write", read_modify_write), ("atomic increment", atomic_increment)):
+            habit = (await client.post("/api/habits", json={"name": label})).json()
+            final, elapsed = await run_mode(client, habit["id"], clients, rounds, step)
+            lost = expected - final
+            if step is atomic_increment:
+                lost_atomic = lost
+            print(f"{label:<20}{expected:>10}{final:>8.0f}{lost:>8.0f}{elapsed * 1000 / expected:>11.2f}")
+        return lost_atomic
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.chdir(os.path.join(project_root, 'backend_api'))
+        import main_enhanced
+
+        lost = asyncio.run(run(main_enhanced.app, args.clients, args.rounds))
+    if lost:
+        sys.exit(f"atomic increments lost {lost} updates")
+
+if __name__ == "__main__":
+    main()
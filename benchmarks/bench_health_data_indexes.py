@@ -0,0 +1,151 @@
+"""
+Before/after benchmark for the health_data index suite.
+
+Builds a synthetic health_data table in a temporary SQLite file, times the
+query shapes used by backend_api/routes/health_data_routes.py with only the
+primary key index, then creates the index suite and times them again.
+
+    python benchmarks/bench_health_data_indexes.py --rows 5000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, desc, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.local_db import Base, ensure_indexes
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+
+INSERT_SQL = (
+    "INSERT INTO health_data (user_id, systolic_bp, diastolic_bp, blood_sugar, "
+    "sleep_hours, stress_level, steps_count, weight, heart_rate, mood_score, "
+    "energy_level, measurement_time, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+def maybe(probability, value):
+    return value if random.random() < probability else None
+
+def generate_rows(rows, users):
+    """Yield synthetic readings spread over ~3 years, newest last"""
+    start = datetime.utcnow() - timedelta(days=3 * 365)
+    step = (3 * 365 * 86400) / rows
+    for i in range(rows):
+        ts = (start + timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S.%f")
+        systolic = maybe(0.3, random.uniform(100, 160))
+        yield (
+            random.randint(1, users),
+            systolic,
+            systolic - random.uniform(30, 50) if systolic else None,
+            maybe(0.2, random.uniform(70, 200)),
+            maybe(0.15, random.uniform(4, 10)),
+            maybe(0.2, random.randint(1, 10)),
+            maybe(0.25, random.randint(0, 20000)),
+            maybe(0.1, random.uniform(50, 120)),
+            maybe(0.4, random.randint(50, 120)),
+            maybe(0.2, random.randint(1, 10)),
+            maybe(0.2, random.randint(1, 10)),
+            ts, ts, ts,
+        )
+
+def populate(engine, rows, users):
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, HealthData.__table__])
+    # Start from the pre-index-suite schema: only the primary key index
+    for index in list(HealthData.__table__.indexes):
+        if index.name != "ix_health_data_id":
+            index.drop(bind=engine, checkfirst=True)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT INTO users (id, username, email, hashed_password, is_active) VALUES (?, ?, ?, ?, 1)",
+            ((i, f"user{i}", f"user{i}@example.com", "x") for i in range(1, users + 1)),
+        )
+        batch = []
+        for row in generate_rows(rows, users):
+            batch.append(row)
+            if len(batch) == 50000:
+                cursor.executemany(INSERT_SQL, batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+        raw.commit()
+    finally:
+        raw.close()
+
+def run_queries(Session, users, samples):
+    """Time each route's query shape over a sample of users, returns ms per query"""
+    user_ids = random.Random(42).sample(range(1, users + 1), samples)
+    chart_start = datetime.utcnow() - timedelta(days=30)
+    queries = {
+        "list (limit 100)": lambda db, uid: db.query(HealthData).filter(
+            HealthData.user_id == uid
+        ).order_by(desc(HealthData.measurement_time)).limit(100).all(),
+        "charts (30 days)": lambda db, uid: db.query(HealthData).filter(
+            HealthData.user_id == uid,
+            HealthData.measurement_time >= chart_start
+        ).order_by(HealthData.measurement_time).all(),
+        "recent (limit 5)": lambda db, uid: db.query(HealthData).filter(
+            HealthData.user_id == uid
+        ).order_by(desc(HealthData.measurement_time)).limit(5).all(),
+        "blood_sugar series": lambda db, uid: db.query(
+            HealthData.measurement_time, HealthData.blood_sugar
+        ).filter(
+            HealthData.user_id == uid,
+            HealthData.blood_sugar.isnot(None)
+        ).order_by(HealthData.measurement_time).all(),
+    }
+    results = {}
+    with Session() as db:
+        for name, query in queries.items():
+            started = time.perf_counter()
+            for uid in user_ids:
+                query(db, uid)
+            results[name] = (time.perf_counter() - started) * 1000 / len(user_ids)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Session = sessionmaker(bind=engine)
+
+        print(f"Populating {args.rows:,} rows for {args.users:,} users...")
+        started = time.perf_counter()
+        populate(engine, args.rows, args.users)
+        print(f"  done in {time.perf_counter() - started:.1f}s")
+
+        before = run_queries(Session, args.users, args.samples)
+
+        started = time.perf_counter()
+        ensure_indexes(engine)
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"Index suite built in {time.perf_counter() - started:.1f}s")
+
+        after = run_queries(Session, args.users, args.samples)
+
+    print(f"\n{'query':<22}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<22}{before[name]:>12.2f}{after[name]:>12.2f}{speedup:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
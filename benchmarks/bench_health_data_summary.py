@@ -0,0 +1,106 @@
+"""
+Benchmark for the health data summary at 10k, 100k and 1M rows per user.
+
+Compares the previous implementation (load every HealthData row as an ORM
+object, then average in Python) with build_health_data_summary, which runs
+one SQL aggregate plus an indexed latest-reading lookup.
+
+    python benchmarks/bench_health_data_summary.py --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.local_db import Base, create_async_db_engine, create_db_engine
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+from routes.health_data_routes import build_health_data_summary
+
+async def legacy_summary(db, user_id):
+    """The pre-aggregate implementation, kept here for comparison"""
+    result = await db.execute(select(HealthData).filter(HealthData.user_id == user_id))
+    health_data = result.scalars().all()
+    dates = [hd.measurement_time for hd in health_data if hd.measurement_time]
+
+    def safe_average(values):
+        filtered = [v for v in values if v is not None]
+        return round(sum(filtered) / len(filtered), 2) if filtered else None
+
+    averages = {
+        metric: safe_average([getattr(hd, metric) for hd in health_data])
+        for metric in ("systolic_bp", "diastolic_bp", "blood_sugar", "sleep_hours", "stress_level",
+                       "weight", "heart_rate", "mood_score", "energy_level")
+    }
+    latest = max(health_data, key=lambda x: x.measurement_time or datetime.min)
+    return len(health_data), min(dates), max(dates), averages, latest.id
+
+def populate(url, rows):
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, HealthData.__table__])
+    start = datetime.utcnow() - timedelta(days=5 * 365)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("INSERT INTO users (id, username, email, hashed_password, is_active) "
+                       "VALUES (1, 'bench', 'bench@example.com', 'x', 1)")
+        cursor.executemany(
+            "INSERT INTO health_data (user_id, systolic_bp, diastolic_bp, blood_sugar, sleep_hours, "
+            "stress_level, weight, heart_rate, mood_score, energy_level, measurement_time) "
+            "VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((random.uniform(100, 160), random.uniform(60, 100), random.uniform(70, 200),
+              random.uniform(4, 10), random.randint(1, 10), random.uniform(50, 120),
+              random.randint(50, 120), random.randint(1, 10), random.randint(1, 10),
+              (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S.%f"))
+             for i in range(rows)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    engine.dispose()
+
+async def time_call(Session, func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        async with Session() as db:
+            started = time.perf_counter()
+            await func(db, 1)
+            best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+async def run_size(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        populate(url, rows)
+        engine = create_async_db_engine(url)
+        Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+        legacy = await time_call(Session, legacy_summary, repeat)
+        aggregate = await time_call(Session, build_health_data_summary, repeat)
+        await engine.dispose()
+    print(f"{rows:>10,}{legacy:>14.1f}{aggregate:>14.1f}{legacy / aggregate:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'rows':>10}{'legacy ms':>14}{'aggregate ms':>14}{'speedup':>10}")
+    for rows in args.sizes:
+        asyncio.run(run_size(rows, args.repeat))
+
+if __name__ == "__main__":
+    main()
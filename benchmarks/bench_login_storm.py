@@ -0,0 +1,123 @@
+"""
+Event-loop responsiveness during a login storm.
+
+Runs the JWT API (backend_api/main.py) in-process against a temporary
+database and fires a burst of concurrent logins while a probe keeps
+requesting /health. With bcrypt verified inline on the event loop every
+login stalls the probe; on the password pool the probe stays fast and
+logins beyond PASSWORD_HASH_MAX_PENDING are turned away with 503.
+
+Half of the users still carry the legacy SHA-256 hash, which the first
+login migrates to bcrypt.
+
+Requires httpx in addition to the backend requirements.
+
+    python benchmarks/bench_login_storm.py --logins 200
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+
+PASSWORD = "storm-password"
+
+def seed(engine, users):
+    from app.database.local_db import Base
+    from utils.security import SecurityUtils
+
+    Base.metadata.create_all(bind=engine)
+    bcrypt_hash = SecurityUtils.get_password_hash(PASSWORD)
+    legacy_hash = hashlib.sha256(PASSWORD.encode()).hexdigest()
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().executemany(
+            "INSERT INTO users (id, username, email, hashed_password, is_active) VALUES (?, ?, ?, ?, 1)",
+            ((i, f"user{i}", f"user{i}@example.com", legacy_hash if i % 2 else bcrypt_hash)
+             for i in range(1, users + 1)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+async def probe(client, stop, latencies):
+    # Each sample covers a 5 ms sleep plus one /health round trip, so a
+    # blocked event loop shows up however long it stays blocked
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        (await client.get("/health")).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+async def storm(app, logins, users):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        latencies = []
+        probe_task = asyncio.create_task(probe(client, stop, latencies))
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/users/login", json={
+                "email": f"user{i % users + 1}@example.com", "password": PASSWORD
+            }) for i in range(logins)
+        ), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    # Inline, requests queued behind the blocked loop can time out on the DB pool
+    codes = [getattr(response, "status_code", None) for response in responses]
+    latencies.sort()
+    return {
+        "ok": codes.count(200),
+        "503": codes.count(503),
+        "failed": codes.count(None),
+        "elapsed": elapsed,
+        "probe_p50": statistics.median(latencies) if latencies else float("nan"),
+        "probe_max": latencies[-1] if latencies else float("nan"),
+        "probes": len(latencies),
+    }
+
+async def run(app, logins, users):
+    from utils.password_pool import password_pool
+
+    async def inline(func, *args):
+        return func(*args)
+
+    pooled_run = password_pool.run
+    print(f"{'mode':<10}{'200s':>7}{'503s':>7}{'failed':>8}{'total s':>10}{'probes':>8}{'probe p50 ms':>14}{'probe max ms':>14}")
+    # Inline first, so the pooled run doesn't profit from the SHA-256 migration
+    for label, runner in (("inline", inline), ("pool", pooled_run)):
+        password_pool.run = runner
+        result = await storm(app, logins, users)
+        print(f"{label:<10}{result['ok']:>7}{result['503']:>7}{result['failed']:>8}{result['elapsed']:>10.2f}"
+              f"{result['probes']:>8}{result['probe_p50']:>14.2f}{result['probe_max']:>14.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        import main as api
+        from app.database.local_db import engine
+        from utils.password_pool import password_pool
+
+        seed(engine, args.users)
+
+        asyncio.run(run(api.app, args.logins, args.users))
+        print(f"pool: {password_pool.stats()}")
+
+if __name__ == "__main__":
+    main()
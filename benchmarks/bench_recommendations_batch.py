@@ -0,0 +1,127 @@
+"""
+Benchmark for generating recommendations for every user.
+
+Compares calling the single-user engine once per user (what one API
+request per user amounts to, minus HTTP) with generate_all, which
+extracts features for chunks of users with two GROUP BY queries, scores
+them as matrices in worker processes and writes each chunk in bulk. The
+per-user path is timed on a sample and extrapolated.
+
+    python benchmarks/bench_recommendations_batch.py --users 10000 100000 --readings 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database.local_db import Base, create_db_engine
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+from app.models.recommendation_model import Recommendation
+from app.services import ai_service
+
+def populate(url, users, readings):
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine, tables=[
+        User.__table__, HealthData.__table__, Habit.__table__, Recommendation.__table__
+    ])
+    now = datetime.utcnow()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT INTO users (id, username, email, hashed_password, is_active) VALUES (?, ?, ?, 'x', 1)",
+            ((i, f"user{i}", f"user{i}@example.com") for i in range(1, users + 1)),
+        )
+
+        def reading(user_id, i):
+            # Sleep, activity and stress drive mood and energy, so the model has something to learn
+            sleep = random.uniform(4, 9)
+            steps = random.randint(1000, 14000)
+            stress = random.randint(1, 10)
+            wellbeing = 2 + 0.5 * sleep + steps / 4000 - 0.3 * stress + random.gauss(0, 1)
+            return (user_id, random.uniform(100, 160), random.uniform(60, 100), random.uniform(70, 200),
+                    sleep, stress, steps, random.uniform(0, 60), random.uniform(18, 35),
+                    random.randint(55, 110), random.uniform(0.5, 3.5),
+                    min(10, max(1, round(wellbeing))), min(10, max(1, round(wellbeing + random.gauss(0, 1)))),
+                    (now - timedelta(hours=i * 24 * 25 / readings)).strftime("%Y-%m-%d %H:%M:%S.%f"))
+
+        cursor.executemany(
+            "INSERT INTO health_data (user_id, systolic_bp, diastolic_bp, blood_sugar, sleep_hours, "
+            "stress_level, steps_count, exercise_minutes, bmi, heart_rate, water_intake, mood_score, "
+            "energy_level, measurement_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (reading(user_id, i) for user_id in range(1, users + 1) for i in range(readings)),
+        )
+        cursor.executemany(
+            "INSERT INTO habits (user_id, name, target_value, current_value, is_active, version) "
+            "VALUES (?, 'habit', ?, ?, 1, 1)",
+            ((user_id, 10, random.uniform(0, 12)) for user_id in range(1, users + 1) for _ in range(2)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    cursor = None
+    engine.dispose()
+
+def per_user(url, sample):
+    """Seconds per user for the single-user path, averaged over a sample"""
+    engine = create_db_engine(url)
+    service = ai_service.AIService()
+    with Session(engine) as session:
+        service.get_model(session)
+        started = time.perf_counter()
+        for user_id in range(1, sample + 1):
+            service.generate_recommendations(user_id, session)
+            session.commit()
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed / sample
+
+def run_size(users, readings, sample, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        started = time.perf_counter()
+        populate(url, users, readings)
+        print(f"populated {users:,} users x {readings} readings in {time.perf_counter() - started:.0f}s")
+
+        per_user_seconds = per_user(url, min(sample, users))
+        ai_service.MODEL_FILE = os.path.join(tmp, "wellbeing.joblib")
+        started = time.perf_counter()
+        stats = ai_service.generate_all(url, workers=workers)
+        batch_seconds = time.perf_counter() - started
+
+        engine = create_db_engine(url)
+        with Session(engine) as session:
+            stored = session.execute(select(func.count(Recommendation.id))).scalar()
+        engine.dispose()
+        assert stored == stats["recommendations"], (stored, stats)
+
+    estimated = per_user_seconds * users
+    print(f"{users:>10,}{estimated:>18.1f}{batch_seconds:>12.1f}{estimated / batch_seconds:>9.1f}x"
+          f"   ({stats['recommendations']:,} recommendations, model={stats['model']})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--readings", type=int, default=20, help="readings per user")
+    parser.add_argument("--sample", type=int, default=500, help="users timed on the per-user path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    random.seed(0)
+    for users in args.users:
+        print(f"{'users':>10}{'per-user s (est)':>18}{'batch s':>12}{'speedup':>10}")
+        run_size(users, args.readings, args.sample, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Concurrency benchmark for the SQLite engine profile.
+
+Runs one writer thread committing small transactions while several reader
+threads run the dashboard "recent readings" query, first with SQLite's
+default pragmas and then with the tuned profile from app/utils/config.py.
+
+    python benchmarks/bench_sqlite_engine_profile.py --seconds 10 --readers 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from sqlalchemy import desc
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database.local_db import Base, create_db_engine
+from app.models.user_model import User
+from app.models.habit_model import Habit
+from app.models.health_data_model import HealthData
+from app.utils.config import SQLITE_PRAGMAS
+
+USERS = 50
+
+def seed(Session, rows):
+    with Session() as db:
+        db.add_all(User(id=i, username=f"user{i}", email=f"user{i}@example.com",
+                        hashed_password="x") for i in range(1, USERS + 1))
+        db.add_all(HealthData(user_id=random.randint(1, USERS), heart_rate=random.randint(50, 120),
+                              measurement_time=datetime.utcnow()) for _ in range(rows))
+        db.commit()
+
+def run_profile(label, pragmas, seconds, readers, seed_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", pragmas=pragmas)
+        Base.metadata.create_all(bind=engine, tables=[User.__table__, HealthData.__table__])
+        Session = sessionmaker(bind=engine)
+        seed(Session, seed_rows)
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+
+        def bump(key):
+            with lock:
+                counts[key] += 1
+
+        def writer():
+            while not stop.is_set():
+                try:
+                    with Session() as db:
+                        db.add_all(HealthData(user_id=random.randint(1, USERS), weight=70.0,
+                                              measurement_time=datetime.utcnow()) for _ in range(20))
+                        db.commit()
+                    bump("writes")
+                except OperationalError:
+                    bump("locked")
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    with Session() as db:
+                        db.query(HealthData).filter(
+                            HealthData.user_id == random.randint(1, USERS)
+                        ).order_by(desc(HealthData.measurement_time)).limit(5).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    print(f"{label:<10}{counts['reads'] / seconds:>12.0f}{counts['writes'] / seconds:>12.0f}{counts['locked']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seed-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'reads/s':>12}{'commits/s':>12}{'locked':>10}")
+    run_profile("default", {}, args.seconds, args.readers, args.seed_rows)
+    run_profile("tuned", SQLITE_PRAGMAS, args.seconds, args.readers, args.seed_rows)
+
+if __name__ == "__main__":
+    main()
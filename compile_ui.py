@@ -0,0 +1,14 @@
+import os
+from app.ui.loader import compile_all
+
+def main():
+    print("Compiling Qt Designer forms...")
+    targets, failed = compile_all()
+    for path in targets:
+        print(f"  {os.path.relpath(path)}")
+    for name, error in failed.items():
+        print(f"  skipped {name}.ui: {error}")
+    print(f"{len(targets)} forms compiled; the desktop app loads them instead of parsing the .ui files.")
+
+if __name__ == "__main__":
+    main()
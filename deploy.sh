@@ -71,6 +71,10 @@ mkdir -p "$LOG_DIR"
 log "🗄️  Initializing database..."
 python init_db.py
 
+# Compile the desktop app's Qt Designer forms
+log "🎨 Compiling UI forms..."
+python compile_ui.py
+
 # Check environment configuration
 if [ ! -f ".env" ]; then
     if [ -f ".env.template" ]; then
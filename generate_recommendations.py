@@ -0,0 +1,23 @@
+import argparse
+import time
+from app.database.local_db import init_db
+from app.models import user_model, habit_model, health_data_model, recommendation_model
+from app.services.ai_service import generate_all
+from app.utils.config import RECOMMENDATION_CHUNK_SIZE, RECOMMENDATION_WORKERS
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate recommendations for every user")
+    parser.add_argument("--chunk-size", type=int, default=RECOMMENDATION_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=RECOMMENDATION_WORKERS)
+    args = parser.parse_args()
+
+    init_db()
+    print("Generating recommendations for all users...")
+    started = time.perf_counter()
+    stats = generate_all(chunk_size=args.chunk_size, workers=args.workers,
+                         progress=lambda written, last_user: print(f"  {written:,} written, up to user {last_user}"))
+    print(f"Generated {stats['recommendations']:,} recommendations for {stats['users']:,} users "
+          f"in {time.perf_counter() - started:.1f}s" + ("" if stats["model"] else " (rules only, too little data for the model)"))
+
+if __name__ == "__main__":
+    main()
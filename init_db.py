@@ -1,5 +1,5 @@
 from app.database.local_db import init_db
-from app.models import user_model, habit_model, recommendation_model
+from app.models import user_model, habit_model, health_data_model, health_rollup_model, recommendation_model, session_model, habit_event_model, job_model, data_version_model
 
 def main():
     print("Creating database tables...")
@@ -0,0 +1,12 @@
+from app.database.local_db import engine, init_db
+from app.models import user_model, habit_model, health_data_model, health_rollup_model
+from app.services.rollup_service import rebuild_rollups
+
+def main():
+    init_db()
+    print("Rebuilding daily health rollups from historic data...")
+    rebuild_rollups(engine)
+    print("Daily health rollups rebuilt successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,7 @@ fi
 echo
 echo "2. Starting Frontend Application..."
 cd /home/tajmul/Projects/Python/health-recomand/smart_health_tracker
+$PYTHON_CMD compile_ui.py > /dev/null || echo "   Warning: UI forms not compiled, they will be loaded at runtime"
 $PYTHON_CMD app/main.py &
 FRONTEND_PID=$!
 echo "   Frontend started with PID: $FRONTEND_PID"
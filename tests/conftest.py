@@ -0,0 +1,52 @@
+import asyncio
+import atexit
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'backend_api'))
+
+# The database engines are created on import: point them at a throwaway
+# database before any app module is loaded
+test_dir = tempfile.mkdtemp(prefix="smart_health_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(test_dir, 'test.db')}"
+atexit.register(shutil.rmtree, test_dir, ignore_errors=True)
+
+user_ids = itertools.count(1)
+
+@pytest.fixture(scope="session")
+def loop():
+    """One event loop for the whole run, so pooled async connections stay usable"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="session")
+def app():
+    import main_enhanced
+    return main_enhanced.app
+
+@pytest.fixture
+def client(app, loop):
+    """An httpx client logged in to the enhanced API as a fresh user"""
+    import httpx
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    number = next(user_ids)
+    credentials = {"email": f"user{number}@example.com", "password": "secret"}
+
+    async def login():
+        (await client.post("/api/users/register", json=dict(credentials, username=f"user{number}"))).raise_for_status()
+        response = await client.post("/api/users/login", json=credentials)
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    loop.run_until_complete(login())
+    yield client
+    loop.run_until_complete(client.aclose())
@@ -0,0 +1,15 @@
+from app.services.api_client import APIClient
+from app.services.async_api_client import AsyncAPIClient
+
+def test_async_client_follows_the_wrapped_clients_session():
+    client = APIClient()
+    client.token = "first"
+    async_client = AsyncAPIClient.from_client(client)
+    assert async_client.auth_headers() == {"Authorization": "Bearer first"}
+
+    # Re-login on the sync client after the async one was created
+    client.token = "second"
+    assert async_client.auth_headers() == {"Authorization": "Bearer second"}
+
+    async_client._logged_out()
+    assert client.token is None
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from utils.downsampling import downsample_series
+
+def interleaved_series(rows, count):
+    """count series that each have a value on every count-th row only"""
+    x = np.arange(rows, dtype=float)
+    columns = []
+    for i in range(count):
+        column = np.full(rows, np.nan)
+        column[i::count] = np.sin(x[i::count] / 50) + i
+        columns.append(column)
+    return x, columns
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("max_points", [10, 200])
+def test_shared_axis_stays_within_max_points(method, max_points):
+    x, columns = interleaved_series(8000, 8)
+    rows, reduced = downsample_series(x, columns, max_points, method)
+    assert len(rows) <= max_points
+    assert np.all(np.diff(rows) > 0)
+    for column, values in zip(columns, reduced):
+        kept = ~np.isnan(values)
+        # Kept values are the series' own, at their rows
+        assert np.array_equal(values[kept], column[rows][kept])
+        if max_points >= 4 * len(columns):
+            assert kept.sum() >= 4
+
+def test_series_on_the_same_rows_keep_their_full_budget():
+    x = np.arange(1000, dtype=float)
+    columns = [np.sin(x / 30), np.cos(x / 30)]
+    rows, reduced = downsample_series(x, columns, 100, "minmax")
+    assert len(rows) > 50
+    assert len(rows) <= 100
@@ -0,0 +1,71 @@
+import asyncio
+
+CONCURRENT_INCREMENTS = 50
+
+def create_habit(client, loop, name):
+    async def create():
+        response = await client.post("/api/habits", json={"name": name, "target_value": 10})
+        response.raise_for_status()
+        return response.json()
+    return loop.run_until_complete(create())
+
+def get_habit(client, loop, habit_id):
+    async def get():
+        habits = (await client.get("/api/habits")).json()
+        return next(h for h in habits if h["id"] == habit_id)
+    return loop.run_until_complete(get())
+
+def test_concurrent_increments_are_not_lost(client, loop):
+    habit = create_habit(client, loop, "water")
+
+    async def increment_all():
+        responses = await asyncio.gather(*(
+            client.post(f"/api/habits/{habit['id']}/increment", json={"delta": 1})
+            for _ in range(CONCURRENT_INCREMENTS)
+        ))
+        assert [r.status_code for r in responses] == [200] * CONCURRENT_INCREMENTS
+
+    loop.run_until_complete(increment_all())
+    final = get_habit(client, loop, habit["id"])
+    assert final["current_value"] == CONCURRENT_INCREMENTS
+    assert final["version"] == habit["version"] + CONCURRENT_INCREMENTS
+
+def test_stale_version_is_rejected(client, loop):
+    habit = create_habit(client, loop, "walk")
+
+    async def update_twice():
+        url = f"/api/habits/{habit['id']}/progress"
+        first = await client.put(url, json={"current_value": 3, "version": habit["version"]})
+        assert first.status_code == 200
+        stale = await client.put(url, json={"current_value": 5, "version": habit["version"]})
+        assert stale.status_code == 409
+
+    loop.run_until_complete(update_twice())
+    final = get_habit(client, loop, habit["id"])
+    assert final["current_value"] == 3
+    assert final["version"] == habit["version"] + 1
+
+def test_progress_set_by_put_counts_towards_the_streak(client, loop):
+    habit = create_habit(client, loop, "stretch")
+
+    async def set_progress():
+        assert (await client.get("/api/users/streak")).json()["streak_days"] == 0
+        url = f"/api/habits/{habit['id']}/progress"
+        assert (await client.put(url, json={"current_value": 2})).status_code == 200
+        # Lowering the value again is not progress
+        assert (await client.put(url, json={"current_value": 1})).status_code == 200
+        return (await client.get("/api/users/streak")).json()
+
+    assert loop.run_until_complete(set_progress())["streak_days"] == 1
+
+def test_progress_set_by_put_marks_the_heatmap(client, loop):
+    habit = create_habit(client, loop, "read")
+
+    async def set_progress():
+        response = await client.put(f"/api/habits/{habit['id']}/progress", json={"current_value": 1})
+        assert response.status_code == 200
+        return (await client.get(f"/api/habits/{habit['id']}/heatmap")).json()
+
+    heatmap = loop.run_until_complete(set_progress())
+    assert heatmap["active_days"] == 1
+    assert heatmap["current_streak"] == 1
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+def test_bulk_upload_mixes_aware_and_naive_times(client, loop):
+    from app.database.local_db import AsyncSessionLocal
+    from app.models.health_rollup_model import HealthDailyRollup
+
+    earlier = datetime.now(timezone.utc) - timedelta(minutes=1)
+    batch = [
+        {"weight": 70.0, "measurement_time": earlier.strftime("%Y-%m-%dT%H:%M:%SZ")},
+        {"weight": 71.0},  # stamped with the server's utcnow()
+    ]
+
+    async def upload():
+        response = await client.post("/api/v1/healthdata/bulk", json=batch)
+        assert response.status_code == 200, response.text
+        assert response.json()["created"] == 2
+
+        listed = (await client.get("/api/v1/healthdata")).json()
+        times = [datetime.fromisoformat(item["measurement_time"]) for item in listed]
+        assert all(t.tzinfo is None for t in times)
+        assert earlier.replace(tzinfo=None, microsecond=0) in times
+
+        async with AsyncSessionLocal() as db:
+            rollup = (await db.execute(select(HealthDailyRollup).filter(
+                HealthDailyRollup.user_id == listed[0]["user_id"],
+                HealthDailyRollup.metric == "weight"
+            ))).scalars().all()
+        # The item without a time is the newer reading
+        assert sum(row.value_count for row in rollup) == 2
+        assert max(rollup, key=lambda row: row.last_time).last_value == 71.0
+
+    loop.run_until_complete(upload())
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import update
+
+from utils.job_queue import JobQueue, STALE_AFTER
+
+def make_queue():
+    queue = JobQueue(workers=1, max_attempts=3, retention=3600)
+    release = asyncio.Event()
+
+    @queue.handler("test")
+    async def run(job):
+        await release.wait()
+        return {"job": job.id}
+
+    return queue, release
+
+def test_stale_running_job_is_requeued_on_submit(client, loop):
+    from app.database.local_db import AsyncSessionLocal
+    from app.models.job_model import Job
+
+    queue, release = make_queue()
+    release.set()
+
+    async def scenario():
+        user_id = (await client.get("/api/users/me")).json()["id"]
+        async with AsyncSessionLocal() as db:
+            await queue.start()
+            # A job claimed by a process that died after this one started
+            job = Job(kind="test", user_id=user_id, status="running", attempts=1,
+                      created_at=datetime.utcnow(), started_at=datetime.utcnow() - STALE_AFTER)
+            db.add(job)
+            await db.commit()
+
+            resubmitted = await queue.submit(db, "test", user_id)
+            assert resubmitted.id == job.id
+            finished = await queue.get(db, job.id, user_id, wait=5)
+            assert finished.status == "done"
+            assert finished.attempts == 2
+        await queue.stop()
+
+    loop.run_until_complete(scenario())
+
+def test_waiter_timing_out_does_not_strand_the_others(client, loop):
+    from app.database.local_db import AsyncSessionLocal
+
+    queue, release = make_queue()
+
+    async def scenario():
+        user_id = (await client.get("/api/users/me")).json()["id"]
+        async with AsyncSessionLocal() as db:
+            job = await queue.submit(db, "test", user_id)
+
+        async def wait_for_job(wait):
+            async with AsyncSessionLocal() as db:
+                return await queue.get(db, job.id, user_id, wait=wait)
+
+        patient = asyncio.ensure_future(wait_for_job(10))
+        assert (await wait_for_job(0.05)).status in ("queued", "running")
+        release.set()
+        assert (await asyncio.wait_for(patient, 5)).status == "done"
+        assert not queue._finished and not queue._waiters
+        await queue.stop()
+
+    loop.run_until_complete(scenario())
@@ -0,0 +1,33 @@
+from utils.response_cache import MemoryCacheBackend, ResponseCache
+
+def test_shared_versions_reach_every_worker(client, loop):
+    from app.database.local_db import AsyncSessionLocal
+
+    # Two workers: separate memory, one database
+    workers = [ResponseCache(MemoryCacheBackend(), ttl=300, shared_versions=True) for _ in range(2)]
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return {"value": len(computed)}
+
+    async def scenario():
+        user_id = (await client.get("/api/users/me")).json()["id"]
+        async with AsyncSessionLocal() as db:
+            tags = [await worker.etag(db, user_id, "summary", {}) for worker in workers]
+            assert tags[0] == tags[1]
+            assert await workers[1].get_or_compute(db, user_id, "summary", {}, compute) == {"value": 1}
+
+            await workers[0].invalidate(db, user_id)
+            assert await workers[1].etag(db, user_id, "summary", {}) != tags[1]
+            assert await workers[1].get_or_compute(db, user_id, "summary", {}, compute) == {"value": 2}
+
+    loop.run_until_complete(scenario())
+
+def test_cache_stats_need_a_session(client, loop):
+    async def request():
+        anonymous = await client.get("/api/cache/stats", headers={"Authorization": ""})
+        signed_in = await client.get("/api/cache/stats")
+        return anonymous.status_code, signed_in.status_code
+
+    assert loop.run_until_complete(request()) == (401, 200)
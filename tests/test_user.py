@@ -0,0 +1,66 @@
+import pytest
+
+@pytest.mark.parametrize("token", ["not.a.jwt", "a.b.c", "unknown-session-token"])
+def test_invalid_bearer_token_is_unauthorized(client, loop, token):
+    async def request():
+        return await client.get("/api/v1/healthdata", headers={"Authorization": f"Bearer {token}"})
+
+    assert loop.run_until_complete(request()).status_code == 401
+
+def test_legacy_sha256_password_is_rehashed_on_login(client, loop):
+    import hashlib
+    from sqlalchemy import select, update
+    from app.database.local_db import AsyncSessionLocal
+    from app.models.user_model import User as UserORM
+
+    async def login_with_legacy_hash():
+        me = (await client.get("/api/users/me")).json()
+        async with AsyncSessionLocal() as db:
+            legacy = hashlib.sha256(b"secret").hexdigest()
+            await db.execute(update(UserORM).filter(UserORM.id == me["id"]).values(hashed_password=legacy))
+            await db.commit()
+
+        wrong = await client.post("/api/users/login", json={"email": me["email"], "password": "wrong"})
+        assert wrong.status_code == 401
+        right = await client.post("/api/users/login", json={"email": me["email"], "password": "secret"})
+        assert right.status_code == 200
+
+        async with AsyncSessionLocal() as db:
+            stored = (await db.execute(select(UserORM.hashed_password).filter(UserORM.id == me["id"]))).scalar_one()
+        assert stored.startswith("$2")
+
+    loop.run_until_complete(login_with_legacy_hash())
+
+def test_token_of_inactive_user_is_rejected(client, loop):
+    from datetime import timedelta
+    from sqlalchemy import update
+    from app.database.local_db import AsyncSessionLocal
+    from app.models.user_model import User as UserORM
+    from utils.principal import invalidate_principal
+    from utils.security import SecurityUtils
+
+    async def request_as_deactivated_user():
+        me = (await client.get("/api/users/me")).json()
+        jwt_token = SecurityUtils.create_access_token({"sub": me["email"]}, timedelta(minutes=5), user_id=me["id"])
+        headers = {"Authorization": f"Bearer {jwt_token}"}
+        assert (await client.get("/api/v1/healthdata", headers=headers)).status_code == 200
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(UserORM).filter(UserORM.id == me["id"]).values(is_active=False))
+            await db.commit()
+        invalidate_principal(me["id"])
+        assert (await client.get("/api/v1/healthdata", headers=headers)).status_code == 403
+
+        unknown = SecurityUtils.create_access_token({"sub": "nobody@example.com"}, user_id=10**9)
+        response = await client.get("/api/v1/healthdata", headers={"Authorization": f"Bearer {unknown}"})
+        assert response.status_code == 401
+
+    loop.run_until_complete(request_as_deactivated_user())
+
+def test_password_pool_stats_need_a_session(client, loop):
+    async def request():
+        anonymous = await client.get("/api/auth/pool/stats", headers={"Authorization": ""})
+        signed_in = await client.get("/api/auth/pool/stats")
+        return anonymous.status_code, signed_in.status_code
+
+    assert loop.run_until_complete(request()) == (401, 200)